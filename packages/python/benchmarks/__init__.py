@@ -0,0 +1,5 @@
+"""Benchmarks for envoic, run with ``python -m benchmarks`` from ``packages/python``.
+
+Nothing here ships with the package. ``generator`` builds deterministic
+synthetic trees and ``scale`` times the CLI commands against them.
+"""
@@ -0,0 +1,252 @@
+"""Command line for the benchmarks: ``python -m benchmarks <suite> ...``."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from . import micro, scale
+from .compare import compare_documents, environment_mismatches, format_comparisons
+from .generator import SCALES, generate_tree
+from .results import read_results, results_document, write_results
+
+_RUNS_HELP = "Rounds of the whole suite; more rounds measure the noise."
+
+
+def _write(document: dict[str, Any], output: Path | None) -> None:
+    if output is None:
+        return
+    write_results(document, output)
+    print(f"Results written to {output}", file=sys.stderr)
+
+
+def _run_scale(
+    settings: dict[str, Any], workdir: Path | None
+) -> tuple[dict[str, Any], str]:
+    results = scale.run_suite(
+        [SCALES[name] for name in settings["scales"]],
+        [scale.COMMANDS[name] for name in settings["commands"]],
+        seed=settings["seed"],
+        depth=settings["depth"],
+        repeat=settings["repeat"],
+        runs=settings.get("runs", 1),
+        workdir=workdir,
+        progress=True,
+        engine=settings.get("engine", "path"),
+    )
+    document = results_document(
+        "scale", settings, [result.to_dict() for result in results]
+    )
+    return document, scale.format_results(results)
+
+
+def _run_micro(
+    settings: dict[str, Any], workdir: Path | None
+) -> tuple[dict[str, Any], str]:
+    with tempfile.TemporaryDirectory(prefix="envoic-micro-") as temp:
+        benchmarks = micro.build_fixtures(Path(temp))
+        results = micro.run_suite(
+            benchmarks,
+            repeat=settings["repeat"],
+            runs=settings.get("runs", 1),
+            only=settings["only"],
+        )
+    document = results_document(
+        "micro", settings, [result.to_dict() for result in results]
+    )
+    return document, micro.format_results(results)
+
+
+# Each runner returns the results document and the table to print.
+RUNNERS: dict[
+    str, Callable[[dict[str, Any], Path | None], tuple[dict[str, Any], str]]
+] = {
+    "scale": _run_scale,
+    "micro": _run_micro,
+}
+
+
+def _scale(args: argparse.Namespace) -> int:
+    settings = {
+        "scales": args.scales,
+        "commands": args.commands,
+        "depth": args.depth,
+        "repeat": args.repeat,
+        "runs": args.runs,
+        "seed": args.seed,
+        "engine": args.engine,
+    }
+    document, table = _run_scale(settings, args.workdir)
+    print(table)
+    _write(document, args.output)
+    return 0
+
+
+def _micro(args: argparse.Namespace) -> int:
+    settings = {"repeat": args.repeat, "runs": args.runs, "only": args.only}
+    document, table = _run_micro(settings, None)
+    if not document["results"]:
+        print(f"No benchmark matches {args.only!r}", file=sys.stderr)
+        return 1
+    print(table)
+    _write(document, args.output)
+    return 0
+
+
+def _compare(args: argparse.Namespace) -> int:
+    try:
+        baseline = read_results(args.baseline)
+        if args.current is not None:
+            current = read_results(args.current)
+        else:
+            settings = dict(baseline.get("settings", {}))
+            if args.repeat is not None:
+                settings["repeat"] = args.repeat
+            if args.runs is not None:
+                settings["runs"] = args.runs
+            if args.engine is not None:
+                settings["engine"] = args.engine
+            current, table = RUNNERS[baseline["suite"]](settings, args.workdir)
+            print(table, file=sys.stderr)
+    except (KeyError, ValueError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 2
+    _write(current, args.output)
+
+    mismatches = environment_mismatches(baseline, current)
+    for mismatch in mismatches:
+        print(f"Warning: runs differ in {mismatch}", file=sys.stderr)
+    comparisons = compare_documents(
+        baseline,
+        current,
+        threshold=args.threshold,
+        memory_threshold=args.memory_threshold,
+    )
+    print(format_comparisons(comparisons))
+    return 1 if any(item.status == "regressed" for item in comparisons) else 0
+
+
+def _generate(args: argparse.Namespace) -> int:
+    manifest = generate_tree(args.root, SCALES[args.scale], args.seed)
+    print(
+        f"Built {manifest.directories:,} directories, {manifest.files:,} files "
+        f"and {manifest.environments:,} environments in {args.root}"
+    )
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    suites = parser.add_subparsers(dest="suite", required=True)
+
+    scale_parser = suites.add_parser(
+        "scale", help="Time CLI commands on generated trees."
+    )
+    scale_parser.add_argument(
+        "--scales",
+        nargs="+",
+        choices=list(SCALES),
+        default=["small", "medium"],
+        help="Tree sizes to generate (default: small medium).",
+    )
+    scale_parser.add_argument(
+        "--commands",
+        nargs="+",
+        choices=list(scale.COMMANDS),
+        default=list(scale.COMMANDS),
+        help="Commands to time (default: all).",
+    )
+    scale_parser.add_argument("--repeat", type=int, default=3, help="Runs per command.")
+    scale_parser.add_argument("--runs", type=int, default=1, help=_RUNS_HELP)
+    scale_parser.add_argument("--depth", type=int, default=8, help="Scan depth.")
+    scale_parser.add_argument("--seed", type=int, default=0, help="Generator seed.")
+    scale_parser.add_argument(
+        "--engine",
+        choices=["path", "fd"],
+        default="path",
+        help="Traversal engine for scan, list and health (default: path).",
+    )
+    scale_parser.add_argument(
+        "--workdir",
+        type=Path,
+        help="Keep generated trees here and reuse them on later runs.",
+    )
+    scale_parser.add_argument(
+        "--output", "-o", type=Path, help="Write results as JSON."
+    )
+    scale_parser.set_defaults(handler=_scale)
+
+    micro_parser = suites.add_parser("micro", help="Time hot functions on fixtures.")
+    micro_parser.add_argument("--repeat", type=int, default=5, help="Samples each.")
+    micro_parser.add_argument("--runs", type=int, default=1, help=_RUNS_HELP)
+    micro_parser.add_argument(
+        "--only", metavar="TEXT", help="Run benchmarks whose name contains TEXT."
+    )
+    micro_parser.add_argument(
+        "--output", "-o", type=Path, help="Write results as JSON."
+    )
+    micro_parser.set_defaults(handler=_micro)
+
+    compare_parser = suites.add_parser(
+        "compare",
+        help="Rerun the suite of a baseline and fail on regressions.",
+    )
+    compare_parser.add_argument(
+        "baseline", type=Path, help="Results JSON written by scale or micro."
+    )
+    compare_parser.add_argument(
+        "--current",
+        type=Path,
+        help="Compare this results JSON instead of running the suite.",
+    )
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.5,
+        help="Tolerated slowdown before noise, as a fraction (default: 0.5).",
+    )
+    compare_parser.add_argument(
+        "--memory-threshold",
+        type=float,
+        default=0.25,
+        help="Tolerated peak RSS growth, as a fraction (default: 0.25).",
+    )
+    compare_parser.add_argument(
+        "--repeat", type=int, help="Override the baseline's samples per benchmark."
+    )
+    compare_parser.add_argument(
+        "--runs", type=int, help="Override the baseline's rounds of the suite."
+    )
+    compare_parser.add_argument(
+        "--engine",
+        choices=["path", "fd"],
+        help="Override the baseline's traversal engine (scale).",
+    )
+    compare_parser.add_argument(
+        "--workdir", type=Path, help="Reuse generated trees kept here (scale)."
+    )
+    compare_parser.add_argument(
+        "--output", "-o", type=Path, help="Write the current results as JSON."
+    )
+    compare_parser.set_defaults(handler=_compare)
+
+    generate_parser = suites.add_parser("generate", help="Only build a synthetic tree.")
+    generate_parser.add_argument("root", type=Path, help="Empty or missing directory.")
+    generate_parser.add_argument("--scale", choices=list(SCALES), default="small")
+    generate_parser.add_argument("--seed", type=int, default=0)
+    generate_parser.set_defaults(handler=_generate)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    code: int = args.handler(args)
+    return code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,174 @@
+"""Regression gate: compare a benchmark run against a stored baseline.
+
+Benchmarks are matched by name. A benchmark regresses when its median time
+grows by more than ``threshold`` plus twice the combined relative noise of
+both sides, so a noisy benchmark needs a larger slowdown to fail than a
+steady one. Noise is the spread of the per-round medians when a side was
+recorded with several rounds (``--runs``): on a shared machine the drift
+between rounds is far larger than the spread inside one. With a single
+round the spread of its samples stands in. Peak RSS, measured by the ``scale`` suite, is much
+steadier and is held to ``memory_threshold`` alone.
+"""
+
+from __future__ import annotations
+
+import math
+import statistics
+from dataclasses import dataclass
+from typing import Any, Literal
+
+from .results import format_seconds
+
+# Standard deviations of combined noise added on top of the threshold.
+NOISE_SIGMAS = 2.0
+# Run metadata that must match for timings to be comparable at all.
+_ENVIRONMENT_KEYS = ("suite", "implementation", "python", "platform", "machine")
+
+ComparisonStatus = Literal["ok", "improved", "regressed", "new", "missing"]
+
+
+@dataclass(frozen=True, slots=True)
+class Comparison:
+    name: str
+    status: ComparisonStatus
+    baseline_seconds: float | None = None
+    current_seconds: float | None = None
+    # Current median time over the baseline's; 2.0 is twice as slow.
+    slowdown: float | None = None
+    # Largest slowdown - 1 tolerated for this benchmark.
+    allowed: float | None = None
+    memory_ratio: float | None = None
+    memory_regressed: bool = False
+
+
+def relative_noise(samples: list[float]) -> float:
+    """Sample standard deviation relative to the median, 0 for one sample."""
+    if len(samples) < 2:
+        return 0.0
+    return statistics.stdev(samples) / statistics.median(samples)
+
+
+def _entry_noise(entry: dict[str, Any]) -> float:
+    run_medians: list[float] = entry.get("run_medians", [])
+    if len(run_medians) >= 2:
+        return relative_noise(run_medians)
+    return relative_noise(entry["seconds"])
+
+
+def _compare_entry(
+    name: str,
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    threshold: float,
+    memory_threshold: float,
+) -> Comparison:
+    base_samples: list[float] = baseline["seconds"]
+    samples: list[float] = current["seconds"]
+    base_median = statistics.median(base_samples)
+    median = statistics.median(samples)
+    slowdown = median / base_median
+    noise = math.hypot(_entry_noise(baseline), _entry_noise(current))
+    allowed = threshold + NOISE_SIGMAS * noise
+
+    memory_ratio = None
+    base_rss = baseline.get("peak_rss_bytes")
+    rss = current.get("peak_rss_bytes")
+    if base_rss and rss:
+        memory_ratio = rss / base_rss
+    memory_regressed = memory_ratio is not None and memory_ratio > 1 + memory_threshold
+
+    status: ComparisonStatus = "ok"
+    if slowdown - 1 > allowed or memory_regressed:
+        status = "regressed"
+    elif 1 / slowdown - 1 > allowed:
+        status = "improved"
+    return Comparison(
+        name,
+        status,
+        baseline_seconds=base_median,
+        current_seconds=median,
+        slowdown=slowdown,
+        allowed=allowed,
+        memory_ratio=memory_ratio,
+        memory_regressed=memory_regressed,
+    )
+
+
+def compare_documents(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    *,
+    threshold: float = 0.5,
+    memory_threshold: float = 0.25,
+) -> list[Comparison]:
+    """Compare every benchmark of ``current`` with the same one in ``baseline``.
+
+    Benchmarks only in ``baseline`` are reported as ``missing`` and those
+    only in ``current`` as ``new``; neither counts as a regression.
+    """
+    base_entries = {entry["name"]: entry for entry in baseline["results"]}
+    entries = {entry["name"]: entry for entry in current["results"]}
+    comparisons: list[Comparison] = []
+    for name, entry in entries.items():
+        base_entry = base_entries.get(name)
+        if base_entry is None:
+            comparisons.append(
+                Comparison(
+                    name,
+                    "new",
+                    current_seconds=statistics.median(entry["seconds"]),
+                )
+            )
+            continue
+        comparisons.append(
+            _compare_entry(name, base_entry, entry, threshold, memory_threshold)
+        )
+    comparisons.extend(
+        Comparison(
+            name, "missing", baseline_seconds=statistics.median(entry["seconds"])
+        )
+        for name, entry in base_entries.items()
+        if name not in entries
+    )
+    return comparisons
+
+
+def environment_mismatches(
+    baseline: dict[str, Any], current: dict[str, Any]
+) -> list[str]:
+    """Describe run metadata that differs, which makes timings incomparable."""
+    return [
+        f"{key}: baseline {baseline.get(key)!r}, current {current.get(key)!r}"
+        for key in _ENVIRONMENT_KEYS
+        if baseline.get(key) != current.get(key)
+    ]
+
+
+def _format_ratio(ratio: float | None) -> str:
+    return "-" if ratio is None else f"{ratio:.2f}x"
+
+
+def format_comparisons(comparisons: list[Comparison]) -> str:
+    width = max([len("Benchmark"), *(len(item.name) for item in comparisons)])
+    header = (
+        f"{'Benchmark':<{width}} {'Baseline':>10} {'Current':>10} "
+        f"{'Change':>7} {'Allowed':>8} {'Memory':>7}  Status"
+    )
+    lines = [header, "-" * len(header)]
+    for item in comparisons:
+        allowed = "-" if item.allowed is None else f"+{item.allowed:.0%}"
+        status = item.status.upper() if item.status == "regressed" else item.status
+        lines.append(
+            f"{item.name:<{width}} {format_seconds(item.baseline_seconds):>10} "
+            f"{format_seconds(item.current_seconds):>10} "
+            f"{_format_ratio(item.slowdown):>7} {allowed:>8} "
+            f"{_format_ratio(item.memory_ratio):>7}  {status}"
+        )
+    regressed = sum(1 for item in comparisons if item.status == "regressed")
+    lines.append("")
+    lines.append(
+        f"{regressed} of {len(comparisons)} benchmarks regressed."
+        if regressed
+        else f"No regressions in {len(comparisons)} benchmarks."
+    )
+    return "\n".join(lines)
@@ -0,0 +1,212 @@
+"""Deterministic synthetic trees shaped like real development machines.
+
+A tree holds ``projects`` Python projects, grouped a hundred per directory.
+Each project has a nested package with ``__pycache__`` in every level; some
+have a ``.venv`` with a few hundred installed distributions, and some a
+``.tox`` with one environment per interpreter. Next to the projects sit
+named conda environments and a few huge flat data directories. Every choice
+comes from ``random.Random(seed)``, so the same scale and seed always produce
+the same tree.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+MANIFEST_NAME = "envoic-bench.json"
+# Projects per group directory, like an organisation checkout under ~/src.
+_GROUP_SIZE = 100
+_PYTHONS = ("3.10", "3.11", "3.12", "3.13")
+# Environments marked stale are dated back to 2020-01-01.
+_STALE_MTIME = 1577836800
+_LIBRARIES = (
+    "attrs",
+    "certifi",
+    "click",
+    "django",
+    "fastapi",
+    "httpx",
+    "jinja2",
+    "numpy",
+    "pandas",
+    "pydantic",
+    "pytest",
+    "requests",
+    "rich",
+    "sqlalchemy",
+    "typer",
+    "urllib3",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Scale:
+    name: str
+    projects: int
+    # One project in ``venv_every`` gets a ``.venv``.
+    venv_every: int
+    packages_per_venv: int
+    # One project in ``tox_every`` gets a ``.tox`` tree.
+    tox_every: int
+    conda_envs: int
+    package_depth: int
+    pyc_per_cache: int
+    flat_dirs: int
+    files_per_flat_dir: int
+
+
+SCALES: dict[str, Scale] = {
+    scale.name: scale
+    for scale in (
+        Scale("small", 100, 4, 50, 10, 2, 3, 4, 1, 2_000),
+        Scale("medium", 1_000, 4, 150, 10, 5, 4, 6, 2, 10_000),
+        Scale("large", 5_000, 3, 300, 8, 10, 5, 8, 4, 50_000),
+    )
+}
+
+
+@dataclass(slots=True)
+class TreeManifest:
+    scale: str
+    seed: int
+    directories: int = 0
+    files: int = 0
+    environments: int = 0
+    stale_environments: int = 0
+    projects: int = 0
+
+    def write(self, root: Path) -> None:
+        text = json.dumps(asdict(self), indent=2, sort_keys=True) + "\n"
+        (root / MANIFEST_NAME).write_text(text, encoding="utf-8")
+
+    @classmethod
+    def read(cls, root: Path) -> TreeManifest | None:
+        try:
+            data = json.loads((root / MANIFEST_NAME).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return cls(**data)
+
+
+class _Builder:
+    def __init__(self, root: Path, manifest: TreeManifest, rng: random.Random):
+        self.root = root
+        self.manifest = manifest
+        self.rng = rng
+
+    def mkdir(self, path: Path) -> Path:
+        path.mkdir()
+        self.manifest.directories += 1
+        return path
+
+    def write(self, path: Path, text: str = "") -> None:
+        path.write_text(text, encoding="utf-8")
+        self.manifest.files += 1
+
+    def venv(self, path: Path, packages: int, stale: bool) -> None:
+        python = self.rng.choice(_PYTHONS)
+        self.mkdir(path)
+        self.write(path / "pyvenv.cfg", f"home = /usr/bin\nversion = {python}.4\n")
+        bin_dir = self.mkdir(path / "bin")
+        self.write(bin_dir / "activate", "# activate\n")
+        self.write(bin_dir / "python")
+        lib = self.mkdir(path / "lib")
+        site = self.mkdir(self.mkdir(lib / f"python{python}") / "site-packages")
+        self.site_packages(site, packages)
+        self.mark(path, stale)
+
+    def conda_env(self, path: Path, packages: int, stale: bool) -> None:
+        python = self.rng.choice(_PYTHONS)
+        self.mkdir(path)
+        meta = self.mkdir(path / "conda-meta")
+        self.write(meta / "history", "==> 2024-01-01 00:00:00 <==\n")
+        self.write(meta / f"python-{python}.4-0.json", "{}\n")
+        self.write(self.mkdir(path / "bin") / "python")
+        lib = self.mkdir(path / "lib")
+        site = self.mkdir(self.mkdir(lib / f"python{python}") / "site-packages")
+        self.site_packages(site, packages)
+        self.mark(path, stale)
+
+    def site_packages(self, site: Path, packages: int) -> None:
+        for index in range(packages):
+            name = f"{self.rng.choice(_LIBRARIES)}_{index}"
+            package = self.mkdir(site / name)
+            self.write(package / "__init__.py", f'"""{name}."""\n')
+            self.write(self.mkdir(package / "__pycache__") / "__init__.pyc", "pyc")
+            info = self.mkdir(site / f"{name}-1.{index % 10}.0.dist-info")
+            self.write(info / "METADATA", f"Name: {name}\nVersion: 1.0\n")
+            self.write(info / "RECORD", f"{name}/__init__.py,,\n")
+
+    def package(self, path: Path, depth: int, pyc_files: int) -> None:
+        self.mkdir(path)
+        self.write(path / "__init__.py")
+        self.write(path / "core.py", "VALUE = 1\n")
+        cache = self.mkdir(path / "__pycache__")
+        for index in range(pyc_files):
+            self.write(cache / f"module{index}.cpython-312.pyc", "pyc")
+        if depth > 1:
+            for index in range(self.rng.randint(1, 2)):
+                self.package(path / f"sub{index}", depth - 1, pyc_files)
+
+    def mark(self, path: Path, stale: bool) -> None:
+        self.manifest.environments += 1
+        if stale:
+            self.manifest.stale_environments += 1
+            os.utime(path, (_STALE_MTIME, _STALE_MTIME))
+
+
+def generate_tree(root: Path, scale: Scale, seed: int = 0) -> TreeManifest:
+    """Build the tree for ``scale`` under the empty or missing ``root``.
+
+    Returns the manifest, which is also written to ``root``; the counts
+    exclude ``root`` and the manifest itself.
+    """
+    root.mkdir(parents=True, exist_ok=True)
+    if any(root.iterdir()):
+        raise ValueError(f"{root} is not empty")
+    manifest = TreeManifest(scale=scale.name, seed=seed)
+    build = _Builder(root, manifest, random.Random(seed))
+    rng = build.rng
+
+    projects = build.mkdir(root / "projects")
+    for index in range(scale.projects):
+        group = projects / f"group{index // _GROUP_SIZE:03d}"
+        if index % _GROUP_SIZE == 0:
+            build.mkdir(group)
+        project = build.mkdir(group / f"project{index:05d}")
+        manifest.projects += 1
+        build.write(project / "pyproject.toml", f'[project]\nname = "p{index}"\n')
+        build.write(project / "README.md", "# project\n")
+        src = build.mkdir(project / "src")
+        build.package(src / f"pkg{index}", scale.package_depth, scale.pyc_per_cache)
+        tests = build.mkdir(project / "tests")
+        build.write(tests / "test_core.py", "def test_core():\n    pass\n")
+        if rng.randrange(scale.venv_every) == 0:
+            spread = scale.packages_per_venv // 5
+            packages = scale.packages_per_venv + rng.randint(-spread, spread)
+            build.venv(project / ".venv", packages, stale=rng.random() < 0.3)
+        if rng.randrange(scale.tox_every) == 0:
+            tox = build.mkdir(project / ".tox")
+            build.mkdir(tox / "log")
+            for python in rng.sample(_PYTHONS, 2):
+                name = "py" + python.replace(".", "")
+                build.venv(tox / name, 10, stale=rng.random() < 0.5)
+
+    envs = build.mkdir(build.mkdir(root / "miniconda3") / "envs")
+    for index in range(scale.conda_envs):
+        build.conda_env(
+            envs / f"env{index:02d}", scale.packages_per_venv, stale=index % 2 == 1
+        )
+
+    data = build.mkdir(root / "datasets")
+    for index in range(scale.flat_dirs):
+        flat = build.mkdir(data / f"flat{index}")
+        for number in range(scale.files_per_flat_dir):
+            build.write(flat / f"sample{number:06d}.json", "{}\n")
+
+    manifest.write(root)
+    return manifest
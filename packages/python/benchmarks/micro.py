@@ -0,0 +1,222 @@
+"""Microbenchmarks of the detector, artifact and report hot paths.
+
+Each benchmark calls one function on a fixture cut from a generated tree,
+so a regression shows up against the function that caused it rather than
+in the noise of a whole scan. Timing follows ``timeit``: the loop count is
+picked so that one sample takes at least 0.2 seconds, garbage collection is
+off while sampling, and every sample is reported per call.
+"""
+
+from __future__ import annotations
+
+import os
+import statistics
+import timeit
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from envoic.artifacts import calculate_path_size, match_artifact, summarize_artifacts
+from envoic.detector import (
+    _find_site_packages_dir,
+    detect_environment,
+    quick_is_environment_dir,
+)
+from envoic.models import ScanResult, to_serializable_dict
+from envoic.report import format_report
+from envoic.scanner import scan
+
+from .generator import Scale, generate_tree
+from .results import format_seconds
+
+FIXTURE_SCALE = Scale("micro", 20, 2, 200, 5, 2, 3, 4, 1, 500)
+FIXTURE_DEPTH = 8
+# Names in the directory that ``match_artifact`` is run over: every kind of
+# artifact plus the ordinary names that make up most of a real listing.
+MIXED_DIRS = (
+    "__pycache__",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".ruff_cache",
+    ".tox",
+    "build",
+    "dist",
+    "demo.egg-info",
+    "htmlcov",
+    "src",
+    "tests",
+    "docs",
+    "node_modules",
+    ".git",
+    "data",
+)
+MIXED_FILES = ("pyproject.toml", "README.md", "module.pyc", ".coverage", "app.py")
+
+
+@dataclass(frozen=True, slots=True)
+class Benchmark:
+    name: str
+    func: Callable[[], object]
+    # Calls of the measured function made by one ``func()``.
+    calls: int = 1
+
+
+@dataclass(slots=True)
+class MicroResult:
+    name: str
+    # Calls timed in each sample.
+    calls: int
+    seconds: list[float] = field(default_factory=list)
+    # Median of each round, whose spread is the noise between runs.
+    run_medians: list[float] = field(default_factory=list)
+
+    @property
+    def median_seconds(self) -> float:
+        return statistics.median(self.seconds)
+
+    @property
+    def spread(self) -> float:
+        """Sample standard deviation relative to the median."""
+        if len(self.seconds) < 2:
+            return 0.0
+        return statistics.stdev(self.seconds) / self.median_seconds
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "calls": self.calls,
+            "seconds": self.seconds,
+            "run_medians": self.run_medians,
+            "median_seconds": self.median_seconds,
+            "min_seconds": min(self.seconds),
+            "spread": self.spread,
+        }
+
+
+def _first_venv(root: Path) -> Path:
+    for dirpath, dirnames, _ in os.walk(root):
+        if ".venv" in dirnames:
+            return Path(dirpath) / ".venv"
+        dirnames.sort()
+    raise ValueError(f"no .venv under {root}")
+
+
+def build_fixtures(root: Path) -> list[Benchmark]:
+    """Generate the fixture tree under ``root`` and bind every benchmark."""
+    generate_tree(root / "tree", FIXTURE_SCALE)
+    venv = _first_venv(root / "tree" / "projects")
+    conda = root / "tree" / "miniconda3" / "envs" / "env00"
+    project = venv.parent
+
+    mixed = root / "mixed"
+    mixed.mkdir()
+    for name in MIXED_DIRS:
+        (mixed / name).mkdir()
+    for name in MIXED_FILES:
+        (mixed / name).write_text("", encoding="utf-8")
+    with os.scandir(mixed) as listing:
+        entries = sorted(listing, key=lambda entry: entry.name)
+
+    discovery = scan(root / "tree", FIXTURE_DEPTH, include_artifacts=True, deep=True)
+    envs = [detect_environment(path, deep=True) for path in discovery.environments]
+    result = ScanResult(
+        scan_path=root / "tree",
+        scan_depth=FIXTURE_DEPTH,
+        duration_seconds=1.0,
+        environments=envs,
+        total_size_bytes=sum(env.size_bytes or 0 for env in envs),
+        hostname="bench",
+        timestamp=datetime(2025, 1, 1, tzinfo=UTC),
+        artifacts=discovery.artifacts,
+        artifact_summary=summarize_artifacts(discovery.artifacts, discovery.links),
+        stats=discovery.stats,
+        total_exclusive_bytes=sum(env.exclusive_bytes or 0 for env in envs),
+    )
+
+    def match_all() -> None:
+        for entry in entries:
+            match_artifact(entry, mixed)
+
+    return [
+        Benchmark("artifacts.match_artifact", match_all, len(entries)),
+        Benchmark(
+            "artifacts.calculate_path_size[venv]",
+            lambda: calculate_path_size(venv),
+        ),
+        Benchmark(
+            "detector.quick_is_environment_dir[venv]",
+            lambda: quick_is_environment_dir(venv),
+        ),
+        Benchmark(
+            "detector.quick_is_environment_dir[project]",
+            lambda: quick_is_environment_dir(project),
+        ),
+        Benchmark(
+            "detector.detect_environment[venv]", lambda: detect_environment(venv)
+        ),
+        Benchmark(
+            "detector.detect_environment[conda]", lambda: detect_environment(conda)
+        ),
+        Benchmark(
+            "detector.detect_environment[venv,deep]",
+            lambda: detect_environment(venv, deep=True),
+        ),
+        Benchmark(
+            "detector._find_site_packages_dir[venv]",
+            lambda: _find_site_packages_dir(venv),
+        ),
+        Benchmark(
+            "models.to_serializable_dict[scan_result]",
+            lambda: to_serializable_dict(result),
+        ),
+        Benchmark(
+            "report.format_report[deep]",
+            lambda: format_report(result, deep=True, show_artifact_details=True),
+        ),
+    ]
+
+
+def run_suite(
+    benchmarks: Iterable[Benchmark],
+    *,
+    repeat: int = 5,
+    runs: int = 1,
+    only: str | None = None,
+) -> list[MicroResult]:
+    """Run every benchmark whose name contains ``only`` (all by default).
+
+    Each of ``runs`` rounds takes ``repeat`` samples of every benchmark in
+    turn, so slow drift in the machine spreads over all of them instead of
+    landing on whichever ran last.
+    """
+    timed: list[tuple[timeit.Timer, int, MicroResult]] = []
+    for benchmark in benchmarks:
+        if only is not None and only not in benchmark.name:
+            continue
+        timer = timeit.Timer(benchmark.func)
+        loops, _ = timer.autorange()
+        result = MicroResult(benchmark.name, loops * benchmark.calls)
+        timed.append((timer, loops, result))
+    for _ in range(runs):
+        for timer, loops, result in timed:
+            samples = [
+                sample / result.calls
+                for sample in timer.repeat(repeat=repeat, number=loops)
+            ]
+            result.seconds.extend(samples)
+            result.run_medians.append(statistics.median(samples))
+    return [result for _, _, result in timed]
+
+
+def format_results(results: list[MicroResult]) -> str:
+    width = max([len("Benchmark"), *(len(result.name) for result in results)])
+    header = f"{'Benchmark':<{width}} {'Median':>10} {'Min':>10} {'Spread':>7}"
+    lines = [header, "-" * len(header)]
+    for result in results:
+        lines.append(
+            f"{result.name:<{width}} {format_seconds(result.median_seconds):>10} "
+            f"{format_seconds(min(result.seconds)):>10} {result.spread:>6.1%}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,50 @@
+"""The JSON document every suite writes, and reading it back."""
+
+from __future__ import annotations
+
+import json
+import platform
+import sys
+from pathlib import Path
+from typing import Any
+
+from envoic import __version__
+
+
+def results_document(
+    suite: str, settings: dict[str, Any], results: list[dict[str, Any]]
+) -> dict[str, Any]:
+    """Wrap ``results`` with what is needed to rerun and compare them."""
+    return {
+        "suite": suite,
+        "settings": settings,
+        "envoic": __version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": sys.platform,
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def write_results(document: dict[str, Any], output: Path) -> None:
+    output.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+
+
+def read_results(path: Path) -> dict[str, Any]:
+    try:
+        document = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as exc:
+        raise ValueError(f"Cannot read benchmark results from {path}: {exc}") from exc
+    if not isinstance(document, dict) or "results" not in document:
+        raise ValueError(f"{path} is not a benchmark results file")
+    return document
+
+
+def format_seconds(seconds: float | None) -> str:
+    if seconds is None:
+        return "-"
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
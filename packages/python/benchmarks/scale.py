@@ -0,0 +1,244 @@
+"""End-to-end timings of the CLI on generated trees.
+
+Every command runs as a fresh ``envoic`` process, so interpreter start-up
+and imports count, as they do for users. Throughput is normalised to the
+tree: dirs/sec divides the directories a plain ``scan`` lists by the median
+wall time of the command, and envs/sec does the same with the environments
+that ``scan`` reports. Commands that walk less than ``scan`` therefore look
+faster, which is the point. Peak RSS is the child's ``ru_maxrss``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from envoic.scanner import WalkEngine
+from envoic.utils import format_size
+
+from .generator import Scale, TreeManifest, generate_tree
+
+_ENTRY = "from envoic.cli import main; main()"
+
+
+@dataclass(frozen=True, slots=True)
+class Command:
+    name: str
+    args: tuple[str, ...]
+    # ``health`` exits 1 when it finds broken environments, as these are.
+    exit_codes: frozenset[int] = frozenset({0})
+    # Whether the command takes ``--engine``; ``clean`` always walks by path.
+    takes_engine: bool = True
+
+
+COMMANDS: dict[str, Command] = {
+    command.name: command
+    for command in (
+        Command("scan", ("scan", "--json")),
+        Command("scan-deep", ("scan", "--deep", "--json")),
+        Command("health", ("health", "--json"), frozenset({0, 1})),
+        Command("list", ("list",)),
+        Command("clean-dry-run", ("clean", "--dry-run"), takes_engine=False),
+    )
+}
+
+
+@dataclass(slots=True)
+class CommandResult:
+    scale: str
+    command: str
+    directories: int
+    environments: int
+    seconds: list[float] = field(default_factory=list)
+    # Median of each round, whose spread is the noise between runs.
+    run_medians: list[float] = field(default_factory=list)
+    peak_rss_bytes: int | None = None
+
+    @property
+    def median_seconds(self) -> float:
+        return statistics.median(self.seconds)
+
+    @property
+    def dirs_per_sec(self) -> float:
+        return self.directories / self.median_seconds
+
+    @property
+    def envs_per_sec(self) -> float:
+        return self.environments / self.median_seconds
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": f"{self.scale}/{self.command}",
+            "scale": self.scale,
+            "command": self.command,
+            "directories": self.directories,
+            "environments": self.environments,
+            "seconds": self.seconds,
+            "run_medians": self.run_medians,
+            "median_seconds": self.median_seconds,
+            "dirs_per_sec": self.dirs_per_sec,
+            "envs_per_sec": self.envs_per_sec,
+            "peak_rss_bytes": self.peak_rss_bytes,
+        }
+
+
+def _envoic(args: Iterable[str]) -> list[str]:
+    return [sys.executable, "-c", _ENTRY, *args]
+
+
+def _run_once(argv: list[str], exit_codes: frozenset[int]) -> tuple[float, int | None]:
+    """Run ``argv`` and return its wall time and peak RSS in bytes."""
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        argv, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    peak: int | None = None
+    if hasattr(os, "wait4"):
+        # Reap the child ourselves to read its own rusage; RUSAGE_CHILDREN
+        # would report the largest child seen so far instead.
+        stderr = process.stderr.read() if process.stderr else ""
+        _, status, usage = os.wait4(process.pid, 0)
+        process.returncode = os.waitstatus_to_exitcode(status)
+        # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+        peak = usage.ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+    else:
+        _, stderr = process.communicate()
+    elapsed = time.perf_counter() - start
+    if process.returncode not in exit_codes:
+        raise RuntimeError(
+            f"{' '.join(argv[3:])} exited with {process.returncode}: {stderr}"
+        )
+    return elapsed, peak
+
+
+def reference_counts(root: Path, depth: int) -> tuple[int, int]:
+    """Directories listed and environments reported by ``scan`` of ``root``."""
+    completed = subprocess.run(
+        _envoic(["scan", str(root), "--depth", str(depth), "--json"]),
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    report = json.loads(completed.stdout)
+    return report["stats"]["directories_listed"], len(report["environments"])
+
+
+def run_command(
+    command: Command,
+    root: Path,
+    result: CommandResult,
+    *,
+    depth: int,
+    repeat: int,
+    engine: WalkEngine = "path",
+) -> None:
+    """Time ``repeat`` runs of ``command`` on ``root`` as one round of ``result``."""
+    args = [*command.args, str(root), "--depth", str(depth)]
+    if command.takes_engine:
+        args += ["--engine", engine]
+    argv = _envoic(args)
+    samples: list[float] = []
+    for _ in range(repeat):
+        elapsed, peak = _run_once(argv, command.exit_codes)
+        samples.append(elapsed)
+        if peak is not None:
+            result.peak_rss_bytes = max(result.peak_rss_bytes or 0, peak)
+    result.seconds.extend(samples)
+    result.run_medians.append(statistics.median(samples))
+
+
+@contextmanager
+def prepared_tree(
+    scale: Scale, seed: int, workdir: Path | None
+) -> Iterator[tuple[Path, TreeManifest]]:
+    """Yield the tree for ``scale``, reusing one kept under ``workdir``."""
+    if workdir is None:
+        temp = Path(tempfile.mkdtemp(prefix=f"envoic-bench-{scale.name}-"))
+        try:
+            yield temp, generate_tree(temp / "tree", scale, seed)
+        finally:
+            shutil.rmtree(temp, ignore_errors=True)
+        return
+
+    root = workdir / f"{scale.name}-{seed}"
+    manifest = TreeManifest.read(root)
+    if manifest is None or manifest.scale != scale.name or manifest.seed != seed:
+        shutil.rmtree(root, ignore_errors=True)
+        manifest = generate_tree(root, scale, seed)
+    yield root, manifest
+
+
+def run_suite(
+    scales: Iterable[Scale],
+    commands: Iterable[Command],
+    *,
+    seed: int = 0,
+    depth: int = 8,
+    repeat: int = 3,
+    runs: int = 1,
+    workdir: Path | None = None,
+    progress: bool = False,
+    engine: WalkEngine = "path",
+) -> list[CommandResult]:
+    """Time every command on the tree of every scale, ``repeat`` times each.
+
+    Commands take turns for ``runs`` rounds per tree. The reference ``scan``
+    runs first and also warms the page cache, so every sample is a
+    warm-cache measurement. Commands that walk with a choice of traversal
+    engine use ``engine``.
+    """
+    commands = list(commands)
+    results: list[CommandResult] = []
+    for scale in scales:
+        with prepared_tree(scale, seed, workdir) as (root, manifest):
+            if progress:
+                print(
+                    f"{scale.name}: {manifest.directories:,} dirs, "
+                    f"{manifest.files:,} files, "
+                    f"{manifest.environments:,} environments built",
+                    file=sys.stderr,
+                )
+            counts = reference_counts(root, depth)
+            timed = [
+                (command, CommandResult(scale.name, command.name, *counts))
+                for command in commands
+            ]
+            for _ in range(runs):
+                for command, result in timed:
+                    run_command(
+                        command,
+                        root,
+                        result,
+                        depth=depth,
+                        repeat=repeat,
+                        engine=engine,
+                    )
+            results.extend(result for _, result in timed)
+    return results
+
+
+def format_results(results: list[CommandResult]) -> str:
+    header = (
+        f"{'Scale':<8} {'Command':<14} {'Median':>9} {'Dirs/s':>10} "
+        f"{'Envs/s':>9} {'Peak RSS':>9}"
+    )
+    lines = [header, "-" * len(header)]
+    for result in results:
+        lines.append(
+            f"{result.scale:<8} {result.command:<14} "
+            f"{result.median_seconds:>8.3f}s {result.dirs_per_sec:>10,.0f} "
+            f"{result.envs_per_sec:>9,.1f} "
+            f"{format_size(result.peak_rss_bytes):>9}"
+        )
+    return "\n".join(lines)
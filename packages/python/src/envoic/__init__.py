@@ -7,9 +7,13 @@ from .models import (
     EnvInfo,
     EnvInfoDict,
     EnvType,
+    RootScan,
+    RootScanDict,
     SafetyLevel,
     ScanResult,
     ScanResultDict,
+    ScanStats,
+    ScanStatsDict,
     to_serializable_dict,
 )
 
@@ -22,8 +26,12 @@ __all__ = [
     "EnvInfo",
     "EnvInfoDict",
     "EnvType",
+    "RootScan",
+    "RootScanDict",
     "SafetyLevel",
     "ScanResult",
     "ScanResultDict",
+    "ScanStats",
+    "ScanStatsDict",
     "to_serializable_dict",
 ]
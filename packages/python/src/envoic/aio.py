@@ -0,0 +1,227 @@
+"""Asyncio counterparts of the scanner and detector for use inside event loops.
+
+Filesystem work runs on a bounded thread pool, so the loop never blocks on
+``scandir`` or ``stat``. Results are yielded as soon as the directory that
+produced them has been visited. Cancelling the consuming task, or closing the
+generator after leaving an ``async for`` early (``contextlib.aclosing``),
+cancels every visit that has not started yet.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+from collections.abc import AsyncGenerator, Iterable
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import aclosing
+from pathlib import Path
+from typing import TypeVar
+
+from . import detector
+from .detector import is_reported
+from .index import ScanIndex
+from .models import EnvInfo, ScanStats
+from .mounts import MountPolicy, read_mounts
+from .scanner import (
+    DirectoryVisit,
+    PendingDir,
+    ScanItem,
+    WalkConfig,
+    visit_directory,
+    walk_config,
+)
+
+DEFAULT_JOBS = 8
+
+_T = TypeVar("_T")
+
+
+class _Runner:
+    """Runs blocking calls on ``executor``, at most ``jobs`` at a time."""
+
+    def __init__(self, executor: Executor | None, jobs: int) -> None:
+        if jobs < 1:
+            raise ValueError("jobs must be at least 1")
+        self.jobs = jobs
+        self._owned = executor is None
+        self.executor = executor or ThreadPoolExecutor(
+            max_workers=jobs, thread_name_prefix="envoic-aio"
+        )
+
+    def submit(self, func: functools.partial[_T]) -> asyncio.Future[_T]:
+        return asyncio.get_running_loop().run_in_executor(self.executor, func)
+
+    def close(self) -> None:
+        if self._owned:
+            # Do not wait: visits already running finish on their own, and
+            # waiting here would block the event loop.
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def scan(
+    root: Path,
+    max_depth: int = 5,
+    *,
+    include_artifacts: bool = False,
+    deep: bool = False,
+    jobs: int = DEFAULT_JOBS,
+    executor: Executor | None = None,
+    stats: ScanStats | None = None,
+    index: ScanIndex | None = None,
+    time_budget: float | None = None,
+    max_entries: int | None = None,
+    mount_policy: MountPolicy | None = None,
+    exclude: Iterable[str] = (),
+) -> AsyncGenerator[ScanItem, None]:
+    """Async ``scanner.iter_scan``: yield environments and artifacts under ``root``.
+
+    At most ``jobs`` directories are visited at once, on ``executor`` when one
+    is given or on a private thread pool otherwise. Items are yielded in
+    completion order.
+    """
+    runner = _Runner(executor, jobs)
+    in_flight: dict[asyncio.Future[DirectoryVisit], int] = {}
+    try:
+        root = await runner.submit(functools.partial(Path.resolve, root))
+        base = walk_config(
+            max_depth,
+            include_artifacts=include_artifacts,
+            deep=deep,
+            index=index,
+            time_budget=time_budget,
+            max_entries=max_entries,
+            exclude=exclude,
+        )
+        mounts = await runner.submit(functools.partial(read_mounts))
+        config = await runner.submit(
+            functools.partial(
+                base.for_root, root, mount_policy=mount_policy, mounts=mounts
+            )
+        )
+        visited: set[tuple[int, int]] = set()
+        first = await runner.submit(
+            functools.partial(PendingDir.for_root, root, visited)
+        )
+        waiting: list[tuple[PendingDir, int]] = [(first, 1)]
+
+        while waiting or in_flight:
+            if config.expired():
+                if stats is not None:
+                    stats.directories_unvisited += len(waiting) + len(in_flight)
+                return
+            while waiting and len(in_flight) < runner.jobs:
+                pending, depth = waiting.pop()
+                in_flight[_visit(runner, pending, config, depth)] = depth
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                depth = in_flight.pop(future)
+                visit = future.result()
+                if depth < config.max_depth:
+                    waiting.extend(
+                        (child, depth + 1)
+                        for child in reversed(visit.subdirs)
+                        if child.claim(visited)
+                    )
+                if stats is not None:
+                    stats.merge(visit.stats)
+                for artifact in visit.artifacts:
+                    yield artifact
+                for env_path in visit.environments:
+                    yield env_path
+    finally:
+        for future in in_flight:
+            future.cancel()
+        runner.close()
+
+
+def _visit(
+    runner: _Runner, pending: PendingDir, config: WalkConfig, depth: int
+) -> asyncio.Future[DirectoryVisit]:
+    leaf = depth >= config.max_depth
+    return runner.submit(functools.partial(visit_directory, pending, config, leaf=leaf))
+
+
+async def detect_environment(
+    path: Path,
+    *,
+    deep: bool = False,
+    stale_days: int = 90,
+    include_dotenv: bool = False,
+    executor: Executor | None = None,
+) -> EnvInfo:
+    """Async ``detector.detect_environment``, run on ``executor``."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor,
+        functools.partial(
+            detector.detect_environment,
+            path,
+            deep=deep,
+            stale_days=stale_days,
+            include_dotenv=include_dotenv,
+        ),
+    )
+
+
+async def scan_environments(
+    root: Path,
+    max_depth: int = 5,
+    *,
+    deep: bool = False,
+    stale_days: int = 90,
+    include_dotenv: bool = False,
+    jobs: int = DEFAULT_JOBS,
+    executor: Executor | None = None,
+    stats: ScanStats | None = None,
+    exclude: Iterable[str] = (),
+) -> AsyncGenerator[EnvInfo, None]:
+    """Scan ``root`` and yield each recognised environment once it is detected.
+
+    Detection of one candidate overlaps with the walk and with detection of
+    the others, sharing the same ``jobs`` bound.
+    """
+    runner = _Runner(executor, jobs)
+    detecting: set[asyncio.Future[EnvInfo]] = set()
+
+    def finished() -> list[EnvInfo]:
+        done = {future for future in detecting if future.done()}
+        detecting.difference_update(done)
+        envs = [future.result() for future in done]
+        return [env for env in envs if is_reported(env, include_dotenv=include_dotenv)]
+
+    try:
+        candidates = scan(
+            root,
+            max_depth,
+            jobs=jobs,
+            executor=runner.executor,
+            stats=stats,
+            exclude=exclude,
+        )
+        async with aclosing(candidates):
+            async for item in candidates:
+                if not isinstance(item, Path):
+                    continue
+                if len(detecting) >= runner.jobs:
+                    await asyncio.wait(detecting, return_when=asyncio.FIRST_COMPLETED)
+                for env in finished():
+                    yield env
+                detecting.add(
+                    runner.submit(
+                        functools.partial(
+                            detector.detect_environment,
+                            item,
+                            deep=deep,
+                            stale_days=stale_days,
+                            include_dotenv=include_dotenv,
+                        )
+                    )
+                )
+        while detecting:
+            await asyncio.wait(detecting, return_when=asyncio.FIRST_COMPLETED)
+            for env in finished():
+                yield env
+    finally:
+        for future in detecting:
+            future.cancel()
+        runner.close()
@@ -2,10 +2,19 @@ from __future__ import annotations
 
 import os
 from collections import defaultdict
+from collections.abc import Container
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Literal, TypedDict
 
-from .models import ArtifactCategory, ArtifactInfo, ArtifactSummary, SafetyLevel
+from .models import (
+    ArtifactCategory,
+    ArtifactInfo,
+    ArtifactSummary,
+    SafetyLevel,
+    ScanStats,
+)
+from .sizing import LinkTally, disk_usage
 
 
 class ArtifactPattern(TypedDict, total=False):
@@ -14,6 +23,11 @@ class ArtifactPattern(TypedDict, total=False):
     type: Literal["dir", "file"]
     category: ArtifactCategory
     safety: SafetyLevel
+    # The pattern only applies when the parent holds one of these names.
+    requires: tuple[str, ...]
+
+
+PROJECT_MARKERS = ("pyproject.toml", "setup.py", "setup.cfg")
 
 
 ARTIFACT_PATTERNS: list[ArtifactPattern] = [
@@ -70,12 +84,14 @@ ARTIFACT_PATTERNS: list[ArtifactPattern] = [
         "type": "dir",
         "category": ArtifactCategory.BUILD_ARTIFACT,
         "safety": SafetyLevel.USUALLY_SAFE,
+        "requires": PROJECT_MARKERS,
     },
     {
         "name": "build",
         "type": "dir",
         "category": ArtifactCategory.BUILD_ARTIFACT,
         "safety": SafetyLevel.USUALLY_SAFE,
+        "requires": PROJECT_MARKERS,
     },
     {
         "name": ".eggs",
@@ -141,13 +157,6 @@ CAREFUL_NOTES: dict[str, str] = {
 }
 
 
-def is_python_project_dir(parent: Path) -> bool:
-    return any(
-        (parent / marker).exists()
-        for marker in ("pyproject.toml", "setup.py", "setup.cfg")
-    )
-
-
 def _pattern_name(pattern: ArtifactPattern) -> str:
     if "name" in pattern:
         return pattern["name"]
@@ -155,63 +164,186 @@ def _pattern_name(pattern: ArtifactPattern) -> str:
     return f"*{suffix}"
 
 
-def _matches_pattern(entry: os.DirEntry[str], pattern: ArtifactPattern) -> bool:
-    name = entry.name
-    target_type = pattern["type"]
-    if target_type == "dir" and not entry.is_dir(follow_symlinks=False):
-        return False
-    if target_type == "file" and not entry.is_file(follow_symlinks=False):
-        return False
-
-    if "name" in pattern and name != pattern["name"]:
-        return False
-    if "suffix" in pattern and not name.endswith(pattern["suffix"]):
-        return False
-    return True
-
-
-def match_artifact(entry: os.DirEntry[str], parent: Path) -> ArtifactInfo | None:
-    for pattern in ARTIFACT_PATTERNS:
-        if not _matches_pattern(entry, pattern):
-            continue
+@dataclass(frozen=True, slots=True)
+class _Rule:
+    """One ``ArtifactPattern`` compiled for ``match_artifact``."""
 
-        pattern_name = _pattern_name(pattern)
-        if pattern_name in {"build", "dist"} and not is_python_project_dir(parent):
-            continue
+    position: int
+    pattern: str
+    want_dir: bool
+    suffix: str | None
+    category: ArtifactCategory
+    safety: SafetyLevel
+    # Names the parent must hold one of; empty when the rule has none.
+    requires: frozenset[str]
 
+    def info(self, path: Path) -> ArtifactInfo:
         return ArtifactInfo(
-            path=Path(entry.path).resolve(),
-            category=pattern["category"],
-            safety=pattern["safety"],
-            pattern_matched=pattern_name,
+            path=path,
+            category=self.category,
+            safety=self.safety,
+            pattern_matched=self.pattern,
         )
-    return None
 
 
-def calculate_path_size(path: Path) -> int:
-    try:
-        if path.is_symlink():
-            return path.lstat().st_size
-        if path.is_file():
-            return path.stat().st_size
-    except OSError:
-        return 0
-
-    total = 0
-    for root, _, files in os.walk(path, followlinks=False):
-        for filename in files:
-            file_path = Path(root) / filename
-            try:
-                if file_path.is_symlink():
-                    total += file_path.lstat().st_size
-                else:
-                    total += file_path.stat().st_size
-            except OSError:
+def _extension(name: str) -> str:
+    """Text after the last dot of ``name``: the key of the suffix index."""
+    return name[name.rfind(".") + 1 :]
+
+
+def _compile_patterns(
+    patterns: list[ArtifactPattern],
+) -> tuple[dict[str, tuple[_Rule, ...]], dict[str, tuple[_Rule, ...]]]:
+    """Index ``patterns`` by exact name and by the extension of their suffix.
+
+    Each bucket keeps the order of ``patterns``, so the first pattern that
+    matches still wins. A name bucket also holds the suffix rules that its
+    name ends with, which makes it the complete candidate list for the name.
+    """
+    rules: list[_Rule] = []
+    for position, pattern in enumerate(patterns):
+        suffix = pattern.get("suffix")
+        if suffix is not None and "." not in suffix:
+            raise ValueError(f"Artifact suffix {suffix!r} must contain a dot")
+        name = _pattern_name(pattern)
+        rules.append(
+            _Rule(
+                position=position,
+                pattern=name,
+                want_dir=pattern["type"] == "dir",
+                suffix=suffix,
+                category=pattern["category"],
+                safety=pattern["safety"],
+                requires=frozenset(pattern.get("requires", ())),
+            )
+        )
+
+    by_name: defaultdict[str, list[_Rule]] = defaultdict(list)
+    by_extension: defaultdict[str, list[_Rule]] = defaultdict(list)
+    names = dict.fromkeys(pattern["name"] for pattern in patterns if "name" in pattern)
+    for rule in rules:
+        if rule.suffix is None:
+            by_name[patterns[rule.position]["name"]].append(rule)
+            continue
+        by_extension[_extension(rule.suffix)].append(rule)
+        for name in names:
+            if name.endswith(rule.suffix):
+                by_name[name].append(rule)
+    return (
+        {
+            key: tuple(sorted(bucket, key=lambda rule: rule.position))
+            for key, bucket in by_name.items()
+        },
+        {key: tuple(bucket) for key, bucket in by_extension.items()},
+    )
+
+
+_RULES_BY_NAME, _RULES_BY_EXTENSION = _compile_patterns(ARTIFACT_PATTERNS)
+_PATTERN_SUFFIXES = tuple(
+    pattern["suffix"] for pattern in ARTIFACT_PATTERNS if "suffix" in pattern
+)
+_RULES_BY_PATTERN = {
+    rule.pattern: rule
+    for rules in (*_RULES_BY_NAME.values(), *_RULES_BY_EXTENSION.values())
+    for rule in rules
+}
+# Every name some pattern looks for in the parent directory.
+PARENT_MARKERS = frozenset(
+    marker for rule in _RULES_BY_PATTERN.values() for marker in rule.requires
+)
+# Names and suffixes whose match depends on the parent's listing.
+_PARENT_AWARE_NAMES = frozenset(
+    name for name, rules in _RULES_BY_NAME.items() if any(r.requires for r in rules)
+)
+_PARENT_AWARE_SUFFIXES = tuple(
+    rule.suffix
+    for rules in _RULES_BY_EXTENSION.values()
+    for rule in rules
+    if rule.requires and rule.suffix is not None
+)
+
+
+def _candidates(name: str) -> tuple[_Rule, ...]:
+    """Rules whose name or suffix matches ``name``, in pattern order."""
+    rules = _RULES_BY_NAME.get(name)
+    if rules is not None:
+        return rules
+    if not name.endswith(_PATTERN_SUFFIXES):
+        return ()
+    return tuple(
+        rule
+        for rule in _RULES_BY_EXTENSION.get(_extension(name), ())
+        if name.endswith(rule.suffix or "")
+    )
+
+
+def needs_parent_listing(name: str) -> bool:
+    """Whether matching ``name`` depends on which names its parent holds."""
+    return name in _PARENT_AWARE_NAMES or name.endswith(_PARENT_AWARE_SUFFIXES)
+
+
+def match_artifact(
+    entry: os.DirEntry[str],
+    parent: Path,
+    *,
+    parent_names: Container[str] | None = None,
+) -> ArtifactInfo | None:
+    """Match ``entry`` of the directory ``parent`` against the artifact patterns.
+
+    The artifact path is ``parent / entry.name``; pass a resolved ``parent``
+    to get a canonical path without resolving each artifact. Patterns are
+    looked up by name, so the entry type is only checked for candidates.
+    Patterns that depend on the parent (``build`` and ``dist`` need project
+    markers) check ``parent_names``, the ``PARENT_MARKERS`` found in the
+    parent's listing, and otherwise stat the markers.
+    """
+    name = entry.name
+    # Inlined miss test: nearly every entry of a large tree takes this exit.
+    if name not in _RULES_BY_NAME and not name.endswith(_PATTERN_SUFFIXES):
+        return None
+    for rule in _candidates(name):
+        if rule.want_dir:
+            if not entry.is_dir(follow_symlinks=False):
                 continue
-    return total
+        elif not entry.is_file(follow_symlinks=False):
+            continue
+        if rule.requires and not _parent_holds(rule.requires, parent, parent_names):
+            continue
+        return rule.info(parent / name)
+    return None
+
+
+def _parent_holds(
+    markers: frozenset[str], parent: Path, parent_names: Container[str] | None
+) -> bool:
+    if parent_names is None:
+        return any((parent / marker).exists() for marker in markers)
+    return any(marker in parent_names for marker in markers)
+
+
+def artifact_for_pattern(path: Path, pattern_name: str) -> ArtifactInfo | None:
+    """Rebuild the ``ArtifactInfo`` that ``match_artifact`` gives ``pattern_name``."""
+    rule = _RULES_BY_PATTERN.get(pattern_name)
+    return None if rule is None else rule.info(path)
 
 
-def summarize_artifacts(artifacts: list[ArtifactInfo]) -> list[ArtifactSummary]:
+def calculate_path_size(path: Path, stats: ScanStats | None = None) -> int:
+    """Apparent size of ``path``, counting symlinks themselves.
+
+    Files stat'ed, bytes counted and errors skipped are tallied into
+    ``stats`` when one is given.
+    """
+    return disk_usage(path, stats).apparent_bytes
+
+
+def summarize_artifacts(
+    artifacts: list[ArtifactInfo], links: LinkTally | None = None
+) -> list[ArtifactSummary]:
+    """Group artifacts by pattern, in pattern order.
+
+    With ``links`` (pooled while sizing), each pattern's exclusive total also
+    counts files hard-linked only between its own artifacts.
+    """
     grouped: dict[tuple[ArtifactCategory, SafetyLevel, str], list[ArtifactInfo]] = (
         defaultdict(list)
     )
@@ -231,6 +363,8 @@ def summarize_artifacts(artifacts: list[ArtifactInfo]) -> list[ArtifactSummary]:
                 total_size_bytes=total,
                 items=sorted(items, key=lambda item: str(item.path)),
                 pattern=pattern,
+                total_exclusive_bytes=sum(item.exclusive_bytes or 0 for item in items)
+                + (0 if links is None else links.shared_bytes(pattern)),
             )
         )
     return sorted(
@@ -244,11 +378,10 @@ def summarize_artifacts(artifacts: list[ArtifactInfo]) -> list[ArtifactSummary]:
 
 
 def summarize_with_empty_patterns(
-    artifacts: list[ArtifactInfo],
+    summary: list[ArtifactSummary],
 ) -> list[ArtifactSummary]:
-    by_pattern: dict[str, ArtifactSummary] = {
-        summary.pattern: summary for summary in summarize_artifacts(artifacts)
-    }
+    """Pad ``summary`` with an empty group for every pattern that matched nothing."""
+    by_pattern: dict[str, ArtifactSummary] = {item.pattern: item for item in summary}
     pattern_by_name = {_pattern_name(item): item for item in ARTIFACT_PATTERNS}
     summaries: list[ArtifactSummary] = []
     for pattern_name in PATTERN_ORDER:
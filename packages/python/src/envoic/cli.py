@@ -1,23 +1,43 @@
 from __future__ import annotations
 
+import cProfile
+import io
 import json
+import os
+import pstats
 import socket
+import sys
+import threading
 import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, nullcontext
 from datetime import UTC, datetime
+from functools import partial
 from pathlib import Path
+from types import FrameType
+from typing import Any, TypeAlias
 
 import typer
 
 from . import __version__
 from .artifacts import summarize_artifacts, summarize_with_empty_patterns
-from .detector import activation_hint, detect_environment, list_top_packages
+from .config import load_config
+from .detector import (
+    activation_hint,
+    detect_environment,
+    is_reported,
+    list_top_packages,
+)
+from .excludes import ExcludeMatcher
 from .health import check_environments_health, format_health_report, health_to_dict
+from .index import ScanIndex
 from .manager import (
     confirm_careful_artifacts,
     confirm_deletion,
     delete_environments,
     flatten_artifact_summary,
     interactive_select_with_artifacts,
+    measure_selection,
     print_deletion_report,
 )
 from .models import (
@@ -25,53 +45,362 @@ from .models import (
     ArtifactSummary,
     EnvInfo,
     EnvType,
+    RootScan,
     SafetyLevel,
     ScanResult,
+    ScanStats,
     to_serializable_dict,
 )
-from .report import PathMode, format_info, format_list, format_report
-from .scanner import scan as scan_paths
+from .mounts import PSEUDO_FS_TYPES, MountPolicy
+from .report import PathMode, format_info, format_list, format_report, format_stats
+from .scanner import (
+    FD_ENGINE_AVAILABLE,
+    WalkEngine,
+    collapse_roots,
+    iter_scan_roots,
+    size_artifact,
+)
+from .shards import iter_scan_processes
+from .sizing import ENVIRONMENT_LINKS, LinkTally, SizePipeline
+from .utils import format_env_display_path, io_delta, read_proc_io
+from .watch import InventoryWatcher, WatchEvent
 
 app = typer.Typer(help="Discover and report Python virtual environments.")
 
+# From 3.12 cProfile is built on sys.monitoring, which is process-wide: one
+# profiler sees every thread, and a second one per thread cannot start.
+PROFILER_SEES_ALL_THREADS = sys.version_info >= (3, 12)
 
-def _build_scan_result(
+
+@app.callback()
+def _global_options(
+    ctx: typer.Context,
+    profile: Path | None = typer.Option(
+        None,
+        "--profile",
+        dir_okay=False,
+        help="Run the command under cProfile and write pstats data to FILE.",
+    ),
+    profile_top: int = typer.Option(
+        30,
+        "--profile-top",
+        min=1,
+        help="Number of hot functions --profile prints to stderr.",
+    ),
+) -> None:
+    if profile is None:
+        return
+    profiler = cProfile.Profile()
+    thread_profilers: list[cProfile.Profile] = []
+    if not PROFILER_SEES_ALL_THREADS:
+        # Sizing threads and --jobs workers get a profiler each, merged at
+        # the end.
+        threading.setprofile(partial(_profile_thread, thread_profilers))
+    ctx.call_on_close(
+        lambda: _finish_profile(profiler, thread_profilers, profile, profile_top)
+    )
+    profiler.enable()
+
+
+def _profile_thread(
+    profilers: list[cProfile.Profile], frame: FrameType, event: str, arg: object
+) -> None:
+    """First profile event of a new thread: hand the thread to its own profiler."""
+    sys.setprofile(None)
+    thread_profiler = cProfile.Profile()
+    try:
+        thread_profiler.enable()
+    except ValueError:
+        # Another profiler owns the interpreter; leave the thread unprofiled
+        # rather than kill it.
+        return
+    profilers.append(thread_profiler)
+
+
+def _finish_profile(
+    profiler: cProfile.Profile,
+    thread_profilers: list[cProfile.Profile],
     path: Path,
-    depth: int,
+    top: int,
+) -> None:
+    if not PROFILER_SEES_ALL_THREADS:
+        threading.setprofile(None)
+    profiler.disable()
+    report = io.StringIO()
+    stats = pstats.Stats(profiler, stream=report)
+    if thread_profilers:
+        stats.add(*thread_profilers)
+    stats.dump_stats(path)
+    stats.strip_dirs().sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+    typer.echo(report.getvalue().strip("\n"), err=True)
+    typer.echo(f"Profile written to {path}", err=True)
+
+
+def _scan_index(
+    use_index: bool, rebuild_index: bool
+) -> AbstractContextManager[ScanIndex | None]:
+    if not (use_index or rebuild_index):
+        return nullcontext()
+    return ScanIndex(rebuild=rebuild_index)
+
+
+def _detect_candidate(
+    candidate: Path,
     *,
     deep: bool,
     stale_days: int,
     include_dotenv: bool,
-    include_artifacts: bool = True,
-) -> ScanResult:
-    start = time.perf_counter()
-    discovery = scan_paths(
-        path,
-        max_depth=depth,
-        include_artifacts=include_artifacts,
+    index: ScanIndex | None = None,
+    stats: ScanStats | None = None,
+    links: LinkTally | None = None,
+) -> EnvInfo | None:
+    detect = detect_environment if index is None else index.detect_environment
+    env_info = detect(
+        candidate,
         deep=deep,
+        stale_days=stale_days,
+        include_dotenv=include_dotenv,
+        stats=stats,
+        links=links,
     )
+    if not is_reported(env_info, include_dotenv=include_dotenv):
+        return None
+    return env_info
 
-    envs: list[EnvInfo] = []
-    for candidate in discovery.environments:
-        env_info = detect_environment(
-            candidate,
+
+def _collect_roots(paths: list[Path] | None, roots_from: Path | None) -> list[Path]:
+    roots = list(paths or [])
+    if roots_from is not None:
+        for line in roots_from.read_text(encoding="utf-8").splitlines():
+            entry = line.strip()
+            if not entry or entry.startswith("#"):
+                continue
+            root = Path(entry).expanduser()
+            if not root.is_dir():
+                typer.echo(
+                    f"Error: {roots_from} lists a root that is not a directory: {entry}",
+                    err=True,
+                )
+                raise typer.Exit(code=1)
+            roots.append(root)
+    return collapse_roots(roots or [Path(".")])
+
+
+def _common_root(roots: list[Path]) -> Path:
+    """Shared parent of ``roots``, used only to label the report."""
+    try:
+        return Path(os.path.commonpath(roots))
+    except ValueError:
+        # Roots on different Windows drives share no parent.
+        return roots[0]
+
+
+def _mount_policy(
+    one_file_system: bool, skip_fs_types: list[str], include_fs_types: list[str]
+) -> MountPolicy:
+    return MountPolicy(
+        skip_types=PSEUDO_FS_TYPES | frozenset(skip_fs_types),
+        include_types=frozenset(include_fs_types),
+        one_file_system=one_file_system,
+    )
+
+
+def _exclude_patterns(exclude: list[str]) -> list[str]:
+    try:
+        patterns = [*load_config().exclude, *exclude]
+        ExcludeMatcher(patterns)
+    except ValueError as exc:
+        typer.echo(f"Error: {exc}", err=True)
+        raise typer.Exit(code=1) from exc
+    return patterns
+
+
+def _describe_roots(roots: list[Path]) -> str:
+    if len(roots) == 1:
+        return str(roots[0])
+    return f"{len(roots)} roots"
+
+
+# A walk result after deep detection, with the stats and links of sizing it.
+_Detected: TypeAlias = tuple[EnvInfo | ArtifactInfo | None, ScanStats, LinkTally]
+
+
+def _iter_detected(
+    roots: list[Path],
+    depth: int,
+    *,
+    deep: bool,
+    stale_days: int,
+    include_dotenv: bool,
+    include_artifacts: bool,
+    jobs: int,
+    processes: int,
+    engine: WalkEngine,
+    index: ScanIndex | None,
+    stats: ScanStats,
+    links: LinkTally,
+    root_scans: list[RootScan],
+    time_budget: float | None,
+    max_entries: int | None,
+    mount_policy: MountPolicy | None,
+    exclude: list[str],
+) -> Iterator[EnvInfo | ArtifactInfo]:
+    """Detected environments and artifacts, in the order they are found."""
+    if processes != 1:
+        yield from iter_scan_processes(
+            roots,
+            max_depth=depth,
+            processes=processes or None,
+            include_artifacts=include_artifacts,
             deep=deep,
             stale_days=stale_days,
             include_dotenv=include_dotenv,
+            stats=stats,
+            links=links,
+            root_scans=root_scans,
+            time_budget=time_budget,
+            max_entries=max_entries,
+            mount_policy=mount_policy,
+            exclude=exclude,
         )
-        if env_info.env_type == EnvType.UNKNOWN:
-            continue
-        if env_info.env_type == EnvType.DOTENV_DIR and not include_dotenv:
+        return
+
+    items = iter_scan_roots(
+        roots,
+        max_depth=depth,
+        include_artifacts=include_artifacts,
+        jobs=jobs,
+        stats=stats,
+        index=index,
+        root_scans=root_scans,
+        time_budget=time_budget,
+        max_entries=max_entries,
+        mount_policy=mount_policy,
+        exclude=exclude,
+        engine=engine,
+    )
+    if deep:
+        # Environments and artifacts are sized on the pipeline while the
+        # walk goes on; the walk itself only lists.
+        detect = partial(
+            _detect_and_size,
+            stale_days=stale_days,
+            include_dotenv=include_dotenv,
+            index=index,
+        )
+        with SizePipeline[_Detected]() as sizes:
+            for item in items:
+                sizes.submit(partial(detect, item))
+                yield from _joined(sizes.completed(), stats, links)
+            yield from _joined(sizes.drain(), stats, links)
+        return
+
+    for item in items:
+        if isinstance(item, ArtifactInfo):
+            yield item
             continue
-        envs.append(env_info)
+        env_info = _detect_candidate(
+            item,
+            deep=False,
+            stale_days=stale_days,
+            include_dotenv=include_dotenv,
+            index=index,
+            stats=stats,
+        )
+        if env_info is not None:
+            yield env_info
+
 
+def _detect_and_size(
+    item: Path | ArtifactInfo,
+    *,
+    stale_days: int,
+    include_dotenv: bool,
+    index: ScanIndex | None,
+) -> _Detected:
+    """Deep detection of one walk result, run on a sizing thread."""
+    links = LinkTally()
+    if isinstance(item, ArtifactInfo):
+        return item, size_artifact(item, links), links
+    stats = ScanStats()
+    env_info = _detect_candidate(
+        item,
+        deep=True,
+        stale_days=stale_days,
+        include_dotenv=include_dotenv,
+        index=index,
+        stats=stats,
+        links=links,
+    )
+    return env_info, stats, links
+
+
+def _joined(
+    results: Iterator[_Detected], stats: ScanStats, links: LinkTally
+) -> Iterator[EnvInfo | ArtifactInfo]:
+    for item, item_stats, item_links in results:
+        stats.merge(item_stats)
+        links.merge(item_links)
+        if item is not None:
+            yield item
+
+
+def _build_scan_result(
+    roots: list[Path],
+    depth: int,
+    *,
+    deep: bool,
+    stale_days: int,
+    include_dotenv: bool,
+    include_artifacts: bool = True,
+    jobs: int = 1,
+    processes: int = 1,
+    engine: WalkEngine = "path",
+    index: ScanIndex | None = None,
+    time_budget: float | None = None,
+    max_entries: int | None = None,
+    mount_policy: MountPolicy | None = None,
+    exclude: list[str] | None = None,
+) -> ScanResult:
+    start = time.perf_counter()
+    io_before = read_proc_io()
+    stats = ScanStats()
+    links = LinkTally()
+    root_scans: list[RootScan] = []
+    envs: list[EnvInfo] = []
+    artifacts: list[ArtifactInfo] = []
+    for item in _iter_detected(
+        roots,
+        depth,
+        deep=deep,
+        stale_days=stale_days,
+        include_dotenv=include_dotenv,
+        include_artifacts=include_artifacts,
+        jobs=jobs,
+        processes=processes,
+        engine=engine,
+        index=index,
+        stats=stats,
+        links=links,
+        root_scans=root_scans,
+        time_budget=time_budget,
+        max_entries=max_entries,
+        mount_policy=mount_policy,
+        exclude=exclude or [],
+    ):
+        if isinstance(item, ArtifactInfo):
+            artifacts.append(item)
+        else:
+            envs.append(item)
+
+    stats.merge(ScanStats(io=io_delta(io_before, read_proc_io())))
     duration = time.perf_counter() - start
     total_size_bytes = sum(env.size_bytes or 0 for env in envs)
-    artifacts = discovery.artifacts if include_artifacts else []
+    artifacts.sort(key=lambda item: str(item.path))
+    stats.truncated_directories.sort()
 
     return ScanResult(
-        scan_path=path.resolve(),
+        scan_path=_common_root(roots),
         scan_depth=depth,
         duration_seconds=duration,
         environments=sorted(envs, key=lambda item: str(item.path)),
@@ -80,8 +409,145 @@ def _build_scan_result(
         timestamp=datetime.now(UTC),
         stale_days=stale_days,
         artifacts=artifacts,
-        artifact_summary=summarize_artifacts(artifacts),
+        artifact_summary=summarize_artifacts(artifacts, links),
+        scan_roots=sorted(root_scans, key=lambda item: str(item.path)),
+        partial=stats.directories_unvisited > 0,
+        stats=stats,
+        total_exclusive_bytes=sum(env.exclusive_bytes or 0 for env in envs)
+        + links.shared_bytes(ENVIRONMENT_LINKS),
+    )
+
+
+def _echo_ndjson(record_type: str, payload: dict[str, Any]) -> None:
+    typer.echo(json.dumps({"type": record_type, **payload}))
+
+
+def _stream_ndjson(
+    roots: list[Path],
+    depth: int,
+    *,
+    deep: bool,
+    stale_days: int,
+    include_dotenv: bool,
+    include_artifacts: bool,
+    jobs: int,
+    processes: int = 1,
+    engine: WalkEngine = "path",
+    index: ScanIndex | None = None,
+    time_budget: float | None = None,
+    max_entries: int | None = None,
+    mount_policy: MountPolicy | None = None,
+    exclude: list[str] | None = None,
+) -> ScanStats:
+    """Write one JSON record per discovery as it is found, then a summary."""
+    start = time.perf_counter()
+    io_before = read_proc_io()
+    stats = ScanStats()
+    links = LinkTally()
+    env_count = 0
+    env_size = 0
+    env_exclusive = 0
+    artifact_count = 0
+    artifact_size = 0
+    artifact_exclusive = 0
+    root_scans: list[RootScan] = []
+    for item in _iter_detected(
+        roots,
+        depth,
+        deep=deep,
+        stale_days=stale_days,
+        include_dotenv=include_dotenv,
+        include_artifacts=include_artifacts,
+        jobs=jobs,
+        processes=processes,
+        engine=engine,
+        index=index,
+        stats=stats,
+        links=links,
+        root_scans=root_scans,
+        time_budget=time_budget,
+        max_entries=max_entries,
+        mount_policy=mount_policy,
+        exclude=exclude or [],
+    ):
+        if isinstance(item, ArtifactInfo):
+            artifact_count += 1
+            artifact_size += item.size_bytes or 0
+            artifact_exclusive += item.exclusive_bytes or 0
+            _echo_ndjson("artifact", dict(to_serializable_dict(item)))
+            continue
+        env_count += 1
+        env_size += item.size_bytes or 0
+        env_exclusive += item.exclusive_bytes or 0
+        _echo_ndjson("environment", dict(to_serializable_dict(item)))
+
+    stats.merge(ScanStats(io=io_delta(io_before, read_proc_io())))
+    env_exclusive += links.shared_bytes(ENVIRONMENT_LINKS)
+    artifact_exclusive += sum(
+        links.shared_bytes(group)
+        for group in links.groups
+        if group != ENVIRONMENT_LINKS
     )
+    stats.truncated_directories.sort()
+    _echo_ndjson(
+        "summary",
+        {
+            "scan_path": str(_common_root(roots)),
+            "scan_depth": depth,
+            "duration_seconds": time.perf_counter() - start,
+            "environment_count": env_count,
+            "total_size_bytes": env_size,
+            "total_exclusive_bytes": env_exclusive,
+            "artifact_count": artifact_count,
+            "artifact_size_bytes": artifact_size,
+            "artifact_exclusive_bytes": artifact_exclusive,
+            "hostname": socket.gethostname(),
+            "timestamp": datetime.now(UTC).isoformat(),
+            "stale_days": stale_days,
+            "scan_roots": [
+                {
+                    "path": str(root_scan.path),
+                    "duration_seconds": root_scan.duration_seconds,
+                    "device": root_scan.device,
+                }
+                for root_scan in sorted(root_scans, key=lambda item: str(item.path))
+            ],
+            "partial": stats.directories_unvisited > 0,
+            "stats": dict(to_serializable_dict(stats)),
+        },
+    )
+    return stats
+
+
+def _check_walk_options(
+    *, jobs: int, processes: int, use_index: bool, engine: WalkEngine
+) -> None:
+    conflicts = [
+        (processes != 1 and jobs > 1, "--processes", "--jobs"),
+        (processes != 1 and use_index, "--processes", "--index"),
+        (engine == "fd" and jobs > 1, "--engine fd", "--jobs"),
+        (engine == "fd" and processes != 1, "--engine fd", "--processes"),
+    ]
+    for conflict, option, other in conflicts:
+        if conflict:
+            typer.echo(
+                f"Error: {option} cannot be used together with {other}.", err=True
+            )
+            raise typer.Exit(code=1)
+    if engine == "fd" and not FD_ENGINE_AVAILABLE:
+        typer.echo("Error: --engine fd is not supported on this platform.", err=True)
+        raise typer.Exit(code=1)
+
+
+def _warn_if_incomplete(result: ScanResult) -> None:
+    if result.partial:
+        typer.echo(
+            f"Warning: time budget ran out; {result.stats.directories_unvisited} "
+            "directories were not scanned.",
+            err=True,
+        )
+    for path in result.stats.truncated_directories:
+        typer.echo(f"Warning: directory truncated at --max-entries: {path}", err=True)
 
 
 def _print_output(text: str, use_rich: bool) -> None:
@@ -100,22 +566,28 @@ def _confirm_and_delete(
     selected: list[EnvInfo | ArtifactInfo],
     *,
     scan_root: Path,
+    allowed_roots: list[Path],
     initial_total: int,
     dry_run: bool,
     yes: bool,
 ) -> None:
+    # Measured once, so the confirmation and the report agree.
+    usages = measure_selection(selected)
     confirmed = confirm_deletion(
         selected,
         scan_root=scan_root,
         dry_run=dry_run,
         skip_confirm=yes,
+        usages=usages,
     )
     if dry_run:
         summary = delete_environments(
             selected,
             scan_root=scan_root,
+            allowed_roots=allowed_roots,
             dry_run=True,
             dry_run_echo=False,
+            usages=usages,
         )
         print_deletion_report(summary, initial_total=initial_total)
         raise typer.Exit(0)
@@ -127,21 +599,96 @@ def _confirm_and_delete(
     summary = delete_environments(
         selected,
         scan_root=scan_root,
+        allowed_roots=allowed_roots,
         dry_run=False,
+        usages=usages,
     )
     print_deletion_report(summary, initial_total=initial_total)
 
 
 @app.command()
 def scan(
-    path: Path = typer.Argument(Path("."), exists=True, file_okay=False, dir_okay=True),
+    paths: list[Path] | None = typer.Argument(
+        None,
+        exists=True,
+        file_okay=False,
+        dir_okay=True,
+        help="Roots to scan. Defaults to the current directory.",
+        show_default=False,
+    ),
+    roots_from: Path | None = typer.Option(
+        None,
+        "--roots-from",
+        exists=True,
+        dir_okay=False,
+        help="Read more roots from FILE, one per line.",
+    ),
     depth: int = typer.Option(5, "--depth", "-d", min=1, help="Max directory depth."),
+    jobs: int = typer.Option(
+        1, "--jobs", "-j", min=1, help="Number of directories to scan concurrently."
+    ),
+    processes: int = typer.Option(
+        1,
+        "--processes",
+        min=0,
+        help="Scan in N worker processes (0 = one per CPU).",
+    ),
+    engine: WalkEngine = typer.Option(
+        "path",
+        "--engine",
+        help="Traversal engine: path, or fd for descriptor-relative syscalls.",
+    ),
+    use_index: bool = typer.Option(
+        False,
+        "--index",
+        help="Reuse the on-disk scan index and only relist changed directories.",
+    ),
+    rebuild_index: bool = typer.Option(
+        False, "--rebuild-index", help="Discard the scan index and rebuild it."
+    ),
+    one_file_system: bool = typer.Option(
+        False, "--one-file-system", help="Stay on the device of each root."
+    ),
+    skip_fs_types: list[str] = typer.Option(
+        [],
+        "--skip-fs-type",
+        help="Do not enter mounts of this filesystem type (repeatable, globs).",
+    ),
+    include_fs_types: list[str] = typer.Option(
+        [],
+        "--include-fs-type",
+        help="Enter mounts of this type even when skipped (repeatable, globs).",
+    ),
+    exclude: list[str] = typer.Option(
+        [],
+        "--exclude",
+        "-x",
+        help="Prune directories matching this glob (repeatable).",
+    ),
+    time_budget: float | None = typer.Option(
+        None,
+        "--time-budget",
+        min=0,
+        help="Stop walking after SECONDS and report what was found so far.",
+    ),
+    max_entries: int | None = typer.Option(
+        None,
+        "--max-entries",
+        min=1,
+        help="Read at most N entries per directory and note truncated ones.",
+    ),
     deep: bool = typer.Option(
         False, "--deep", help="Compute size and package metadata."
     ),
     json_output: bool = typer.Option(
         False, "--json", help="Output JSON report.", rich_help_panel="Output"
     ),
+    ndjson_output: bool = typer.Option(
+        False,
+        "--ndjson",
+        help="Stream one JSON record per discovery, then a summary record.",
+        rich_help_panel="Output",
+    ),
     stale_days: int = typer.Option(
         90, "--stale-days", min=1, help="Mark env as stale after N days."
     ),
@@ -164,6 +711,9 @@ def scan(
         "--path-mode",
         help="How to render environment path columns: name, relative, absolute.",
     ),
+    show_stats: bool = typer.Option(
+        False, "--stats", help="Print scan statistics to stderr."
+    ),
     rich_output: bool = typer.Option(
         False, "--rich", help="Use optional rich-rendered output."
     ),
@@ -175,15 +725,61 @@ def scan(
             err=True,
         )
         raise typer.Exit(code=1)
+    if json_output and ndjson_output:
+        typer.echo("Error: --json cannot be used together with --ndjson.", err=True)
+        raise typer.Exit(code=1)
 
-    result = _build_scan_result(
-        path,
-        depth,
-        deep=deep,
-        stale_days=stale_days,
-        include_dotenv=include_dotenv,
-        include_artifacts=include_artifacts,
+    roots = _collect_roots(paths, roots_from)
+    _check_walk_options(
+        jobs=jobs,
+        processes=processes,
+        use_index=use_index or rebuild_index,
+        engine=engine,
     )
+    mount_policy = _mount_policy(one_file_system, skip_fs_types, include_fs_types)
+    exclude = _exclude_patterns(exclude)
+    if ndjson_output:
+        with _scan_index(use_index, rebuild_index) as index:
+            stats = _stream_ndjson(
+                roots,
+                depth,
+                deep=deep,
+                stale_days=stale_days,
+                include_dotenv=include_dotenv,
+                include_artifacts=include_artifacts,
+                jobs=jobs,
+                processes=processes,
+                engine=engine,
+                index=index,
+                mount_policy=mount_policy,
+                exclude=exclude,
+                time_budget=time_budget,
+                max_entries=max_entries,
+            )
+        if show_stats:
+            typer.echo(format_stats(stats), err=True)
+        raise typer.Exit(0)
+
+    with _scan_index(use_index, rebuild_index) as index:
+        result = _build_scan_result(
+            roots,
+            depth,
+            deep=deep,
+            stale_days=stale_days,
+            include_dotenv=include_dotenv,
+            include_artifacts=include_artifacts,
+            jobs=jobs,
+            processes=processes,
+            engine=engine,
+            index=index,
+            mount_policy=mount_policy,
+            exclude=exclude,
+            time_budget=time_budget,
+            max_entries=max_entries,
+        )
+
+    if show_stats:
+        typer.echo(format_stats(result.stats), err=True)
 
     if json_output:
         typer.echo(json.dumps(to_serializable_dict(result), indent=2))
@@ -202,8 +798,75 @@ def scan(
 
 @app.command(name="list")
 def list_environments(
-    path: Path = typer.Argument(Path("."), exists=True, file_okay=False, dir_okay=True),
+    paths: list[Path] | None = typer.Argument(
+        None,
+        exists=True,
+        file_okay=False,
+        dir_okay=True,
+        help="Roots to scan. Defaults to the current directory.",
+        show_default=False,
+    ),
+    roots_from: Path | None = typer.Option(
+        None,
+        "--roots-from",
+        exists=True,
+        dir_okay=False,
+        help="Read more roots from FILE, one per line.",
+    ),
     depth: int = typer.Option(5, "--depth", "-d", min=1, help="Max directory depth."),
+    jobs: int = typer.Option(
+        1, "--jobs", "-j", min=1, help="Number of directories to scan concurrently."
+    ),
+    processes: int = typer.Option(
+        1,
+        "--processes",
+        min=0,
+        help="Scan in N worker processes (0 = one per CPU).",
+    ),
+    engine: WalkEngine = typer.Option(
+        "path",
+        "--engine",
+        help="Traversal engine: path, or fd for descriptor-relative syscalls.",
+    ),
+    use_index: bool = typer.Option(
+        False,
+        "--index",
+        help="Reuse the on-disk scan index and only relist changed directories.",
+    ),
+    rebuild_index: bool = typer.Option(
+        False, "--rebuild-index", help="Discard the scan index and rebuild it."
+    ),
+    one_file_system: bool = typer.Option(
+        False, "--one-file-system", help="Stay on the device of each root."
+    ),
+    skip_fs_types: list[str] = typer.Option(
+        [],
+        "--skip-fs-type",
+        help="Do not enter mounts of this filesystem type (repeatable, globs).",
+    ),
+    include_fs_types: list[str] = typer.Option(
+        [],
+        "--include-fs-type",
+        help="Enter mounts of this type even when skipped (repeatable, globs).",
+    ),
+    exclude: list[str] = typer.Option(
+        [],
+        "--exclude",
+        "-x",
+        help="Prune directories matching this glob (repeatable).",
+    ),
+    time_budget: float | None = typer.Option(
+        None,
+        "--time-budget",
+        min=0,
+        help="Stop walking after SECONDS and report what was found so far.",
+    ),
+    max_entries: int | None = typer.Option(
+        None,
+        "--max-entries",
+        min=1,
+        help="Read at most N entries per directory and note truncated ones.",
+    ),
     deep: bool = typer.Option(
         False, "--deep", help="Compute size and package metadata."
     ),
@@ -218,19 +881,43 @@ def list_environments(
         "--path-mode",
         help="How to render environment path columns: name, relative, absolute.",
     ),
+    show_stats: bool = typer.Option(
+        False, "--stats", help="Print scan statistics to stderr."
+    ),
     rich_output: bool = typer.Option(
         False, "--rich", help="Use optional rich-rendered output."
     ),
 ) -> None:
     """Print a compact environments table."""
-    result = _build_scan_result(
-        path,
-        depth,
-        deep=deep,
-        stale_days=stale_days,
-        include_dotenv=include_dotenv,
-        include_artifacts=False,
+    roots = _collect_roots(paths, roots_from)
+    _check_walk_options(
+        jobs=jobs,
+        processes=processes,
+        use_index=use_index or rebuild_index,
+        engine=engine,
     )
+    mount_policy = _mount_policy(one_file_system, skip_fs_types, include_fs_types)
+    exclude = _exclude_patterns(exclude)
+    with _scan_index(use_index, rebuild_index) as index:
+        result = _build_scan_result(
+            roots,
+            depth,
+            deep=deep,
+            stale_days=stale_days,
+            include_dotenv=include_dotenv,
+            include_artifacts=False,
+            jobs=jobs,
+            processes=processes,
+            engine=engine,
+            index=index,
+            mount_policy=mount_policy,
+            exclude=exclude,
+            time_budget=time_budget,
+            max_entries=max_entries,
+        )
+    _warn_if_incomplete(result)
+    if show_stats:
+        typer.echo(format_stats(result.stats), err=True)
     _print_output(
         format_list(
             result.environments, path_mode=path_mode, base_path=result.scan_path
@@ -241,27 +928,118 @@ def list_environments(
 
 @app.command()
 def health(
-    path: Path = typer.Argument(Path("."), exists=True, file_okay=False, dir_okay=True),
+    paths: list[Path] | None = typer.Argument(
+        None,
+        exists=True,
+        file_okay=False,
+        dir_okay=True,
+        help="Roots to scan. Defaults to the current directory.",
+        show_default=False,
+    ),
+    roots_from: Path | None = typer.Option(
+        None,
+        "--roots-from",
+        exists=True,
+        dir_okay=False,
+        help="Read more roots from FILE, one per line.",
+    ),
     depth: int = typer.Option(5, "--depth", "-d", min=1, help="Max directory depth."),
+    jobs: int = typer.Option(
+        1, "--jobs", "-j", min=1, help="Number of directories to scan concurrently."
+    ),
+    processes: int = typer.Option(
+        1,
+        "--processes",
+        min=0,
+        help="Scan in N worker processes (0 = one per CPU).",
+    ),
+    engine: WalkEngine = typer.Option(
+        "path",
+        "--engine",
+        help="Traversal engine: path, or fd for descriptor-relative syscalls.",
+    ),
+    use_index: bool = typer.Option(
+        False,
+        "--index",
+        help="Reuse the on-disk scan index and only relist changed directories.",
+    ),
+    rebuild_index: bool = typer.Option(
+        False, "--rebuild-index", help="Discard the scan index and rebuild it."
+    ),
+    one_file_system: bool = typer.Option(
+        False, "--one-file-system", help="Stay on the device of each root."
+    ),
+    skip_fs_types: list[str] = typer.Option(
+        [],
+        "--skip-fs-type",
+        help="Do not enter mounts of this filesystem type (repeatable, globs).",
+    ),
+    include_fs_types: list[str] = typer.Option(
+        [],
+        "--include-fs-type",
+        help="Enter mounts of this type even when skipped (repeatable, globs).",
+    ),
+    exclude: list[str] = typer.Option(
+        [],
+        "--exclude",
+        "-x",
+        help="Prune directories matching this glob (repeatable).",
+    ),
+    time_budget: float | None = typer.Option(
+        None,
+        "--time-budget",
+        min=0,
+        help="Stop walking after SECONDS and report what was found so far.",
+    ),
+    max_entries: int | None = typer.Option(
+        None,
+        "--max-entries",
+        min=1,
+        help="Read at most N entries per directory and note truncated ones.",
+    ),
     json_output: bool = typer.Option(
         False, "--json", help="Output JSON report.", rich_help_panel="Output"
     ),
     include_dotenv: bool = typer.Option(
         False, "--include-dotenv", help="Include plain .env directories."
     ),
+    show_stats: bool = typer.Option(
+        False, "--stats", help="Print scan statistics to stderr."
+    ),
     rich_output: bool = typer.Option(
         False, "--rich", help="Use optional rich-rendered output."
     ),
 ) -> None:
     """Check discovered Python environments for common breakage."""
-    result = _build_scan_result(
-        path,
-        depth,
-        deep=False,
-        stale_days=90,
-        include_dotenv=include_dotenv,
-        include_artifacts=False,
+    roots = _collect_roots(paths, roots_from)
+    _check_walk_options(
+        jobs=jobs,
+        processes=processes,
+        use_index=use_index or rebuild_index,
+        engine=engine,
     )
+    mount_policy = _mount_policy(one_file_system, skip_fs_types, include_fs_types)
+    exclude = _exclude_patterns(exclude)
+    with _scan_index(use_index, rebuild_index) as index:
+        result = _build_scan_result(
+            roots,
+            depth,
+            deep=False,
+            stale_days=90,
+            include_dotenv=include_dotenv,
+            include_artifacts=False,
+            jobs=jobs,
+            processes=processes,
+            engine=engine,
+            index=index,
+            mount_policy=mount_policy,
+            exclude=exclude,
+            time_budget=time_budget,
+            max_entries=max_entries,
+        )
+    _warn_if_incomplete(result)
+    if show_stats:
+        typer.echo(format_stats(result.stats), err=True)
     checks = check_environments_health(result.environments)
     exit_code = 1 if any(check.status == "BROKEN" for check in checks) else 0
 
@@ -276,6 +1054,109 @@ def health(
     raise typer.Exit(exit_code)
 
 
+def _format_watch_event(event: WatchEvent, scan_root: Path) -> str:
+    marker = "+" if event.action == "added" else "-"
+    display = format_env_display_path(event.item.path, scan_root)
+    if isinstance(event.item, ArtifactInfo):
+        detail = event.item.pattern_matched
+    else:
+        detail = f"{event.item.env_type.value} {event.item.python_version or '-'}"
+    return f"{marker} {event.kind:<11} {display}  ({detail})"
+
+
+@app.command()
+def watch(
+    path: Path = typer.Argument(Path("."), exists=True, file_okay=False, dir_okay=True),
+    depth: int = typer.Option(5, "--depth", "-d", min=1, help="Max directory depth."),
+    json_output: bool = typer.Option(
+        False,
+        "--json",
+        help="Emit one JSON record per change, starting with the initial inventory.",
+        rich_help_panel="Output",
+    ),
+    stale_days: int = typer.Option(
+        90, "--stale-days", min=1, help="Mark env as stale after N days."
+    ),
+    include_dotenv: bool = typer.Option(
+        False, "--include-dotenv", help="Include plain .env directories."
+    ),
+    include_artifacts: bool = typer.Option(
+        True,
+        "--artifacts/--no-artifacts",
+        help="Include Python artifact detection.",
+    ),
+    one_file_system: bool = typer.Option(
+        False, "--one-file-system", help="Stay on the device of the watched path."
+    ),
+    skip_fs_types: list[str] = typer.Option(
+        [],
+        "--skip-fs-type",
+        help="Do not enter mounts of this filesystem type (repeatable, globs).",
+    ),
+    include_fs_types: list[str] = typer.Option(
+        [],
+        "--include-fs-type",
+        help="Enter mounts of this type even when skipped (repeatable, globs).",
+    ),
+    exclude: list[str] = typer.Option(
+        [],
+        "--exclude",
+        "-x",
+        help="Prune directories matching this glob (repeatable).",
+    ),
+    jobs: int = typer.Option(
+        1, "--jobs", "-j", min=1, help="Number of directories to scan concurrently."
+    ),
+) -> None:
+    """Watch a path and report environments and artifacts as they change (Linux)."""
+    mount_policy = _mount_policy(one_file_system, skip_fs_types, include_fs_types)
+    exclude = _exclude_patterns(exclude)
+    try:
+        watcher = InventoryWatcher(
+            path,
+            depth,
+            include_artifacts=include_artifacts,
+            include_dotenv=include_dotenv,
+            stale_days=stale_days,
+            mount_policy=mount_policy,
+            exclude=exclude,
+            jobs=jobs,
+        )
+    except OSError as exc:
+        typer.echo(f"Error: watch mode requires Linux inotify ({exc}).", err=True)
+        raise typer.Exit(code=1) from exc
+
+    def emit(events: list[WatchEvent]) -> None:
+        for event in events:
+            if json_output:
+                payload = dict(to_serializable_dict(event.item))
+                _echo_ndjson(event.kind, {"event": event.action, **payload})
+            else:
+                typer.echo(_format_watch_event(event, watcher.root))
+
+    try:
+        initial = watcher.start()
+        if json_output:
+            emit(initial)
+        else:
+            typer.echo(
+                f"Watching {watcher.root}: {len(watcher.environments)} environments, "
+                f"{len(watcher.artifacts)} artifacts. Press Ctrl+C to stop."
+            )
+        if watcher.watch_errors:
+            typer.echo(
+                f"Warning: could not watch {watcher.watch_errors} directories "
+                "(check fs.inotify.max_user_watches).",
+                err=True,
+            )
+        while True:
+            emit(watcher.poll(timeout=1.0))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+
 @app.command()
 def info(
     env_path: Path = typer.Argument(..., exists=True, file_okay=False, dir_okay=True),
@@ -302,8 +1183,52 @@ def version() -> None:
 
 @app.command()
 def manage(
-    path: Path = typer.Argument(Path("."), exists=True, file_okay=False, dir_okay=True),
+    paths: list[Path] | None = typer.Argument(
+        None,
+        exists=True,
+        file_okay=False,
+        dir_okay=True,
+        help="Roots to scan. Defaults to the current directory.",
+        show_default=False,
+    ),
+    roots_from: Path | None = typer.Option(
+        None,
+        "--roots-from",
+        exists=True,
+        dir_okay=False,
+        help="Read more roots from FILE, one per line.",
+    ),
     depth: int = typer.Option(5, "--depth", "-d", min=1, help="Max directory depth."),
+    jobs: int = typer.Option(
+        1, "--jobs", "-j", min=1, help="Number of directories to scan concurrently."
+    ),
+    use_index: bool = typer.Option(
+        False,
+        "--index",
+        help="Reuse the on-disk scan index and only relist changed directories.",
+    ),
+    rebuild_index: bool = typer.Option(
+        False, "--rebuild-index", help="Discard the scan index and rebuild it."
+    ),
+    one_file_system: bool = typer.Option(
+        False, "--one-file-system", help="Stay on the device of each root."
+    ),
+    skip_fs_types: list[str] = typer.Option(
+        [],
+        "--skip-fs-type",
+        help="Do not enter mounts of this filesystem type (repeatable, globs).",
+    ),
+    include_fs_types: list[str] = typer.Option(
+        [],
+        "--include-fs-type",
+        help="Enter mounts of this type even when skipped (repeatable, globs).",
+    ),
+    exclude: list[str] = typer.Option(
+        [],
+        "--exclude",
+        "-x",
+        help="Prune directories matching this glob (repeatable).",
+    ),
     stale_only: bool = typer.Option(
         False, "--stale-only", help="Pre-select only stale environments."
     ),
@@ -321,15 +1246,23 @@ def manage(
     ),
 ) -> None:
     """Interactively select and delete Python environments."""
-    typer.echo(f"Scanning {path.resolve()}...")
-    result = _build_scan_result(
-        path,
-        depth,
-        deep=deep,
-        stale_days=stale_days,
-        include_dotenv=False,
-        include_artifacts=True,
-    )
+    roots = _collect_roots(paths, roots_from)
+    mount_policy = _mount_policy(one_file_system, skip_fs_types, include_fs_types)
+    exclude = _exclude_patterns(exclude)
+    typer.echo(f"Scanning {_describe_roots(roots)}...")
+    with _scan_index(use_index, rebuild_index) as index:
+        result = _build_scan_result(
+            roots,
+            depth,
+            deep=deep,
+            stale_days=stale_days,
+            include_dotenv=False,
+            include_artifacts=True,
+            jobs=jobs,
+            index=index,
+            mount_policy=mount_policy,
+            exclude=exclude,
+        )
     if not result.environments and not result.artifacts:
         typer.echo("No environments or artifacts found.")
         raise typer.Exit(0)
@@ -341,7 +1274,7 @@ def manage(
 
     selected_envs: list[EnvInfo] = []
     selected_artifact_groups: list[ArtifactSummary] = []
-    artifact_groups = summarize_with_empty_patterns(result.artifacts)
+    artifact_groups = summarize_with_empty_patterns(result.artifact_summary)
     while True:
         selected_envs, selected_artifact_groups = interactive_select_with_artifacts(
             result.environments,
@@ -373,6 +1306,7 @@ def manage(
     _confirm_and_delete(
         selected_items,
         scan_root=result.scan_path,
+        allowed_roots=[root_scan.path for root_scan in result.scan_roots],
         initial_total=len(result.environments) + len(result.artifacts),
         dry_run=dry_run,
         yes=yes,
@@ -381,8 +1315,52 @@ def manage(
 
 @app.command()
 def clean(
-    path: Path = typer.Argument(Path("."), exists=True, file_okay=False, dir_okay=True),
+    paths: list[Path] | None = typer.Argument(
+        None,
+        exists=True,
+        file_okay=False,
+        dir_okay=True,
+        help="Roots to scan. Defaults to the current directory.",
+        show_default=False,
+    ),
+    roots_from: Path | None = typer.Option(
+        None,
+        "--roots-from",
+        exists=True,
+        dir_okay=False,
+        help="Read more roots from FILE, one per line.",
+    ),
     depth: int = typer.Option(5, "--depth", "-d", min=1, help="Max directory depth."),
+    jobs: int = typer.Option(
+        1, "--jobs", "-j", min=1, help="Number of directories to scan concurrently."
+    ),
+    use_index: bool = typer.Option(
+        False,
+        "--index",
+        help="Reuse the on-disk scan index and only relist changed directories.",
+    ),
+    rebuild_index: bool = typer.Option(
+        False, "--rebuild-index", help="Discard the scan index and rebuild it."
+    ),
+    one_file_system: bool = typer.Option(
+        False, "--one-file-system", help="Stay on the device of each root."
+    ),
+    skip_fs_types: list[str] = typer.Option(
+        [],
+        "--skip-fs-type",
+        help="Do not enter mounts of this filesystem type (repeatable, globs).",
+    ),
+    include_fs_types: list[str] = typer.Option(
+        [],
+        "--include-fs-type",
+        help="Enter mounts of this type even when skipped (repeatable, globs).",
+    ),
+    exclude: list[str] = typer.Option(
+        [],
+        "--exclude",
+        "-x",
+        help="Prune directories matching this glob (repeatable).",
+    ),
     stale_days: int = typer.Option(
         90, "--stale-days", min=1, help="Delete envs older than N days."
     ),
@@ -397,15 +1375,23 @@ def clean(
     ),
 ) -> None:
     """Delete stale environments without interactive selection."""
-    typer.echo(f"Scanning {path.resolve()} for stale environments...")
-    result = _build_scan_result(
-        path,
-        depth,
-        deep=deep,
-        stale_days=stale_days,
-        include_dotenv=False,
-        include_artifacts=False,
-    )
+    roots = _collect_roots(paths, roots_from)
+    mount_policy = _mount_policy(one_file_system, skip_fs_types, include_fs_types)
+    exclude = _exclude_patterns(exclude)
+    typer.echo(f"Scanning {_describe_roots(roots)} for stale environments...")
+    with _scan_index(use_index, rebuild_index) as index:
+        result = _build_scan_result(
+            roots,
+            depth,
+            deep=deep,
+            stale_days=stale_days,
+            include_dotenv=False,
+            include_artifacts=False,
+            jobs=jobs,
+            index=index,
+            mount_policy=mount_policy,
+            exclude=exclude,
+        )
     selected = [env for env in result.environments if env.is_stale]
     if not selected:
         typer.echo("No stale environments found.")
@@ -416,6 +1402,7 @@ def clean(
     _confirm_and_delete(
         selected_items,
         scan_root=result.scan_path,
+        allowed_roots=[root_scan.path for root_scan in result.scan_roots],
         initial_total=len(result.environments),
         dry_run=dry_run,
         yes=yes,
@@ -0,0 +1,68 @@
+"""Settings read from ``envoic.toml`` or ``[tool.envoic]`` in ``pyproject.toml``."""
+
+from __future__ import annotations
+
+import tomllib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+CONFIG_FILENAME = "envoic.toml"
+
+
+@dataclass(slots=True)
+class EnvoicConfig:
+    exclude: list[str] = field(default_factory=list)
+    source: Path | None = None
+
+
+def _table_from(path: Path) -> dict[str, Any] | None:
+    """The envoic settings in ``path``, or ``None`` if it has none.
+
+    Only a broken ``envoic.toml`` is an error: a ``pyproject.toml`` that does
+    not parse belongs to some other tool and is passed over.
+    """
+    try:
+        data = tomllib.loads(path.read_text(encoding="utf-8"))
+    except OSError:
+        return None
+    except tomllib.TOMLDecodeError as exc:
+        if path.name != CONFIG_FILENAME:
+            return None
+        raise ValueError(f"Invalid TOML in {path}: {exc}") from exc
+    if path.name == CONFIG_FILENAME:
+        return data
+    tool = data.get("tool", {})
+    table = tool.get("envoic") if isinstance(tool, dict) else None
+    return table if isinstance(table, dict) else None
+
+
+def find_config(start: Path) -> Path | None:
+    """Nearest ``envoic.toml``, or ``pyproject.toml`` with ``[tool.envoic]``.
+
+    ``start`` and then each of its parents is searched; in one directory
+    ``envoic.toml`` wins over ``pyproject.toml``. A ``pyproject.toml`` that is
+    not valid TOML is skipped.
+    """
+    for directory in (start, *start.parents):
+        candidate = directory / CONFIG_FILENAME
+        if candidate.is_file():
+            return candidate
+        pyproject = directory / "pyproject.toml"
+        if pyproject.is_file() and _table_from(pyproject) is not None:
+            return pyproject
+    return None
+
+
+def load_config(start: Path | None = None) -> EnvoicConfig:
+    """Load the nearest config above ``start`` (the working directory)."""
+    path = find_config((start or Path.cwd()).resolve())
+    if path is None:
+        return EnvoicConfig()
+    table = _table_from(path) or {}
+    exclude = table.get("exclude", [])
+    if not isinstance(exclude, list) or not all(
+        isinstance(item, str) for item in exclude
+    ):
+        raise ValueError(f"{path}: 'exclude' must be a list of strings")
+    return EnvoicConfig(exclude=list(exclude), source=path)
@@ -3,13 +3,21 @@ from __future__ import annotations
 import os
 import re
 import subprocess
+import time
+from collections.abc import Mapping
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
 
-from .models import EnvInfo, EnvType
+from .models import EnvInfo, EnvType, ScanStats
+from .sizing import ENVIRONMENT_LINKS, LinkTally, disk_usage
 
 _PYTHON_DIR_RE = re.compile(r"^python(?P<version>\d+\.\d+)$")
 
+# The only entries ``is_environment_listing`` looks up in a listing.
+ENV_LISTING_NAMES = frozenset(
+    {"pyvenv.cfg", "conda-meta", "bin", "Scripts", "Lib", "lib"}
+)
+
 
 def _existing_paths(path: Path, candidates: list[str]) -> list[Path]:
     found: list[Path] = []
@@ -63,6 +71,7 @@ def _extract_python_version(
     pyvenv_data: dict[str, str],
     *,
     allow_subprocess_probe: bool,
+    stats: ScanStats | None = None,
 ) -> str | None:
     for key in ("version", "version_info", "python-version"):
         value = pyvenv_data.get(key)
@@ -80,6 +89,8 @@ def _extract_python_version(
     if python_bin is None:
         return None
 
+    if stats is not None:
+        stats.subprocesses_spawned += 1
     try:
         result = subprocess.run(
             [str(python_bin), "--version"],
@@ -89,6 +100,8 @@ def _extract_python_version(
             timeout=2,
         )
     except OSError:
+        if stats is not None:
+            stats.errors_suppressed += 1
         return None
 
     output = (result.stdout or result.stderr).strip()
@@ -115,18 +128,6 @@ def _has_activate_script(path: Path) -> bool:
     )
 
 
-def _calculate_size_bytes(path: Path) -> int:
-    total = 0
-    for root, _, files in os.walk(path, followlinks=False):
-        for filename in files:
-            file_path = Path(root) / filename
-            try:
-                total += file_path.stat().st_size
-            except OSError:
-                continue
-    return total
-
-
 def _count_packages(path: Path) -> int | None:
     site_packages = _find_site_packages_dir(path)
     if site_packages is None:
@@ -155,16 +156,96 @@ def list_top_packages(path: Path, limit: int = 10) -> list[str]:
     return unique_sorted[:limit]
 
 
-def quick_is_environment_dir(path: Path) -> bool:
-    if (path / "pyvenv.cfg").is_file():
+def _probe(path: Path, stats: ScanStats | None, *, want_dir: bool) -> bool:
+    if stats is not None:
+        stats.stat_calls += 1
+    return path.is_dir() if want_dir else path.is_file()
+
+
+def _listing_has_site_packages(
+    path: Path,
+    entries: Mapping[str, os.DirEntry[str]],
+    stats: ScanStats | None,
+) -> bool:
+    lib_dirs = [
+        name for name in ("Lib", "lib") if name in entries and entries[name].is_dir()
+    ]
+    for name in lib_dirs:
+        if _probe(path / name / "site-packages", stats, want_dir=True):
+            return True
+
+    for name in reversed(lib_dirs):
+        if stats is not None:
+            stats.directories_listed += 1
+        try:
+            with os.scandir(path / name) as it:
+                children = [child for child in it if _PYTHON_DIR_RE.match(child.name)]
+        except OSError:
+            if stats is not None:
+                stats.errors_suppressed += 1
+            continue
+        for child in children:
+            if not child.is_dir():
+                continue
+            if _probe(Path(child.path) / "site-packages", stats, want_dir=True):
+                return True
+    return False
+
+
+def is_environment_listing(
+    path: Path,
+    entries: Mapping[str, os.DirEntry[str]],
+    *,
+    stats: ScanStats | None = None,
+) -> bool:
+    """Same verdict as ``quick_is_environment_dir`` from an existing listing.
+
+    ``entries`` maps names to the ``os.scandir`` entries of ``path``. Markers
+    at the top level are answered from the listing; only nested paths under
+    ``bin``, ``Scripts`` and ``lib`` are stat'ed, and only when those exist.
+    """
+    pyvenv_cfg = entries.get("pyvenv.cfg")
+    if pyvenv_cfg is not None and pyvenv_cfg.is_file():
         return True
-    if (path / "conda-meta").is_dir():
+    conda_meta = entries.get("conda-meta")
+    if conda_meta is not None and conda_meta.is_dir():
         return True
-    if _python_executable(path) and _find_site_packages_dir(path):
+
+    script_dirs = [
+        (name, executable)
+        for name, executable in (("bin", "python"), ("Scripts", "python.exe"))
+        if name in entries and entries[name].is_dir()
+    ]
+    for name, _ in script_dirs:
+        if _probe(path / name / "activate", stats, want_dir=False):
+            return True
+    has_python = any(
+        _probe(path / name / executable, stats, want_dir=False)
+        for name, executable in script_dirs
+    )
+    return has_python and _listing_has_site_packages(path, entries, stats)
+
+
+def quick_is_environment_dir(path: Path, stats: ScanStats | None = None) -> bool:
+    """Same verdict as ``is_environment_listing`` from targeted stat probes.
+
+    ``path`` itself is not listed, which suits directories that are
+    classified but never entered.
+    """
+    if _probe(path / "pyvenv.cfg", stats, want_dir=False):
         return True
-    if _has_activate_script(path):
+    if _probe(path / "conda-meta", stats, want_dir=True):
         return True
-    return False
+    scripts = (("bin", "python"), ("Scripts", "python.exe"))
+    if any(
+        _probe(path / name / "activate", stats, want_dir=False) for name, _ in scripts
+    ):
+        return True
+    has_python = any(
+        _probe(path / name / executable, stats, want_dir=False)
+        for name, executable in scripts
+    )
+    return has_python and _find_site_packages_dir(path) is not None
 
 
 def detect_environment(
@@ -173,7 +254,17 @@ def detect_environment(
     deep: bool = False,
     stale_days: int = 90,
     include_dotenv: bool = False,
+    stats: ScanStats | None = None,
+    links: LinkTally | None = None,
 ) -> EnvInfo:
+    """Classify ``path`` and collect its metadata.
+
+    With ``stats``, subprocesses, sizing work and the time spent are tallied
+    into it, sizing under the ``size`` phase and the rest under ``detect``.
+    With ``deep`` and ``links``, hard links shared with other trees are
+    pooled into ``links`` (see ``size_environment``).
+    """
+    start = time.perf_counter()
     path = path.resolve()
     signals: list[str] = []
 
@@ -217,6 +308,8 @@ def detect_environment(
         created = datetime.fromtimestamp(stat.st_ctime, tz=UTC)
         modified = datetime.fromtimestamp(stat.st_mtime, tz=UTC)
     except OSError:
+        if stats is not None:
+            stats.errors_suppressed += 1
         created = None
         modified = None
 
@@ -231,16 +324,14 @@ def detect_environment(
         path,
         pyvenv_data,
         allow_subprocess_probe=deep,
+        stats=stats,
     )
 
-    size_bytes = _calculate_size_bytes(path) if deep else None
     package_count = _count_packages(path) if deep else None
-
-    return EnvInfo(
+    env_info = EnvInfo(
         path=path,
         env_type=env_type,
         python_version=python_version,
-        size_bytes=size_bytes,
         created=created,
         modified=modified,
         package_count=package_count,
@@ -248,6 +339,38 @@ def detect_environment(
         has_pyvenv_cfg=has_pyvenv_cfg,
         signals=signals,
     )
+    sizing = 0.0
+    if deep:
+        size_start = time.perf_counter()
+        size_environment(env_info, stats, links)
+        sizing = time.perf_counter() - size_start
+    if stats is not None:
+        stats.add_phase("detect", time.perf_counter() - start - sizing)
+    return env_info
+
+
+def size_environment(
+    env: EnvInfo, stats: ScanStats | None = None, links: LinkTally | None = None
+) -> None:
+    """Fill in the apparent and exclusive size of ``env`` from a fresh walk.
+
+    Files it shares through hard links are pooled into ``links`` when given.
+    """
+    start = time.perf_counter()
+    usage = disk_usage(env.path, stats)
+    env.size_bytes = usage.apparent_bytes
+    env.exclusive_bytes = usage.exclusive_bytes
+    if links is not None:
+        links.add(usage, ENVIRONMENT_LINKS)
+    if stats is not None:
+        stats.add_phase("size", time.perf_counter() - start)
+
+
+def is_reported(env: EnvInfo, *, include_dotenv: bool = False) -> bool:
+    """Whether a detected environment belongs in scan results."""
+    if env.env_type == EnvType.UNKNOWN:
+        return False
+    return include_dotenv or env.env_type != EnvType.DOTENV_DIR
 
 
 def activation_hint(path: Path, env_type: EnvType) -> str:
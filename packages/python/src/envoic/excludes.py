@@ -0,0 +1,127 @@
+"""User exclude globs compiled into one matcher for the scan hot path."""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+from pathlib import Path
+
+_GLOB_CHARS = frozenset("*?[")
+
+
+def _has_glob(pattern: str) -> bool:
+    return any(char in _GLOB_CHARS for char in pattern)
+
+
+def _translate(pattern: str) -> str:
+    """Glob to regex where ``*`` and ``?`` stay within one path component."""
+    parts: list[str] = []
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if pattern.startswith("**", index):
+            parts.append(".*")
+            index += 2
+            continue
+        if char == "*":
+            parts.append("[^/]*")
+        elif char == "?":
+            parts.append("[^/]")
+        elif char == "[":
+            end = pattern.find("]", index + 2)
+            if end == -1:
+                parts.append(re.escape(char))
+            else:
+                body = pattern[index + 1 : end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                parts.append(f"[{body}]")
+                index = end
+        else:
+            parts.append(re.escape(char))
+        index += 1
+    return "".join(parts)
+
+
+def _alternation(regexes: list[str]) -> re.Pattern[str] | None:
+    if not regexes:
+        return None
+    return re.compile(
+        "|".join(f"(?P<r{index}>{regex})" for index, regex in enumerate(regexes))
+    )
+
+
+class ExcludeMatcher:
+    """Decide whether a directory is excluded, and by which pattern.
+
+    Patterns without a ``/`` match a directory name (``target``,
+    ``dataset*``). Patterns with a ``/`` match the whole path: absolute ones
+    from the filesystem root (``/srv/*/backups``), relative ones at any depth
+    (``build/cache``). Exact names and exact absolute paths are set lookups;
+    every remaining glob is folded into one regex for names and one for
+    paths, so a check costs at most two dict lookups and two regex matches.
+    """
+
+    __slots__ = (
+        "patterns",
+        "_names",
+        "_paths",
+        "_name_re",
+        "_name_rules",
+        "_path_re",
+        "_path_rules",
+    )
+
+    def __init__(self, patterns: Iterable[str] = ()) -> None:
+        self.patterns: tuple[str, ...] = tuple(dict.fromkeys(p for p in patterns if p))
+        self._names: dict[str, str] = {}
+        self._paths: dict[str, str] = {}
+        self._name_rules: list[str] = []
+        self._path_rules: list[str] = []
+        name_regexes: list[str] = []
+        path_regexes: list[str] = []
+
+        for pattern in self.patterns:
+            stripped = pattern.rstrip("/") or pattern
+            if "/" not in stripped:
+                if _has_glob(stripped):
+                    self._name_rules.append(pattern)
+                    name_regexes.append(_translate(stripped))
+                else:
+                    self._names.setdefault(stripped, pattern)
+            elif stripped.startswith("/") and not _has_glob(stripped):
+                self._paths.setdefault(stripped, pattern)
+            else:
+                anchor = "" if stripped.startswith("/") else "(?:.*/)?"
+                self._path_rules.append(pattern)
+                path_regexes.append(anchor + _translate(stripped))
+
+        try:
+            self._name_re = _alternation(name_regexes)
+            self._path_re = _alternation(path_regexes)
+        except re.error as exc:
+            raise ValueError(f"Invalid exclude pattern: {exc}") from exc
+
+    def __bool__(self) -> bool:
+        return bool(self.patterns)
+
+    def match(self, path: Path) -> str | None:
+        """Return the pattern excluding ``path``, or ``None``."""
+        name = path.name
+        rule = self._names.get(name)
+        if rule is not None:
+            return rule
+        if self._name_re is not None:
+            found = self._name_re.fullmatch(name)
+            if found is not None and found.lastgroup is not None:
+                return self._name_rules[int(found.lastgroup[1:])]
+        if self._paths or self._path_re is not None:
+            text = path.as_posix()
+            rule = self._paths.get(text)
+            if rule is not None:
+                return rule
+            if self._path_re is not None:
+                found = self._path_re.fullmatch(text)
+                if found is not None and found.lastgroup is not None:
+                    return self._path_rules[int(found.lastgroup[1:])]
+        return None
@@ -0,0 +1,244 @@
+"""On-disk scan index used to skip relisting unchanged directories."""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass, replace
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from types import TracebackType
+from typing import Any
+
+from .detector import _find_site_packages_dir, detect_environment, size_environment
+from .models import EnvInfo, EnvType, ScanStats, to_serializable_dict
+from .sizing import LinkTally
+
+INDEX_FILENAME = "index.sqlite3"
+SCHEMA_VERSION = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS directories (
+    path TEXT NOT NULL,
+    with_artifacts INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    is_env INTEGER NOT NULL,
+    children TEXT,
+    artifacts TEXT,
+    PRIMARY KEY (path, with_artifacts)
+);
+CREATE TABLE IF NOT EXISTS environments (
+    path TEXT NOT NULL,
+    deep INTEGER NOT NULL,
+    include_dotenv INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    site_packages_mtime_ns INTEGER,
+    info TEXT NOT NULL,
+    PRIMARY KEY (path, deep, include_dotenv)
+);
+"""
+
+
+def default_index_path() -> Path:
+    """Return the index location, honouring ``ENVOIC_CACHE_DIR`` and XDG."""
+    override = os.environ.get("ENVOIC_CACHE_DIR")
+    if override:
+        return Path(override).expanduser() / INDEX_FILENAME
+    xdg_cache = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg_cache).expanduser() if xdg_cache else Path.home() / ".cache"
+    return base / "envoic" / INDEX_FILENAME
+
+
+@dataclass(slots=True)
+class DirectoryRecord:
+    """What one listing of a directory told the scanner.
+
+    ``children`` and ``artifacts`` stay ``None`` until the directory has been
+    descended into; a record made only to classify the directory has just
+    ``is_env``.
+    """
+
+    mtime_ns: int
+    is_env: bool
+    children: list[str] | None = None
+    artifacts: list[tuple[str, str]] | None = None
+
+
+def _env_from_dict(data: dict[str, Any], *, stale_days: int) -> EnvInfo:
+    created = data["created"]
+    modified = datetime.fromisoformat(data["modified"]) if data["modified"] else None
+    is_stale = False
+    if modified is not None:
+        is_stale = modified < datetime.now(UTC) - timedelta(days=stale_days)
+    return EnvInfo(
+        path=Path(data["path"]),
+        env_type=EnvType(data["env_type"]),
+        python_version=data["python_version"],
+        size_bytes=data["size_bytes"],
+        created=datetime.fromisoformat(created) if created else None,
+        modified=modified,
+        package_count=data["package_count"],
+        is_stale=is_stale,
+        has_pyvenv_cfg=data["has_pyvenv_cfg"],
+        signals=list(data["signals"]),
+        exclusive_bytes=data["exclusive_bytes"],
+    )
+
+
+def _mtime_ns(path: Path) -> int | None:
+    try:
+        return os.stat(path, follow_symlinks=False).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _site_packages_mtime_ns(path: Path) -> int | None:
+    site_packages = _find_site_packages_dir(path)
+    return None if site_packages is None else _mtime_ns(site_packages)
+
+
+class ScanIndex:
+    """SQLite store of directory listings and detected environments.
+
+    Entries are keyed by path and validated against the mtime recorded when
+    they were written. A directory mtime only changes when its direct entries
+    change, so nested edits that do not touch a top-level marker (for example
+    a file added deep inside ``.tox``) are picked up by ``rebuild=True``.
+    Deep environment records are also validated against the mtime of their
+    site-packages, which changes on every install and uninstall, and sizes
+    are never stored: any file in the tree can change them, so they are
+    measured again on every deep scan. The index is safe to share between
+    scanner threads.
+    """
+
+    def __init__(self, path: Path | None = None, *, rebuild: bool = False) -> None:
+        self.path = path or default_index_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if rebuild or version != SCHEMA_VERSION:
+            self._conn.executescript(
+                "DROP TABLE IF EXISTS directories;"
+                "DROP TABLE IF EXISTS environments;"
+                "DROP TABLE IF EXISTS sizes;"
+            )
+        self._conn.executescript(_SCHEMA)
+        self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._conn.commit()
+
+    def __enter__(self) -> ScanIndex:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+    def directory(
+        self, path: Path, mtime_ns: int, *, with_artifacts: bool
+    ) -> DirectoryRecord | None:
+        """Return the stored record for ``path`` if it is still current."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT mtime_ns, is_env, children, artifacts FROM directories "
+                "WHERE path = ? AND with_artifacts = ?",
+                (str(path), int(with_artifacts)),
+            ).fetchone()
+        if row is None or row[0] != mtime_ns:
+            return None
+        children = json.loads(row[2]) if row[2] is not None else None
+        artifacts = (
+            [(name, pattern) for name, pattern in json.loads(row[3])]
+            if row[3] is not None
+            else None
+        )
+        return DirectoryRecord(
+            mtime_ns=row[0],
+            is_env=bool(row[1]),
+            children=children,
+            artifacts=artifacts,
+        )
+
+    def store_directory(
+        self, path: Path, record: DirectoryRecord, *, with_artifacts: bool
+    ) -> None:
+        children = json.dumps(record.children) if record.children is not None else None
+        artifacts = (
+            json.dumps(record.artifacts) if record.artifacts is not None else None
+        )
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO directories VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    str(path),
+                    int(with_artifacts),
+                    record.mtime_ns,
+                    int(record.is_env),
+                    children,
+                    artifacts,
+                ),
+            )
+
+    def detect_environment(
+        self,
+        path: Path,
+        *,
+        deep: bool = False,
+        stale_days: int = 90,
+        include_dotenv: bool = False,
+        stats: ScanStats | None = None,
+        links: LinkTally | None = None,
+    ) -> EnvInfo:
+        """``detector.detect_environment`` backed by the index.
+
+        With ``deep`` the stored record is only reused while the mtime of its
+        site-packages is unchanged too, and its size is measured afresh.
+        """
+        mtime_ns = _mtime_ns(path)
+        site_mtime_ns = _site_packages_mtime_ns(path) if deep else None
+        key = (str(path), int(deep), int(include_dotenv))
+        if mtime_ns is not None:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT mtime_ns, site_packages_mtime_ns, info FROM environments "
+                    "WHERE path = ? AND deep = ? AND include_dotenv = ?",
+                    key,
+                ).fetchone()
+            if row is not None and (row[0], row[1]) == (mtime_ns, site_mtime_ns):
+                env_info = _env_from_dict(json.loads(row[2]), stale_days=stale_days)
+                if deep:
+                    size_environment(env_info, stats, links)
+                return env_info
+
+        env_info = detect_environment(
+            path,
+            deep=deep,
+            stale_days=stale_days,
+            include_dotenv=include_dotenv,
+            stats=stats,
+            links=links,
+        )
+        if mtime_ns is not None:
+            stored = replace(env_info, size_bytes=None, exclusive_bytes=None)
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO environments VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        *key,
+                        mtime_ns,
+                        site_mtime_ns,
+                        json.dumps(to_serializable_dict(stored)),
+                    ),
+                )
+        return env_info
@@ -3,6 +3,7 @@ from __future__ import annotations
 import os
 import shutil
 import sys
+from collections.abc import Sequence
 from pathlib import Path
 from typing import Any, TypedDict, cast
 
@@ -10,6 +11,7 @@ import typer
 
 from .artifacts import CAREFUL_NOTES, SAFETY_TEXT
 from .models import ArtifactInfo, ArtifactSummary, EnvInfo, SafetyLevel
+from .sizing import DiskUsage, LinkTally, combined_exclusive_bytes, disk_usage
 from .utils import format_age, format_env_display_path, format_size
 
 
@@ -38,31 +40,6 @@ def _is_within_root(path: Path, scan_root: Path) -> bool:
     return True
 
 
-def _size_for_deletion(path: Path) -> int:
-    try:
-        if path.is_symlink():
-            return path.lstat().st_size
-        if path.is_file():
-            return path.stat().st_size
-        if not path.is_dir():
-            return 0
-    except OSError:
-        return 0
-
-    total = 0
-    for root, _, files in os.walk(path, followlinks=False):
-        for filename in files:
-            file_path = Path(root) / filename
-            try:
-                if file_path.is_symlink():
-                    total += file_path.lstat().st_size
-                else:
-                    total += file_path.stat().st_size
-            except OSError:
-                continue
-    return total
-
-
 def _column_width(display_paths: list[str]) -> int:
     if not display_paths:
         return 30
@@ -363,14 +340,26 @@ def confirm_careful_artifacts(selected: list[ArtifactSummary]) -> bool:
     return response.strip().lower() in {"y", "yes"}
 
 
+def measure_selection(selected: Sequence[EnvInfo | ArtifactInfo]) -> list[DiskUsage]:
+    """Measure each selected path as it is now, in selection order."""
+    return [disk_usage(item.path) for item in selected]
+
+
 def confirm_deletion(
     selected: list[EnvInfo | ArtifactInfo],
     *,
     scan_root: Path,
     dry_run: bool = False,
     skip_confirm: bool = False,
+    usages: Sequence[DiskUsage] | None = None,
 ) -> bool:
-    """Show deletion summary and require explicit confirmation."""
+    """Show deletion summary and require explicit confirmation.
+
+    Sizes are measured now (or taken from ``usages``, one per selected item),
+    and the total counts files hard-linked only between selected items.
+    """
+    if usages is None:
+        usages = measure_selection(selected)
     typer.echo("")
     typer.echo("⚠ The following items will be PERMANENTLY DELETED:")
     typer.echo("")
@@ -379,17 +368,30 @@ def confirm_deletion(
     path_width = _column_width(display_paths)
 
     total = 0
-    for idx, item in enumerate(selected, start=1):
-        size = item.size_bytes or 0
+    for idx, (item, usage) in enumerate(zip(selected, usages, strict=True), start=1):
+        size = usage.apparent_bytes
+        exclusive = usage.exclusive_bytes
         total += size
+        shared = f"  ({format_size(exclusive)} exclusive)" if exclusive != size else ""
         typer.echo(
             f"  {idx:<3} "
             f"{format_env_display_path(item.path, scan_root):<{path_width}} "
-            f"{format_size(size):>6}"
+            f"{format_size(size):>6}{shared}"
         )
 
+    links = LinkTally()
+    for usage in usages:
+        links.add(usage)
+    exclusive_total = sum(usage.exclusive_bytes for usage in usages)
+    exclusive_total += links.shared_bytes()
+    retained = links.retained_bytes()
     typer.echo("")
-    typer.echo(f"  Total: {format_size(total)} will be freed")
+    typer.echo(f"  Total: {format_size(exclusive_total)} will be freed")
+    if retained:
+        typer.echo(
+            f"  ({format_size(retained)} of {format_size(total)} "
+            "is hard-linked from elsewhere and stays on disk)"
+        )
 
     if dry_run:
         typer.echo("")
@@ -410,10 +412,19 @@ def delete_environments(
     selected: list[EnvInfo | ArtifactInfo],
     *,
     scan_root: Path,
+    allowed_roots: Sequence[Path] | None = None,
     dry_run: bool = False,
     dry_run_echo: bool = True,
+    usages: Sequence[DiskUsage] | None = None,
 ) -> DeletionSummary:
-    """Delete selected environments with path guards and symlink safety."""
+    """Delete selected environments with path guards and symlink safety.
+
+    Paths must lie under one of ``allowed_roots`` (``scan_root`` by default).
+    Byte counts come from ``usages`` when given (one per selected item, as
+    ``confirm_deletion`` measured them) and count files hard-linked only
+    between the items together.
+    """
+    roots = allowed_roots or [scan_root]
     summary: DeletionSummary = {
         "selected_count": len(selected),
         "deleted_count": 0,
@@ -425,18 +436,20 @@ def delete_environments(
         "dry_run": dry_run,
     }
 
-    for item in selected:
+    would_free: list[DiskUsage] = []
+    freed: list[DiskUsage] = []
+    for idx, item in enumerate(selected):
         path = item.path
 
-        if not _is_within_root(path, scan_root):
+        if not any(_is_within_root(path, root) for root in roots):
             warning = f"Skipping outside scan path: {path}"
             typer.echo(f"Warning: {warning}", err=True)
             summary["skipped_count"] += 1
             summary["errors"].append(warning)
             continue
 
-        size = _size_for_deletion(path)
-        summary["would_free_bytes"] += size
+        usage = disk_usage(path) if usages is None else usages[idx]
+        would_free.append(usage)
 
         if dry_run:
             if dry_run_echo:
@@ -460,7 +473,7 @@ def delete_environments(
             else:
                 shutil.rmtree(path)
             summary["deleted_count"] += 1
-            summary["bytes_freed"] += size
+            freed.append(usage)
             typer.echo(" done")
         except PermissionError as exc:
             summary["failed_count"] += 1
@@ -471,6 +484,8 @@ def delete_environments(
             summary["errors"].append(str(exc))
             typer.echo(" failed")
 
+    summary["would_free_bytes"] = combined_exclusive_bytes(would_free)
+    summary["bytes_freed"] = combined_exclusive_bytes(freed)
     return summary
 
 
@@ -40,6 +40,62 @@ class EnvInfo:
     is_stale: bool = False
     has_pyvenv_cfg: bool = False
     signals: list[str] = field(default_factory=list)
+    # Bytes deleting the environment frees; less than ``size_bytes`` when
+    # its files are hard links into a shared cache.
+    exclusive_bytes: int | None = None
+
+
+@dataclass(slots=True)
+class RootScan:
+    """One walked root of a multi-root scan."""
+
+    path: Path
+    duration_seconds: float
+    device: int | None = None
+
+
+@dataclass(slots=True)
+class ScanStats:
+    """Work performed while walking a tree, detecting and sizing.
+
+    ``phase_seconds`` holds the time spent walking (``walk``), detecting
+    (``detect``) and sizing (``size``), summed over threads and worker
+    processes. ``io`` holds ``/proc/self/io`` deltas where that file exists.
+    Neither takes part in equality, since they differ between identical runs.
+    """
+
+    directories_listed: int = 0
+    entries_examined: int = 0
+    stat_calls: int = 0
+    subtrees_pruned: int = 0
+    errors_suppressed: int = 0
+    bytes_sized: int = 0
+    subprocesses_spawned: int = 0
+    directories_unvisited: int = 0
+    truncated_directories: list[Path] = field(default_factory=list)
+    pruned_by_rule: dict[str, int] = field(default_factory=dict)
+    phase_seconds: dict[str, float] = field(default_factory=dict, compare=False)
+    io: dict[str, int] = field(default_factory=dict, compare=False)
+
+    def add_phase(self, phase: str, seconds: float) -> None:
+        self.phase_seconds[phase] = self.phase_seconds.get(phase, 0.0) + seconds
+
+    def merge(self, other: ScanStats) -> None:
+        self.directories_listed += other.directories_listed
+        self.entries_examined += other.entries_examined
+        self.stat_calls += other.stat_calls
+        self.subtrees_pruned += other.subtrees_pruned
+        self.errors_suppressed += other.errors_suppressed
+        self.bytes_sized += other.bytes_sized
+        self.subprocesses_spawned += other.subprocesses_spawned
+        self.directories_unvisited += other.directories_unvisited
+        self.truncated_directories.extend(other.truncated_directories)
+        for rule, count in other.pruned_by_rule.items():
+            self.pruned_by_rule[rule] = self.pruned_by_rule.get(rule, 0) + count
+        for phase, seconds in other.phase_seconds.items():
+            self.add_phase(phase, seconds)
+        for counter, value in other.io.items():
+            self.io[counter] = self.io.get(counter, 0) + value
 
 
 @dataclass(slots=True)
@@ -54,6 +110,12 @@ class ScanResult:
     stale_days: int = 90
     artifacts: list[ArtifactInfo] = field(default_factory=list)
     artifact_summary: list[ArtifactSummary] = field(default_factory=list)
+    scan_roots: list[RootScan] = field(default_factory=list)
+    partial: bool = False
+    stats: ScanStats = field(default_factory=ScanStats)
+    # The environments' ``exclusive_bytes`` plus files hard-linked only
+    # between them, counted once: what deleting all of them would free.
+    total_exclusive_bytes: int = 0
 
 
 @dataclass(slots=True)
@@ -63,6 +125,7 @@ class ArtifactInfo:
     safety: SafetyLevel
     size_bytes: int | None = None
     pattern_matched: str = ""
+    exclusive_bytes: int | None = None
 
 
 @dataclass(slots=True)
@@ -75,6 +138,7 @@ class ArtifactSummary:
     total_size_bytes: int
     items: list[ArtifactInfo]
     pattern: str = ""
+    total_exclusive_bytes: int = 0
 
 
 EnvTypeValue = Literal["venv", "conda", "dotenv_dir", "unknown"]
@@ -99,6 +163,7 @@ class EnvInfoDict(TypedDict):
     is_stale: bool
     has_pyvenv_cfg: bool
     signals: list[str]
+    exclusive_bytes: int | None
 
 
 class ArtifactInfoDict(TypedDict):
@@ -107,6 +172,7 @@ class ArtifactInfoDict(TypedDict):
     safety: SafetyLevelValue
     size_bytes: int | None
     pattern_matched: str
+    exclusive_bytes: int | None
 
 
 class ArtifactSummaryDict(TypedDict):
@@ -116,6 +182,28 @@ class ArtifactSummaryDict(TypedDict):
     total_size_bytes: int
     items: list[ArtifactInfoDict]
     pattern: str
+    total_exclusive_bytes: int
+
+
+class RootScanDict(TypedDict):
+    path: str
+    duration_seconds: float
+    device: int | None
+
+
+class ScanStatsDict(TypedDict):
+    directories_listed: int
+    entries_examined: int
+    stat_calls: int
+    subtrees_pruned: int
+    errors_suppressed: int
+    bytes_sized: int
+    subprocesses_spawned: int
+    directories_unvisited: int
+    truncated_directories: list[str]
+    pruned_by_rule: dict[str, int]
+    phase_seconds: dict[str, float]
+    io: dict[str, int]
 
 
 class ScanResultDict(TypedDict):
@@ -129,6 +217,10 @@ class ScanResultDict(TypedDict):
     stale_days: int
     artifacts: list[ArtifactInfoDict]
     artifact_summary: list[ArtifactSummaryDict]
+    scan_roots: list[RootScanDict]
+    partial: bool
+    stats: ScanStatsDict
+    total_exclusive_bytes: int
 
 
 def _serialize_value(value: Any) -> Any:
@@ -146,7 +238,7 @@ def _serialize_value(value: Any) -> Any:
 
 
 def _to_serializable_dict(
-    data: ScanResult | EnvInfo | ArtifactInfo | ArtifactSummary,
+    data: ScanResult | EnvInfo | ArtifactInfo | ArtifactSummary | ScanStats,
 ) -> dict[str, Any]:
     return cast(dict[str, Any], _serialize_value(asdict(data)))
 
@@ -167,11 +259,25 @@ def to_serializable_dict(data: ArtifactInfo) -> ArtifactInfoDict: ...
 def to_serializable_dict(data: ArtifactSummary) -> ArtifactSummaryDict: ...
 
 
+@overload
+def to_serializable_dict(data: ScanStats) -> ScanStatsDict: ...
+
+
 def to_serializable_dict(
-    data: EnvInfo | ScanResult | ArtifactInfo | ArtifactSummary,
-) -> EnvInfoDict | ScanResultDict | ArtifactInfoDict | ArtifactSummaryDict:
+    data: EnvInfo | ScanResult | ArtifactInfo | ArtifactSummary | ScanStats,
+) -> (
+    EnvInfoDict
+    | ScanResultDict
+    | ArtifactInfoDict
+    | ArtifactSummaryDict
+    | ScanStatsDict
+):
     serialized = _to_serializable_dict(data)
     return cast(
-        EnvInfoDict | ScanResultDict | ArtifactInfoDict | ArtifactSummaryDict,
+        EnvInfoDict
+        | ScanResultDict
+        | ArtifactInfoDict
+        | ArtifactSummaryDict
+        | ScanStatsDict,
         serialized,
     )
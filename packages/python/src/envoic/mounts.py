@@ -0,0 +1,162 @@
+"""Mount table parsing and the policy deciding which mounts a scan enters."""
+
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from pathlib import Path, PurePosixPath
+
+MOUNTINFO_PATH = Path("/proc/self/mountinfo")
+
+# Kernel and virtual filesystems that never hold Python environments.
+PSEUDO_FS_TYPES = frozenset(
+    {
+        "autofs",
+        "binfmt_misc",
+        "bpf",
+        "cgroup",
+        "cgroup2",
+        "configfs",
+        "debugfs",
+        "devpts",
+        "devtmpfs",
+        "efivarfs",
+        "fusectl",
+        "hugetlbfs",
+        "mqueue",
+        "nsfs",
+        "proc",
+        "pstore",
+        "rpc_pipefs",
+        "securityfs",
+        "sysfs",
+        "tracefs",
+    }
+)
+
+_OCTAL_ESCAPE_RE = re.compile(r"\\([0-7]{3})")
+
+
+@dataclass(frozen=True, slots=True)
+class Mount:
+    """One line of ``/proc/self/mountinfo``."""
+
+    mount_id: int
+    device: int
+    root: PurePosixPath
+    mount_point: Path
+    fs_type: str
+
+
+def _unescape(field: str) -> str:
+    return _OCTAL_ESCAPE_RE.sub(lambda match: chr(int(match.group(1), 8)), field)
+
+
+def parse_mountinfo(text: str) -> list[Mount]:
+    """Parse mountinfo ``text``, skipping lines that do not follow the format."""
+    mounts: list[Mount] = []
+    for line in text.splitlines():
+        fields = line.split()
+        try:
+            separator = fields.index("-", 6)
+            major, minor = fields[2].split(":")
+            mounts.append(
+                Mount(
+                    mount_id=int(fields[0]),
+                    device=os.makedev(int(major), int(minor)),
+                    root=PurePosixPath(_unescape(fields[3])),
+                    mount_point=Path(_unescape(fields[4])),
+                    fs_type=fields[separator + 1],
+                )
+            )
+        except (ValueError, IndexError):
+            continue
+    return mounts
+
+
+def read_mounts(path: Path = MOUNTINFO_PATH) -> list[Mount] | None:
+    """Return the mount table, or ``None`` where mountinfo is unavailable."""
+    try:
+        return parse_mountinfo(path.read_text(encoding="utf-8"))
+    except OSError:
+        return None
+
+
+def _visible_mounts(mounts: list[Mount]) -> list[Mount]:
+    # A later mount on the same mount point hides the earlier one.
+    by_point: dict[Path, Mount] = {}
+    for mount in mounts:
+        by_point.pop(mount.mount_point, None)
+        by_point[mount.mount_point] = mount
+    return list(by_point.values())
+
+
+def _is_within(path: Path, root: Path) -> bool:
+    return path == root or root in path.parents
+
+
+@dataclass(frozen=True, slots=True)
+class MountPolicy:
+    """Which mounts below a scan root are entered.
+
+    ``skip_types`` and ``include_types`` hold filesystem type patterns such as
+    ``nfs`` or ``fuse.*``; a type matching ``include_types`` is entered even
+    when it also matches ``skip_types``. With ``one_file_system`` nothing on a
+    device other than the root's is entered. Bind mounts whose data is also
+    reachable through another mount under the root are entered only once.
+    The scan root itself is always walked.
+    """
+
+    skip_types: frozenset[str] = PSEUDO_FS_TYPES
+    include_types: frozenset[str] = frozenset()
+    one_file_system: bool = False
+
+    def allows(self, fs_type: str) -> bool:
+        if any(fnmatchcase(fs_type, pattern) for pattern in self.include_types):
+            return True
+        return not any(fnmatchcase(fs_type, pattern) for pattern in self.skip_types)
+
+    def pruned_mounts(self, root: Path, mounts: list[Mount]) -> frozenset[Path]:
+        """Mount points under ``root`` that the walk must not enter."""
+        try:
+            root_device = os.stat(root).st_dev
+        except OSError:
+            return frozenset()
+
+        visible = _visible_mounts(mounts)
+        order = {mount.mount_id: position for position, mount in enumerate(visible)}
+        pruned: set[Path] = set()
+        for mount in visible:
+            point = mount.mount_point
+            if point == root or not _is_within(point, root):
+                continue
+            if self.one_file_system and mount.device != root_device:
+                pruned.add(point)
+            elif not self.allows(mount.fs_type):
+                pruned.add(point)
+            elif _is_bind_copy(mount, root, visible, order):
+                pruned.add(point)
+        return frozenset(pruned)
+
+
+def _is_bind_copy(
+    mount: Mount, root: Path, visible: list[Mount], order: dict[int, int]
+) -> bool:
+    """Whether ``mount``'s data is also reached through another mount.
+
+    Of two mounts exposing the same data, the one exposing more of the
+    filesystem is kept, or the earlier one when both expose the same subtree.
+    """
+    for other in visible:
+        if other is mount or other.device != mount.device:
+            continue
+        if mount.root != other.root and other.root not in mount.root.parents:
+            continue
+        if mount.root == other.root and order[other.mount_id] > order[mount.mount_id]:
+            continue
+        alias = other.mount_point / mount.root.relative_to(other.root)
+        if alias != mount.mount_point and _is_within(alias, root):
+            return True
+    return False
@@ -4,7 +4,7 @@ from pathlib import Path
 from typing import Literal
 
 from .artifacts import CAREFUL_NOTES, SAFETY_TEXT
-from .models import ArtifactSummary, EnvInfo, SafetyLevel, ScanResult
+from .models import ArtifactSummary, EnvInfo, SafetyLevel, ScanResult, ScanStats
 from .utils import (
     VENV_DIR_NAMES,
     bar_chart,
@@ -174,6 +174,9 @@ def format_report(
     stale_count = sum(1 for env in result.environments if env.is_stale)
     artifact_count = sum(item.count for item in result.artifact_summary)
     artifact_total_size = sum(item.total_size_bytes for item in result.artifact_summary)
+    artifact_exclusive = sum(
+        item.total_exclusive_bytes for item in result.artifact_summary
+    )
 
     lines: list[str] = []
     lines.append(_box_top())
@@ -185,16 +188,38 @@ def format_report(
     lines.append(_row("Scan Path", shorten_path(result.scan_path, 36)))
     lines.append(_row("Scan Depth", str(result.scan_depth)))
     lines.append(_row("Duration", f"{result.duration_seconds:.2f}s"))
+    if len(result.scan_roots) > 1:
+        for root_scan in result.scan_roots:
+            lines.append(
+                _row(
+                    "Root",
+                    f"{shorten_path(root_scan.path, 28)} "
+                    f"{root_scan.duration_seconds:.2f}s",
+                )
+            )
+    stats = result.stats
+    if result.partial:
+        lines.append(_row("Partial", f"{stats.directories_unvisited} dirs not scanned"))
+    if stats.truncated_directories:
+        lines.append(
+            _row("Truncated", f"{len(stats.truncated_directories)} dirs cut short")
+        )
+    for rule, count in sorted(stats.pruned_by_rule.items()):
+        lines.append(_row("Excluded", f"{count} x {rule}"))
     lines.append(_box_mid())
     lines.append(_row("Envs Found", str(len(result.environments))))
     lines.append(
         _row("Env Size", format_size(result.total_size_bytes) if deep else "-")
     )
+    if deep and result.total_exclusive_bytes != result.total_size_bytes:
+        lines.append(_row("Env Exclusive", format_size(result.total_exclusive_bytes)))
     lines.append(_row(f"Stale >{result.stale_days}d", str(stale_count)))
     lines.append(_row("Artifacts Found", str(artifact_count)))
     lines.append(
         _row("Artifact Size", format_size(artifact_total_size) if deep else "-")
     )
+    if deep and artifact_exclusive != artifact_total_size:
+        lines.append(_row("Artifact Exclusive", format_size(artifact_exclusive)))
     lines.append(_box_bottom())
     lines.append("")
     lines.append("ENVIRONMENTS")
@@ -270,6 +295,33 @@ def format_report(
     return "\n".join(lines)
 
 
+def format_stats(stats: ScanStats) -> str:
+    """Counters, phase times and I/O of one scan as a box."""
+    lines = [_box_top(), box_line("  SCAN STATISTICS"), _box_mid()]
+    lines.append(_row("Dirs Listed", str(stats.directories_listed)))
+    lines.append(_row("Entries", str(stats.entries_examined)))
+    lines.append(_row("Stat Calls", str(stats.stat_calls)))
+    lines.append(_row("Pruned", f"{stats.subtrees_pruned} subtrees"))
+    lines.append(_row("Errors", f"{stats.errors_suppressed} suppressed"))
+    lines.append(_row("Unvisited", str(stats.directories_unvisited)))
+    lines.append(_row("Sized", format_size(stats.bytes_sized)))
+    lines.append(_row("Subprocesses", str(stats.subprocesses_spawned)))
+    for phase in ("walk", "detect", "size"):
+        if phase in stats.phase_seconds:
+            lines.append(_row(f"Time {phase}", f"{stats.phase_seconds[phase]:.2f}s"))
+    if stats.io:
+        lines.append(_row("Disk Read", format_size(stats.io.get("read_bytes", 0))))
+        lines.append(_row("Disk Write", format_size(stats.io.get("write_bytes", 0))))
+        lines.append(
+            _row(
+                "Syscalls",
+                f"{stats.io.get('syscr', 0)} read, {stats.io.get('syscw', 0)} write",
+            )
+        )
+    lines.append(_box_bottom())
+    return "\n".join(lines)
+
+
 def format_list(
     environments: list[EnvInfo],
     *,
@@ -295,6 +347,8 @@ def format_info(env: EnvInfo, top_packages: list[str], activation: str) -> str:
     lines.append(_row("Type", env.env_type.value))
     lines.append(_row("Python", env.python_version or "-"))
     lines.append(_row("Size", format_size(env.size_bytes)))
+    if env.exclusive_bytes is not None and env.exclusive_bytes != env.size_bytes:
+        lines.append(_row("Exclusive", format_size(env.exclusive_bytes)))
     lines.append(_row("Packages", str(env.package_count or 0)))
     lines.append(
         _row(
@@ -1,12 +1,32 @@
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass, field
+import queue
+import threading
+import time
+from collections.abc import Collection, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, replace
+from functools import partial
 from pathlib import Path
+from typing import Literal, TypeAlias, cast
 
-from .artifacts import calculate_path_size, match_artifact
-from .detector import quick_is_environment_dir
-from .models import ArtifactInfo
+from .artifacts import (
+    PARENT_MARKERS,
+    artifact_for_pattern,
+    match_artifact,
+    needs_parent_listing,
+)
+from .detector import (
+    ENV_LISTING_NAMES,
+    is_environment_listing,
+    quick_is_environment_dir,
+)
+from .excludes import ExcludeMatcher
+from .index import DirectoryRecord, ScanIndex
+from .models import ArtifactInfo, RootScan, ScanStats
+from .mounts import Mount, MountPolicy, read_mounts
+from .sizing import SIZE_WORKERS, LinkTally, SizePipeline, disk_usage
 
 TARGET_DIR_NAMES = {".env", ".venv", "env", "venv", ".virtualenv", "virtualenv"}
 SKIP_DIR_NAMES = {"node_modules", ".git", ".hg", ".svn"}
@@ -24,11 +44,187 @@ ALLOWED_HIDDEN = {
     ".ipynb_checkpoints",
 }
 
+ScanItem: TypeAlias = Path | ArtifactInfo
+
+# "path" hands absolute paths to every syscall; "fd" opens each directory
+# relative to its parent's descriptor, so lookups do not re-resolve the full
+# path and a directory renamed mid-walk is still listed from the one opened.
+WalkEngine = Literal["path", "fd"]
+FD_ENGINE_AVAILABLE = (
+    os.scandir in os.supports_fd
+    and os.open in os.supports_dir_fd
+    and os.stat in os.supports_dir_fd
+)
+_DIR_FLAGS = (
+    os.O_RDONLY
+    | getattr(os, "O_DIRECTORY", 0)
+    | getattr(os, "O_NOFOLLOW", 0)
+    | getattr(os, "O_CLOEXEC", 0)
+)
+
 
 @dataclass(slots=True)
 class ScanDiscovery:
     environments: list[Path]
     artifacts: list[ArtifactInfo] = field(default_factory=list)
+    stats: ScanStats = field(default_factory=ScanStats)
+    roots: list[RootScan] = field(default_factory=list)
+    # Hard links shared between artifacts, for ``summarize_artifacts``.
+    links: LinkTally = field(default_factory=LinkTally)
+
+    @property
+    def partial(self) -> bool:
+        """Whether the time budget ran out before the walk finished."""
+        return self.stats.directories_unvisited > 0
+
+
+@dataclass(frozen=True, slots=True)
+class WalkConfig:
+    """How to walk one root; build it with ``walk_config`` and ``for_root``."""
+
+    max_depth: int
+    include_artifacts: bool = False
+    deep: bool = False
+    index: ScanIndex | None = None
+    stop_at: frozenset[Path] = frozenset()
+    deadline: float | None = None
+    max_entries: int | None = None
+    prune: frozenset[Path] = frozenset()
+    device: int | None = None
+    mount_points: frozenset[Path] = frozenset()
+    excludes: ExcludeMatcher | None = None
+    engine: WalkEngine = "path"
+
+    def expired(self) -> bool:
+        return self.deadline is not None and time.perf_counter() >= self.deadline
+
+    def for_root(
+        self,
+        root: Path,
+        *,
+        stop_at: Collection[Path] = (),
+        mount_policy: MountPolicy | None = None,
+        mounts: list[Mount] | None = None,
+    ) -> WalkConfig:
+        """This configuration narrowed to walking ``root``.
+
+        ``mounts`` is the mount table from ``read_mounts``, ``None`` where it
+        cannot be read.
+        """
+        config = replace(self, stop_at=frozenset(stop_at))
+        if mounts is not None:
+            config = replace(
+                config, mount_points=frozenset(mount.mount_point for mount in mounts)
+            )
+        if mount_policy is None:
+            return config
+        if mounts is None:
+            # Without a mount table only --one-file-system can be honoured, by
+            # comparing each directory's device with the root's.
+            if mount_policy.one_file_system:
+                return replace(config, device=root_device(root))
+            return config
+        return replace(config, prune=mount_policy.pruned_mounts(root, mounts))
+
+
+def walk_config(
+    max_depth: int,
+    *,
+    include_artifacts: bool = False,
+    deep: bool = False,
+    index: ScanIndex | None = None,
+    time_budget: float | None = None,
+    max_entries: int | None = None,
+    exclude: Iterable[str] = (),
+    engine: WalkEngine = "path",
+) -> WalkConfig:
+    """Configuration shared by every root of one scan; its budget starts now."""
+    return WalkConfig(
+        max_depth=max_depth,
+        include_artifacts=include_artifacts,
+        deep=deep,
+        index=index,
+        deadline=_deadline(time_budget),
+        max_entries=max_entries,
+        excludes=ExcludeMatcher(exclude) or None,
+        engine=engine,
+    )
+
+
+def _deadline(time_budget: float | None) -> float | None:
+    if time_budget is None:
+        return None
+    return time.perf_counter() + time_budget
+
+
+def _unvisited(count: int) -> DirectoryVisit:
+    return DirectoryVisit(stats=ScanStats(directories_unvisited=count))
+
+
+@dataclass(slots=True)
+class _Listing:
+    """What the walker keeps from one ``scandir`` pass over a directory.
+
+    Plain files are dropped as they stream past, so memory grows with the
+    number of subdirectories and artifacts, not with the directory's width.
+    """
+
+    markers: dict[str, os.DirEntry[str]] = field(default_factory=dict)
+    children: list[tuple[str, os.DirEntry[str]]] = field(default_factory=list)
+    artifacts: list[ArtifactInfo] = field(default_factory=list)
+    truncated: bool = False
+
+
+@dataclass(slots=True)
+class PendingDir:
+    """A directory waiting to be visited.
+
+    ``listing`` is the listing taken while classifying the directory, so the
+    visit does not list it a second time. ``record`` is its index entry when
+    an index is in use. ``key`` is its ``(st_dev, st_ino)`` identity, used to
+    reach every directory at most once.
+    """
+
+    path: Path
+    listing: _Listing | None = None
+    record: DirectoryRecord | None = None
+    key: tuple[int, int] | None = None
+
+    @classmethod
+    def for_root(cls, root: Path, visited: set[tuple[int, int]]) -> PendingDir:
+        """The start of a walk from ``root``, marked as reached in ``visited``."""
+        pending = cls(root)
+        try:
+            st = os.stat(root)
+        except OSError:
+            return pending
+        pending.key = (st.st_dev, st.st_ino)
+        visited.add(pending.key)
+        return pending
+
+    def claim(self, visited: set[tuple[int, int]]) -> bool:
+        """Mark this directory as reached; ``False`` if it was reached before.
+
+        Symlinks are never followed, so this only triggers for bind mounts and
+        Windows junctions that lead back into the walked tree.
+        """
+        if self.key is None:
+            return True
+        if self.key in visited:
+            return False
+        visited.add(self.key)
+        return True
+
+
+@dataclass(slots=True)
+class DirectoryVisit:
+    """Everything learned from visiting a single directory."""
+
+    environments: list[Path] = field(default_factory=list)
+    artifacts: list[ArtifactInfo] = field(default_factory=list)
+    subdirs: list[PendingDir] = field(default_factory=list)
+    stats: ScanStats = field(default_factory=ScanStats)
+    links: LinkTally = field(default_factory=LinkTally)
 
 
 def _should_skip(name: str) -> bool:
@@ -39,68 +235,873 @@ def _should_skip(name: str) -> bool:
     return False
 
 
-def scan(
+def _read_directory(
+    path: Path, config: WalkConfig, stats: ScanStats, fd: int | None = None
+) -> _Listing | None:
+    """List ``path``, or the open directory ``fd`` standing for it.
+
+    Entries read through ``fd`` stat relative to it, so apart from names and
+    inodes they must not be queried once ``fd`` is closed.
+    """
+    stats.directories_listed += 1
+    listing = _Listing()
+    # Entries whose match depends on markers that may come later in the
+    # listing (``build`` and ``dist`` need a project file next to them).
+    deferred: list[os.DirEntry[str]] = []
+    parent_names: set[str] = set()
+    try:
+        with os.scandir(path if fd is None else fd) as it:
+            for count, entry in enumerate(it, start=1):
+                if config.max_entries is not None and count > config.max_entries:
+                    listing.truncated = True
+                    break
+                stats.entries_examined += 1
+                name = entry.name
+                if name in ENV_LISTING_NAMES:
+                    listing.markers[name] = entry
+                if config.include_artifacts:
+                    if name in PARENT_MARKERS:
+                        parent_names.add(name)
+                    if needs_parent_listing(name):
+                        deferred.append(entry)
+                        continue
+                    artifact = match_artifact(entry, path)
+                    if artifact is not None:
+                        listing.artifacts.append(artifact)
+                        if entry.is_dir(follow_symlinks=False):
+                            continue
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+                if _should_skip(name):
+                    stats.subtrees_pruned += 1
+                    continue
+                listing.children.append((name, entry))
+        # A truncated listing may have cut off the markers; stat them then.
+        names = None if listing.truncated else parent_names
+        for entry in deferred:
+            artifact = match_artifact(entry, path, parent_names=names)
+            if artifact is not None:
+                listing.artifacts.append(artifact)
+                if entry.is_dir(follow_symlinks=False):
+                    continue
+            _add_child(listing, entry.name, entry, stats)
+    except OSError:
+        stats.errors_suppressed += 1
+        return None
+    return listing
+
+
+def _add_child(
+    listing: _Listing, name: str, entry: os.DirEntry[str], stats: ScanStats
+) -> None:
+    if not entry.is_dir(follow_symlinks=False):
+        return
+    if _should_skip(name):
+        stats.subtrees_pruned += 1
+        return
+    listing.children.append((name, entry))
+
+
+def _lstat(
+    path: Path,
+    entry: os.DirEntry[str] | None,
+    stats: ScanStats,
+    dir_fd: int | None = None,
+) -> os.stat_result | None:
+    stats.stat_calls += 1
+    try:
+        if dir_fd is not None:
+            return os.stat(path.name, dir_fd=dir_fd, follow_symlinks=False)
+        if entry is not None:
+            return entry.stat(follow_symlinks=False)
+        return os.stat(path, follow_symlinks=False)
+    except OSError:
+        stats.errors_suppressed += 1
+        return None
+
+
+def _fstat(fd: int, stats: ScanStats) -> os.stat_result | None:
+    stats.stat_calls += 1
+    try:
+        return os.fstat(fd)
+    except OSError:
+        stats.errors_suppressed += 1
+        return None
+
+
+def _dir_key(
+    path: Path,
+    entry: os.DirEntry[str] | None,
+    parent: tuple[int, int] | None,
+    config: WalkConfig,
+    stats: ScanStats,
+    dir_fd: int | None = None,
+) -> tuple[int, int] | None:
+    """``(st_dev, st_ino)`` of a child directory, without a stat when possible.
+
+    ``DirEntry.inode()`` comes with the listing, and a directory that is not
+    a mount point lives on its parent's device. Mount points report the
+    inode of the directory they cover, so those are stat'ed.
+    """
+    if entry is not None and parent is not None and path not in config.mount_points:
+        return parent[0], entry.inode()
+    st = _lstat(path, None, stats, dir_fd)
+    if st is None:
+        return None
+    return st.st_dev, st.st_ino
+
+
+def _crosses_device(
+    path: Path,
+    entry: os.DirEntry[str] | None,
+    config: WalkConfig,
+    stats: ScanStats,
+    dir_fd: int | None = None,
+) -> bool:
+    if config.device is None:
+        return False
+    st = _lstat(path, entry, stats, dir_fd)
+    return st is None or st.st_dev != config.device
+
+
+def _excluded(path: Path, excludes: ExcludeMatcher, stats: ScanStats) -> bool:
+    rule = excludes.match(path)
+    if rule is None:
+        return False
+    stats.pruned_by_rule[rule] = stats.pruned_by_rule.get(rule, 0) + 1
+    return True
+
+
+def _open_dir(path: Path | str, dir_fd: int | None = None) -> int | None:
+    try:
+        return os.open(path, _DIR_FLAGS, dir_fd=dir_fd)
+    except OSError:
+        return None
+
+
+def _list_and_classify(
+    dir_path: Path, config: WalkConfig, stats: ScanStats, dir_fd: int | None
+) -> tuple[_Listing, bool] | None:
+    if dir_fd is None:
+        listing = _read_directory(dir_path, config, stats)
+        if listing is None:
+            return None
+        return listing, _classify_listing(dir_path, listing, stats)
+
+    fd = _open_dir(dir_path.name, dir_fd)
+    if fd is None:
+        stats.errors_suppressed += 1
+        return None
+    try:
+        listing = _read_directory(dir_path, config, stats, fd)
+        if listing is None:
+            return None
+        # Marker entries may stat through ``fd``, so classify before closing.
+        return listing, _classify_listing(dir_path, listing, stats)
+    finally:
+        os.close(fd)
+
+
+def _classify_listing(dir_path: Path, listing: _Listing, stats: ScanStats) -> bool:
+    # A truncated listing may have cut off the markers; probe them then.
+    if listing.truncated:
+        return quick_is_environment_dir(dir_path, stats)
+    return is_environment_listing(dir_path, listing.markers, stats=stats)
+
+
+def _classify_child(
+    dir_path: Path,
+    entry: os.DirEntry[str] | None,
+    visit: DirectoryVisit,
+    config: WalkConfig,
+    dir_fd: int | None = None,
+    *,
+    leaf: bool = False,
+) -> tuple[bool, PendingDir] | None:
+    """Decide whether ``dir_path`` is an environment, listing it at most once.
+
+    With ``dir_fd``, the open parent directory, the child is opened and
+    stat'ed relative to it. With ``leaf`` the child will not be visited, so
+    it is probed for environment markers instead of listed.
+    """
+    index = config.index
+    mtime_ns = None
+    key = None
+    if index is not None:
+        st = _lstat(dir_path, entry, visit.stats, dir_fd)
+        if st is None:
+            return None
+        mtime_ns = st.st_mtime_ns
+        key = (st.st_dev, st.st_ino)
+        record = index.directory(
+            dir_path, mtime_ns, with_artifacts=config.include_artifacts
+        )
+        if record is not None:
+            return record.is_env, PendingDir(dir_path, record=record, key=key)
+
+    if leaf:
+        is_env = quick_is_environment_dir(dir_path, visit.stats)
+        pending = PendingDir(dir_path, key=key)
+    else:
+        classified = _list_and_classify(dir_path, config, visit.stats, dir_fd)
+        if classified is None:
+            return None
+        listing, is_env = classified
+        pending = PendingDir(dir_path, listing, key=key)
+    if index is not None and mtime_ns is not None:
+        pending.record = DirectoryRecord(mtime_ns=mtime_ns, is_env=is_env)
+        index.store_directory(
+            dir_path, pending.record, with_artifacts=config.include_artifacts
+        )
+    return is_env, pending
+
+
+def size_artifact(artifact: ArtifactInfo, links: LinkTally | None = None) -> ScanStats:
+    """Fill in the sizes of ``artifact`` and return the work it took.
+
+    Hard links it shares with other trees are pooled into ``links`` under
+    its pattern. Safe to call from sizing threads as long as each thread
+    passes its own ``links``.
+    """
+    stats = ScanStats()
+    start = time.perf_counter()
+    usage = disk_usage(artifact.path, stats)
+    artifact.size_bytes = usage.apparent_bytes
+    artifact.exclusive_bytes = usage.exclusive_bytes
+    if links is not None:
+        links.add(usage, artifact.pattern_matched)
+    stats.add_phase("size", time.perf_counter() - start)
+    return stats
+
+
+def visit_directory(
+    pending: PendingDir,
+    config: WalkConfig,
+    dir_fd: int | None = None,
+    *,
+    leaf: bool = False,
+) -> DirectoryVisit:
+    """Visit ``pending``; ``dir_fd`` is the directory opened, for the fd engine.
+
+    ``leaf`` marks a directory at the depth limit: its subdirectories are
+    classified without being listed, and none are returned in ``subdirs``.
+    """
+    start = time.perf_counter()
+    visit = _walk_directory(pending, config, dir_fd, leaf)
+    visit.stats.add_phase("walk", time.perf_counter() - start)
+    if config.deep:
+        for artifact in visit.artifacts:
+            visit.stats.merge(size_artifact(artifact, visit.links))
+    return visit
+
+
+def _walk_directory(
+    pending: PendingDir, config: WalkConfig, dir_fd: int | None, leaf: bool
+) -> DirectoryVisit:
+    visit = DirectoryVisit()
+    current = pending.path
+    record = pending.record
+    index = config.index
+    include_artifacts = config.include_artifacts
+    children: list[tuple[str, os.DirEntry[str] | None]] = []
+
+    mtime_ns = None
+    if index is not None and record is None and pending.listing is None:
+        if dir_fd is None:
+            st = _lstat(current, None, visit.stats)
+        else:
+            st = _fstat(dir_fd, visit.stats)
+        mtime_ns = st.st_mtime_ns if st is not None else None
+        if mtime_ns is not None:
+            record = index.directory(
+                current, mtime_ns, with_artifacts=include_artifacts
+            )
+
+    if (
+        pending.listing is None
+        and record is not None
+        and record.children is not None
+        and record.artifacts is not None
+    ):
+        for name, pattern_name in record.artifacts:
+            artifact = artifact_for_pattern(current / name, pattern_name)
+            if artifact is not None:
+                visit.artifacts.append(artifact)
+        children = [(name, None) for name in record.children]
+    else:
+        listing = pending.listing
+        if listing is None:
+            listing = _read_directory(current, config, visit.stats, dir_fd)
+            if listing is None:
+                return visit
+        # Recorded here, not when listed: environments are listed to be
+        # classified but never visited.
+        if listing.truncated:
+            visit.stats.truncated_directories.append(current)
+        visit.artifacts.extend(listing.artifacts)
+        children.extend(listing.children)
+
+        # A truncated listing is incomplete, so it is never cached.
+        if index is not None and not listing.truncated:
+            if record is None and mtime_ns is not None:
+                is_env = is_environment_listing(current, listing.markers)
+                record = DirectoryRecord(mtime_ns=mtime_ns, is_env=is_env)
+            if record is not None:
+                record.children = [name for name, _ in children]
+                record.artifacts = [
+                    (item.path.name, item.pattern_matched) for item in visit.artifacts
+                ]
+                index.store_directory(current, record, with_artifacts=include_artifacts)
+
+    for name, child_entry in children:
+        dir_path = current / name
+        if (
+            (config.excludes and _excluded(dir_path, config.excludes, visit.stats))
+            or dir_path in config.prune
+            or _crosses_device(dir_path, child_entry, config, visit.stats, dir_fd)
+        ):
+            visit.stats.subtrees_pruned += 1
+            continue
+        # ``current`` is resolved and symlinks are never followed, so
+        # ``dir_path`` is already canonical and needs no ``resolve()``.
+        classified = _classify_child(
+            dir_path, child_entry, visit, config, dir_fd, leaf=leaf
+        )
+        if classified is None:
+            if name in TARGET_DIR_NAMES:
+                visit.environments.append(dir_path)
+            continue
+
+        is_env, child = classified
+        if is_env or name in TARGET_DIR_NAMES:
+            visit.environments.append(dir_path)
+            if is_env:
+                continue
+
+        if leaf or dir_path in config.stop_at:
+            continue
+        if child.key is None:
+            child.key = _dir_key(
+                dir_path, child_entry, pending.key, config, visit.stats, dir_fd
+            )
+        visit.subdirs.append(child)
+
+    if config.excludes:
+        visit.artifacts = [
+            artifact
+            for artifact in visit.artifacts
+            if not _excluded(artifact.path, config.excludes, visit.stats)
+        ]
+    return visit
+
+
+def _iter_visits(root: Path, config: WalkConfig) -> Iterator[DirectoryVisit]:
+    if config.engine == "fd":
+        yield from _iter_visits_fd(root, config)
+        return
+    visited: set[tuple[int, int]] = set()
+    frontier: list[tuple[PendingDir, int]] = [(PendingDir.for_root(root, visited), 1)]
+    while frontier:
+        if config.expired():
+            yield _unvisited(len(frontier))
+            return
+        pending, depth = frontier.pop()
+        visit = visit_directory(pending, config, leaf=depth >= config.max_depth)
+        yield visit
+        if depth < config.max_depth:
+            # Reversed so the pop order matches a depth-first walk.
+            frontier.extend(
+                (child, depth + 1)
+                for child in reversed(visit.subdirs)
+                if child.claim(visited)
+            )
+
+
+class _SharedFd:
+    """An open directory kept until each of its pending children is opened."""
+
+    __slots__ = ("fd", "users")
+
+    def __init__(self, fd: int, users: int) -> None:
+        self.fd = fd
+        self.users = users
+
+    def release(self) -> None:
+        self.users -= 1
+        if self.users == 0:
+            os.close(self.fd)
+
+
+def _iter_visits_fd(root: Path, config: WalkConfig) -> Iterator[DirectoryVisit]:
+    """``_iter_visits`` with every directory opened relative to its parent.
+
+    The walk is depth-first, so only the directories on the current branch
+    that still have children waiting are held open: at most ``max_depth``
+    descriptors.
+    """
+    visited: set[tuple[int, int]] = set()
+    frontier: list[tuple[PendingDir, int, _SharedFd | None]] = [
+        (PendingDir.for_root(root, visited), 1, None)
+    ]
+    try:
+        while frontier:
+            if config.expired():
+                yield _unvisited(len(frontier))
+                return
+            pending, depth, parent = frontier.pop()
+            leaf = depth >= config.max_depth
+            if parent is None:
+                fd = _open_dir(pending.path)
+            else:
+                fd = _open_dir(pending.path.name, parent.fd)
+                parent.release()
+            if fd is None:
+                # Gone or replaced since it was classified; the listing's
+                # entries belong to a closed descriptor, so list by path.
+                pending.listing = None
+                visit = visit_directory(pending, config, leaf=leaf)
+            else:
+                try:
+                    visit = visit_directory(pending, config, fd, leaf=leaf)
+                except BaseException:
+                    os.close(fd)
+                    raise
+            children = []
+            if depth < config.max_depth:
+                children = [
+                    child for child in reversed(visit.subdirs) if child.claim(visited)
+                ]
+            shared = None
+            if fd is not None:
+                if children:
+                    shared = _SharedFd(fd, len(children))
+                else:
+                    os.close(fd)
+            frontier.extend((child, depth + 1, shared) for child in children)
+            yield visit
+    finally:
+        for _, _, parent in frontier:
+            if parent is not None:
+                parent.release()
+
+
+def _iter_visits_parallel(
+    root: Path, config: WalkConfig, jobs: int
+) -> Iterator[DirectoryVisit]:
+    pool = ThreadPoolExecutor(max_workers=jobs)
+
+    def submit(pending: PendingDir, depth: int) -> Future[DirectoryVisit]:
+        leaf = depth >= config.max_depth
+        return pool.submit(visit_directory, pending, config, leaf=leaf)
+
+    visited: set[tuple[int, int]] = set()
+    try:
+        in_flight: dict[Future[DirectoryVisit], int] = {
+            submit(PendingDir.for_root(root, visited), 1): 1
+        }
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                depth = in_flight.pop(future)
+                visit = future.result()
+                children = []
+                if depth < config.max_depth:
+                    children = [
+                        child for child in visit.subdirs if child.claim(visited)
+                    ]
+                if config.expired():
+                    yield visit
+                    # Everything not yet consumed is dropped; the pool
+                    # shutdown below cancels what has not started.
+                    yield _unvisited(len(in_flight) + len(children))
+                    return
+                for child in children:
+                    in_flight[submit(child, depth + 1)] = depth + 1
+                yield visit
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def iter_scan(
     root: Path,
     max_depth: int = 5,
     *,
     include_artifacts: bool = False,
     deep: bool = False,
-) -> ScanDiscovery:
+    jobs: int = 1,
+    stats: ScanStats | None = None,
+    index: ScanIndex | None = None,
+    stop_at: Collection[Path] = (),
+    time_budget: float | None = None,
+    max_entries: int | None = None,
+    mount_policy: MountPolicy | None = None,
+    exclude: Iterable[str] = (),
+    engine: WalkEngine = "path",
+) -> Iterator[ScanItem]:
+    """Yield candidate environments and artifacts under ``root`` as they are found.
+
+    Environments are yielded as resolved ``Path`` objects and artifacts as
+    ``ArtifactInfo``; each is yielded at most once. Traversal uses an explicit
+    frontier, so tree depth is not bounded by the interpreter recursion limit.
+    With ``jobs > 1`` directories are listed on a thread pool and results are
+    yielded in completion order. Filesystem work is tallied into ``stats``
+    when one is given. With an ``index``, directories whose mtime matches the
+    stored record are not listed again. Directories in ``stop_at`` are still
+    classified but never descended into.
+
+    With a ``time_budget`` in seconds the walk stops once it is spent, after
+    yielding everything found so far; the directories left unvisited are
+    counted in ``stats.directories_unvisited``. With ``max_entries`` at most
+    that many entries are read from any one directory; directories cut short
+    are recorded in ``stats.truncated_directories``. A ``mount_policy`` keeps
+    the walk out of mounts it rejects. Directories and artifacts matching an
+    ``exclude`` glob are pruned; ``stats.pruned_by_rule`` counts them per glob.
+    ``engine="fd"`` walks with descriptor-relative syscalls, sequentially.
+    """
+    _check_engine(engine, jobs)
     root = root.resolve()
-    found: list[Path] = []
-    artifacts: list[ArtifactInfo] = []
+    config = walk_config(
+        max_depth,
+        include_artifacts=include_artifacts,
+        deep=deep,
+        index=index,
+        time_budget=time_budget,
+        max_entries=max_entries,
+        exclude=exclude,
+        engine=engine,
+    ).for_root(root, stop_at=stop_at, mount_policy=mount_policy, mounts=read_mounts())
+    yield from _iter_root(root, config, jobs, stats)
+
+
+def _check_engine(engine: WalkEngine, jobs: int) -> None:
+    if engine != "fd":
+        return
+    if not FD_ENGINE_AVAILABLE:
+        raise ValueError("The fd engine is not supported on this platform")
+    if jobs > 1:
+        raise ValueError("The fd engine walks sequentially; use jobs=1")
+
+
+def _iter_root(
+    root: Path, config: WalkConfig, jobs: int, stats: ScanStats | None
+) -> Iterator[ScanItem]:
+    if jobs > 1:
+        visits = _iter_visits_parallel(root, config, jobs)
+    else:
+        visits = _iter_visits(root, config)
+
+    for visit in visits:
+        if stats is not None:
+            stats.merge(visit.stats)
+        # Each directory is visited at most once, so nothing repeats here.
+        yield from visit.artifacts
+        yield from visit.environments
+
+
+def collapse_roots(roots: Iterable[Path]) -> list[Path]:
+    """Resolve ``roots`` and drop duplicates, keeping the first occurrence."""
+    collapsed: list[Path] = []
+    for root in roots:
+        resolved = root.resolve()
+        if resolved not in collapsed:
+            collapsed.append(resolved)
+    return collapsed
+
+
+def root_device(root: Path) -> int | None:
+    """The device ``root`` is on, or ``None`` when it cannot be stat'ed."""
+    try:
+        return os.stat(root).st_dev
+    except OSError:
+        return None
+
+
+@dataclass(slots=True)
+class _RootDone:
+    root_scan: RootScan
+    stats: ScanStats
+
+
+_WORKER_DONE = object()
+
+
+def iter_scan_roots(
+    roots: Iterable[Path],
+    max_depth: int = 5,
+    *,
+    include_artifacts: bool = False,
+    deep: bool = False,
+    jobs: int = 1,
+    stats: ScanStats | None = None,
+    index: ScanIndex | None = None,
+    root_scans: list[RootScan] | None = None,
+    time_budget: float | None = None,
+    max_entries: int | None = None,
+    mount_policy: MountPolicy | None = None,
+    exclude: Iterable[str] = (),
+    engine: WalkEngine = "path",
+) -> Iterator[ScanItem]:
+    """``iter_scan`` over several roots, walking each directory at most once.
+
+    Duplicate roots are dropped and a root nested inside another is pruned
+    from the outer walk, so it is only walked once, with its own depth limit.
+    Roots on different devices are walked concurrently. One ``RootScan`` per
+    walked root is appended to ``root_scans`` when given. ``time_budget``
+    covers all roots together; roots not started in time count as one
+    unvisited directory each.
+    """
+    _check_engine(engine, jobs)
+    config = walk_config(
+        max_depth,
+        include_artifacts=include_artifacts,
+        deep=deep,
+        index=index,
+        time_budget=time_budget,
+        max_entries=max_entries,
+        exclude=exclude,
+        engine=engine,
+    )
+    collapsed = collapse_roots(roots)
+    mounts = read_mounts()
+    by_device: dict[int | None, list[Path]] = {}
+    for root in collapsed:
+        by_device.setdefault(root_device(root), []).append(root)
+
+    def walk_root(root: Path) -> Iterator[ScanItem | _RootDone]:
+        nested = frozenset(other for other in collapsed if root in other.parents)
+        root_stats = ScanStats()
+        start = time.perf_counter()
+        if config.expired():
+            root_stats.directories_unvisited = 1
+        else:
+            root_config = config.for_root(
+                root, stop_at=nested, mount_policy=mount_policy, mounts=mounts
+            )
+            yield from _iter_root(root, root_config, jobs, root_stats)
+        root_scan = RootScan(
+            path=root,
+            duration_seconds=time.perf_counter() - start,
+            device=root_device(root),
+        )
+        yield _RootDone(root_scan, root_stats)
+
+    def walk_group(group: list[Path]) -> Iterator[ScanItem | _RootDone]:
+        for root in group:
+            yield from walk_root(root)
+
+    groups = list(by_device.values())
+    if len(groups) == 1:
+        items = walk_group(groups[0])
+    else:
+        items = _interleave_threads([walk_group(group) for group in groups])
+
     seen: set[Path] = set()
-    seen_artifacts: set[Path] = set()
+    for item in items:
+        if isinstance(item, _RootDone):
+            if stats is not None:
+                stats.merge(item.stats)
+            if root_scans is not None:
+                root_scans.append(item.root_scan)
+            continue
+        key = item.path if isinstance(item, ArtifactInfo) else item
+        if key in seen:
+            continue
+        seen.add(key)
+        yield item
 
-    def walk(current: Path, depth: int) -> None:
-        if depth > max_depth:
-            return
 
-        try:
-            with os.scandir(current) as it:
-                entries = list(it)
-        except OSError:
-            return
+def _interleave_threads(
+    producers: list[Iterator[ScanItem | _RootDone]],
+) -> Iterator[ScanItem | _RootDone]:
+    """Drain each producer on its own thread and yield items as they arrive."""
+    results: queue.Queue[object] = queue.Queue(maxsize=1024)
+    stop = threading.Event()
 
-        for entry in entries:
-            if include_artifacts:
-                artifact = match_artifact(entry, current)
-                if artifact is not None:
-                    if artifact.path not in seen_artifacts:
-                        if deep:
-                            artifact.size_bytes = calculate_path_size(artifact.path)
-                        seen_artifacts.add(artifact.path)
-                        artifacts.append(artifact)
-                    if entry.is_dir(follow_symlinks=False):
+    def drain(producer: Iterator[ScanItem | _RootDone]) -> None:
+        try:
+            for item in producer:
+                while not stop.is_set():
+                    try:
+                        results.put(item, timeout=0.1)
+                        break
+                    except queue.Full:
                         continue
+                if stop.is_set():
+                    return
+        except BaseException as exc:  # forwarded to the consumer
+            results.put(exc)
+        finally:
+            results.put(_WORKER_DONE)
 
-            if not entry.is_dir(follow_symlinks=False):
+    threads = [
+        threading.Thread(target=drain, args=(producer,), daemon=True)
+        for producer in producers
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        remaining = len(threads)
+        while remaining:
+            item = results.get()
+            if item is _WORKER_DONE:
+                remaining -= 1
+            elif isinstance(item, BaseException):
+                raise item
+            else:
+                yield cast(ScanItem | _RootDone, item)
+    finally:
+        stop.set()
+        while any(thread.is_alive() for thread in threads):
+            try:
+                results.get(timeout=0.1)
+            except queue.Empty:
                 continue
 
-            name = entry.name
-            if _should_skip(name):
-                continue
 
-            dir_path = Path(entry.path)
-            is_candidate = (
-                name in TARGET_DIR_NAMES
-                or (dir_path / "pyvenv.cfg").is_file()
-                or (dir_path / "conda-meta").is_dir()
-            )
+def iter_sized(
+    items: Iterable[ScanItem],
+    *,
+    stats: ScanStats | None = None,
+    links: LinkTally | None = None,
+    workers: int = SIZE_WORKERS,
+) -> Iterator[ScanItem]:
+    """Yield ``items`` with every artifact sized on a ``SizePipeline``.
 
-            is_env = quick_is_environment_dir(dir_path)
-            if is_candidate or is_env:
-                resolved = dir_path.resolve()
-                if resolved not in seen:
-                    seen.add(resolved)
-                    found.append(resolved)
-                if is_env:
-                    continue
+    ``items`` comes from a walk made without ``deep``: artifacts are sized by
+    ``workers`` threads while the walk goes on, instead of stopping it, and
+    are yielded once their sizes are in. Environments pass straight through.
+    Sizing work is merged into ``stats`` and shared hard links into ``links``.
+    """
+    with SizePipeline[_SizedArtifact](workers) as pipeline:
+        for item in items:
+            if isinstance(item, ArtifactInfo):
+                pipeline.submit(partial(_sized, item))
+            else:
+                yield item
+            yield from _finished(pipeline.completed(), stats, links)
+        yield from _finished(pipeline.drain(), stats, links)
+
+
+_SizedArtifact: TypeAlias = tuple[ArtifactInfo, ScanStats, LinkTally]
 
-            walk(dir_path, depth + 1)
 
-    walk(root, 1)
+def _sized(artifact: ArtifactInfo) -> _SizedArtifact:
+    links = LinkTally()
+    return artifact, size_artifact(artifact, links), links
+
+
+def _finished(
+    results: Iterator[_SizedArtifact],
+    stats: ScanStats | None,
+    links: LinkTally | None,
+) -> Iterator[ArtifactInfo]:
+    for artifact, artifact_stats, artifact_links in results:
+        if stats is not None:
+            stats.merge(artifact_stats)
+        if links is not None:
+            links.merge(artifact_links)
+        yield artifact
+
+
+def _sorted_discovery(
+    items: Iterable[ScanItem],
+    stats: ScanStats,
+    roots: list[RootScan],
+    links: LinkTally,
+) -> ScanDiscovery:
+    found: list[Path] = []
+    artifacts: list[ArtifactInfo] = []
+    for item in items:
+        if isinstance(item, ArtifactInfo):
+            artifacts.append(item)
+        else:
+            found.append(item)
+
     return ScanDiscovery(
         environments=sorted(found),
         artifacts=sorted(artifacts, key=lambda item: str(item.path)),
+        stats=stats,
+        roots=sorted(roots, key=lambda item: str(item.path)),
+        links=links,
+    )
+
+
+def scan(
+    root: Path,
+    max_depth: int = 5,
+    *,
+    include_artifacts: bool = False,
+    deep: bool = False,
+    jobs: int = 1,
+    index: ScanIndex | None = None,
+    time_budget: float | None = None,
+    max_entries: int | None = None,
+    mount_policy: MountPolicy | None = None,
+    exclude: Iterable[str] = (),
+    engine: WalkEngine = "path",
+) -> ScanDiscovery:
+    """Walk ``root`` and collect candidate environments and artifacts.
+
+    With ``jobs > 1`` directories are listed on a thread pool so that several
+    ``scandir`` calls are in flight at once; the result is identical to the
+    sequential walk. With a ``time_budget`` in seconds the walk stops early and
+    the discovery is marked ``partial``; ``max_entries`` caps the entries read
+    per directory, ``mount_policy`` decides which mounts are entered and
+    ``exclude`` globs prune matching directories and artifacts. With ``deep``
+    artifacts are sized by ``iter_sized`` while the walk continues.
+    """
+    stats = ScanStats()
+    items = iter_scan(
+        root,
+        max_depth,
+        include_artifacts=include_artifacts,
+        jobs=jobs,
+        stats=stats,
+        index=index,
+        time_budget=time_budget,
+        max_entries=max_entries,
+        mount_policy=mount_policy,
+        exclude=exclude,
+        engine=engine,
+    )
+    links = LinkTally()
+    if deep:
+        items = iter_sized(items, stats=stats, links=links)
+    return _sorted_discovery(items, stats, [], links)
+
+
+def scan_roots(
+    roots: Iterable[Path],
+    max_depth: int = 5,
+    *,
+    include_artifacts: bool = False,
+    deep: bool = False,
+    jobs: int = 1,
+    index: ScanIndex | None = None,
+    time_budget: float | None = None,
+    max_entries: int | None = None,
+    mount_policy: MountPolicy | None = None,
+    exclude: Iterable[str] = (),
+    engine: WalkEngine = "path",
+) -> ScanDiscovery:
+    """Walk several roots into one discovery with per-root timings."""
+    stats = ScanStats()
+    root_scans: list[RootScan] = []
+    items = iter_scan_roots(
+        roots,
+        max_depth,
+        include_artifacts=include_artifacts,
+        jobs=jobs,
+        stats=stats,
+        index=index,
+        root_scans=root_scans,
+        time_budget=time_budget,
+        max_entries=max_entries,
+        mount_policy=mount_policy,
+        exclude=exclude,
+        engine=engine,
     )
+    links = LinkTally()
+    if deep:
+        items = iter_sized(items, stats=stats, links=links)
+    return _sorted_discovery(items, stats, root_scans, links)
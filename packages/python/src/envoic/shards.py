@@ -0,0 +1,308 @@
+"""Scanning on a process pool, for trees too large for one interpreter.
+
+Walking, artifact matching and detection are mostly Python-level work, so
+threads stop scaling once the GIL is saturated. Here the parent lists the
+top level of each root and hands every subdirectory to a worker process as
+a shard. A worker walks its shard and detects the environments in it until
+it has visited ``split_after`` directories, then returns what is left of its
+frontier; the parent splits that into new shards for idle workers, so one
+huge subtree is spread over the whole pool instead of pinning a single
+process.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .detector import detect_environment, is_reported
+from .models import ArtifactInfo, EnvInfo, RootScan, ScanStats
+from .mounts import MountPolicy, read_mounts
+from .scanner import (
+    DirectoryVisit,
+    PendingDir,
+    WalkConfig,
+    collapse_roots,
+    root_device,
+    visit_directory,
+    walk_config,
+)
+from .sizing import LinkTally
+from .utils import io_delta, read_proc_io
+
+# Directories a worker visits before handing the rest of its shard back.
+SPLIT_AFTER = 2000
+# Shards created per worker process whenever a frontier is split up.
+_SHARDS_PER_PROCESS = 4
+
+
+@dataclass(frozen=True, slots=True)
+class _Seed:
+    path: Path
+    depth: int
+    key: tuple[int, int] | None
+
+
+@dataclass(frozen=True, slots=True)
+class _Shard:
+    root_id: int
+    seeds: tuple[_Seed, ...]
+
+
+@dataclass(slots=True)
+class _ShardResult:
+    root_id: int
+    environments: list[EnvInfo] = field(default_factory=list)
+    artifacts: list[ArtifactInfo] = field(default_factory=list)
+    stats: ScanStats = field(default_factory=ScanStats)
+    links: LinkTally = field(default_factory=LinkTally)
+    leftover: list[_Seed] = field(default_factory=list)
+
+
+@dataclass(frozen=True, slots=True)
+class _Detection:
+    deep: bool
+    stale_days: int
+    include_dotenv: bool
+
+
+@dataclass(frozen=True, slots=True)
+class _WorkerState:
+    configs: tuple[WalkConfig, ...]
+    detection: _Detection
+    split_after: int
+
+
+_worker: _WorkerState | None = None
+
+
+def _init_worker(state: _WorkerState) -> None:
+    global _worker
+    _worker = state
+
+
+def _detect(
+    paths: Iterable[Path], detection: _Detection, stats: ScanStats, links: LinkTally
+) -> list[EnvInfo]:
+    envs: list[EnvInfo] = []
+    for path in paths:
+        env = detect_environment(
+            path,
+            deep=detection.deep,
+            stale_days=detection.stale_days,
+            include_dotenv=detection.include_dotenv,
+            stats=stats,
+            links=links,
+        )
+        if is_reported(env, include_dotenv=detection.include_dotenv):
+            envs.append(env)
+    return envs
+
+
+def _collect(visit: DirectoryVisit, result: _ShardResult, state: _WorkerState) -> None:
+    result.stats.merge(visit.stats)
+    result.links.merge(visit.links)
+    result.artifacts.extend(visit.artifacts)
+    result.environments.extend(
+        _detect(visit.environments, state.detection, result.stats, result.links)
+    )
+
+
+def _walk_shard(shard: _Shard) -> _ShardResult:
+    """Walk ``shard`` depth-first in a worker, stopping after ``split_after``."""
+    assert _worker is not None, "worker process was not initialised"
+    state = _worker
+    config = state.configs[shard.root_id]
+    result = _ShardResult(shard.root_id)
+    io_before = read_proc_io()
+    visited = {seed.key for seed in shard.seeds if seed.key is not None}
+    frontier = [
+        (PendingDir(seed.path, key=seed.key), seed.depth)
+        for seed in reversed(shard.seeds)
+    ]
+    walked = 0
+    while frontier:
+        if config.expired():
+            result.stats.directories_unvisited += len(frontier)
+            break
+        if walked >= state.split_after:
+            # Listings taken while classifying hold ``DirEntry`` objects that
+            # cannot be pickled, so each handed-back directory is relisted.
+            result.leftover = [
+                _Seed(pending.path, depth, pending.key) for pending, depth in frontier
+            ]
+            break
+        pending, depth = frontier.pop()
+        visit = visit_directory(pending, config, leaf=depth >= config.max_depth)
+        walked += 1
+        _collect(visit, result, state)
+        if depth < config.max_depth:
+            frontier.extend(
+                (child, depth + 1)
+                for child in reversed(visit.subdirs)
+                if child.claim(visited)
+            )
+    result.stats.io = io_delta(io_before, read_proc_io())
+    return result
+
+
+def _split(root_id: int, seeds: list[_Seed], parts: int) -> list[_Shard]:
+    size = max(1, -(-len(seeds) // parts))
+    return [
+        _Shard(root_id, tuple(seeds[start : start + size]))
+        for start in range(0, len(seeds), size)
+    ]
+
+
+def iter_scan_processes(
+    roots: Iterable[Path],
+    max_depth: int = 5,
+    *,
+    processes: int | None = None,
+    include_artifacts: bool = False,
+    deep: bool = False,
+    stale_days: int = 90,
+    include_dotenv: bool = False,
+    stats: ScanStats | None = None,
+    links: LinkTally | None = None,
+    root_scans: list[RootScan] | None = None,
+    time_budget: float | None = None,
+    max_entries: int | None = None,
+    mount_policy: MountPolicy | None = None,
+    exclude: Iterable[str] = (),
+    split_after: int = SPLIT_AFTER,
+) -> Iterator[EnvInfo | ArtifactInfo]:
+    """Scan ``roots`` and detect environments on ``processes`` worker processes.
+
+    Yields detected ``EnvInfo`` objects, already filtered like the CLI does,
+    and ``ArtifactInfo`` objects in completion order. ``processes`` defaults
+    to the number of CPUs. The remaining options mean what they mean for
+    ``scanner.iter_scan_roots``; there is no scan index, because the index
+    is a single SQLite connection that worker processes cannot share. With
+    ``deep``, hard links shared between sized trees are pooled into ``links``.
+    """
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if processes < 1:
+        raise ValueError("processes must be at least 1")
+    if split_after < 1:
+        raise ValueError("split_after must be at least 1")
+
+    # perf_counter is system-wide on every supported platform, so workers
+    # can compare against a deadline taken in the parent.
+    base = walk_config(
+        max_depth,
+        include_artifacts=include_artifacts,
+        deep=deep,
+        time_budget=time_budget,
+        max_entries=max_entries,
+        exclude=exclude,
+    )
+    collapsed = collapse_roots(roots)
+    mounts = read_mounts()
+    configs = tuple(
+        base.for_root(
+            root,
+            stop_at=[other for other in collapsed if root in other.parents],
+            mount_policy=mount_policy,
+            mounts=mounts,
+        )
+        for root in collapsed
+    )
+    detection = _Detection(deep, stale_days, include_dotenv)
+    state = _WorkerState(configs, detection, split_after)
+    run_stats = ScanStats() if stats is None else stats
+    run_links = LinkTally() if links is None else links
+
+    # Top levels are walked here; everything below them goes to the pool.
+    visited: set[tuple[int, int]] = set()
+    # When each root's top level was listed; its shards finish later.
+    started = [0.0] * len(collapsed)
+    outstanding = [0] * len(collapsed)
+    seen: set[Path] = set()
+
+    def fresh(item: EnvInfo | ArtifactInfo) -> bool:
+        if item.path in seen:
+            return False
+        seen.add(item.path)
+        return True
+
+    def finish(root_id: int) -> None:
+        if root_scans is None:
+            return
+        root = collapsed[root_id]
+        root_scans.append(
+            RootScan(
+                path=root,
+                duration_seconds=time.perf_counter() - started[root_id],
+                device=root_device(root),
+            )
+        )
+
+    pool = ProcessPoolExecutor(
+        max_workers=processes, initializer=_init_worker, initargs=(state,)
+    )
+    in_flight: set[Future[_ShardResult]] = set()
+
+    def submit(root_id: int, seeds: list[_Seed]) -> None:
+        for shard in _split(root_id, seeds, processes * _SHARDS_PER_PROCESS):
+            in_flight.add(pool.submit(_walk_shard, shard))
+            outstanding[root_id] += 1
+
+    try:
+        for root_id, root in enumerate(collapsed):
+            started[root_id] = time.perf_counter()
+            config = configs[root_id]
+            if config.expired():
+                run_stats.directories_unvisited += 1
+                finish(root_id)
+                continue
+            visit = visit_directory(
+                PendingDir.for_root(root, visited), config, leaf=config.max_depth <= 1
+            )
+            run_stats.merge(visit.stats)
+            run_links.merge(visit.links)
+            yield from filter(fresh, visit.artifacts)
+            yield from filter(
+                fresh, _detect(visit.environments, detection, run_stats, run_links)
+            )
+            seeds = []
+            if config.max_depth > 1:
+                seeds = [
+                    _Seed(child.path, 2, child.key)
+                    for child in visit.subdirs
+                    if child.claim(visited)
+                ]
+            if seeds:
+                submit(root_id, seeds)
+            else:
+                finish(root_id)
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                in_flight.remove(future)
+                result = future.result()
+                run_stats.merge(result.stats)
+                run_links.merge(result.links)
+                yield from filter(fresh, result.artifacts)
+                yield from filter(fresh, result.environments)
+                # Shards walk independently, so a directory reached from two
+                # of them is claimed here before it is handed out again.
+                leftover = [
+                    seed
+                    for seed in result.leftover
+                    if seed.key is None or seed.key not in visited
+                ]
+                visited.update(seed.key for seed in leftover if seed.key is not None)
+                if leftover:
+                    submit(result.root_id, leftover)
+                outstanding[result.root_id] -= 1
+                if outstanding[result.root_id] == 0:
+                    finish(result.root_id)
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,271 @@
+"""Disk usage of a tree, measured with one ``lstat`` per entry.
+
+Used for environment sizes, artifact sizes and deletion totals, so that all
+three agree. The walk is an explicit stack of ``os.scandir`` calls on plain
+strings: directory types come from the listing itself, and each entry is
+stat'ed once through ``DirEntry.stat(follow_symlinks=False)`` without
+building a ``Path``. Symlinks are counted as links and never followed.
+
+Files with several hard links (uv and ``pip --link-mode=hardlink`` link
+environments to a shared cache) are counted in full in the apparent size,
+but only count as exclusive when every link to them lies inside the tree:
+deleting the tree frees nothing else.
+"""
+
+from __future__ import annotations
+
+import os
+import stat
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import TracebackType
+from typing import Generic, TypeVar
+
+from .models import ScanStats
+
+T = TypeVar("T")
+
+# Identity of a file across hard links: (st_dev, st_ino).
+FileKey = tuple[int, int]
+
+# Threads sizing ``--deep`` results while the walk goes on. Sizing is
+# syscall bound and releases the GIL, so a few threads overlap well even
+# with the walk sharing the interpreter.
+SIZE_WORKERS = 4
+# ``LinkTally`` group of environments; artifacts are grouped by pattern.
+ENVIRONMENT_LINKS = "environments"
+
+
+@dataclass(slots=True)
+class DiskUsage:
+    """What a tree occupies.
+
+    ``apparent_bytes`` sums ``st_size`` of files and symlinks, the number
+    ``ls -l`` shows. ``allocated_bytes`` sums ``st_blocks * 512`` of every
+    entry including directories, about what ``du`` shows; it is smaller for
+    sparse or compressed files and larger for many tiny ones. Where ``st_blocks``
+    does not exist (Windows) it falls back to ``st_size``.
+
+    ``exclusive_bytes`` is the apparent size of the files whose every hard
+    link is inside the tree, each counted once: what deleting the tree
+    frees. It equals ``apparent_bytes`` unless files are linked elsewhere
+    or more than once within the tree.
+    """
+
+    apparent_bytes: int = 0
+    allocated_bytes: int = 0
+    exclusive_bytes: int = 0
+    files: int = 0
+    directories: int = 0
+    errors: int = 0
+    # Files with links outside the tree: [st_nlink, links seen, st_size].
+    # Pooled across trees by ``LinkTally`` to find what they free together.
+    partial_links: dict[FileKey, list[int]] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+
+
+def _allocated(st: os.stat_result) -> int:
+    blocks: int | None = getattr(st, "st_blocks", None)
+    return st.st_size if blocks is None else blocks * 512
+
+
+def disk_usage(path: Path | str, stats: ScanStats | None = None) -> DiskUsage:
+    """Measure ``path``, a directory tree, a file or a symlink.
+
+    Unreadable entries are skipped and counted in ``errors``. With ``stats``,
+    stat calls, skipped errors and apparent bytes are tallied into it.
+    """
+    usage = DiskUsage()
+    stat_calls = 1
+    try:
+        top = os.lstat(path)
+    except OSError:
+        usage.errors += 1
+        _tally(stats, usage, stat_calls)
+        return usage
+    usage.allocated_bytes += _allocated(top)
+    if not stat.S_ISDIR(top.st_mode):
+        usage.files += 1
+        usage.apparent_bytes += top.st_size
+        if top.st_nlink <= 1:
+            usage.exclusive_bytes += top.st_size
+        else:
+            key = (top.st_dev, top.st_ino)
+            usage.partial_links[key] = [top.st_nlink, 1, top.st_size]
+        _tally(stats, usage, stat_calls)
+        return usage
+
+    usage.directories += 1
+    linked = usage.partial_links
+    pending = [os.fspath(path)]
+    while pending:
+        try:
+            listing = os.scandir(pending.pop())
+        except OSError:
+            usage.errors += 1
+            continue
+        with listing:
+            for entry in listing:
+                stat_calls += 1
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    usage.errors += 1
+                    continue
+                usage.allocated_bytes += _allocated(st)
+                if is_dir:
+                    usage.directories += 1
+                    pending.append(entry.path)
+                    continue
+                usage.files += 1
+                usage.apparent_bytes += st.st_size
+                # st_nlink is 0 where the platform does not report it.
+                if st.st_nlink <= 1:
+                    usage.exclusive_bytes += st.st_size
+                    continue
+                key = (st.st_dev, st.st_ino)
+                seen = linked.get(key)
+                if seen is None:
+                    linked[key] = [st.st_nlink, 1, st.st_size]
+                else:
+                    seen[1] += 1
+    for key, (links, found, size) in list(linked.items()):
+        if found >= links:
+            usage.exclusive_bytes += size
+            del linked[key]
+    _tally(stats, usage, stat_calls)
+    return usage
+
+
+def _tally(stats: ScanStats | None, usage: DiskUsage, stat_calls: int) -> None:
+    if stats is None:
+        return
+    stats.stat_calls += stat_calls
+    stats.errors_suppressed += usage.errors
+    stats.bytes_sized += usage.apparent_bytes
+
+
+@dataclass(slots=True)
+class LinkTally:
+    """Hard links pooled over several measured trees, per group.
+
+    Each tree's ``exclusive_bytes`` misses files it shares only with other
+    trees: two environments hard-linked to each other each free nothing
+    alone, but everything together. Adding every ``DiskUsage`` of a group
+    (the environments of a scan, the artifacts of one pattern, a deletion
+    selection) lets ``shared_bytes`` count those files once. Tallies are
+    merged like ``ScanStats``, so each sizing thread or process keeps its own.
+    """
+
+    groups: dict[str, dict[FileKey, list[int]]] = field(default_factory=dict)
+
+    def add(self, usage: DiskUsage, group: str = "") -> None:
+        self._pool(group, usage.partial_links)
+
+    def merge(self, other: LinkTally) -> None:
+        for group, links in other.groups.items():
+            self._pool(group, links)
+
+    def _pool(self, group: str, links: dict[FileKey, list[int]]) -> None:
+        pooled = self.groups.setdefault(group, {})
+        for key, (count, seen, size) in links.items():
+            entry = pooled.get(key)
+            if entry is None:
+                pooled[key] = [count, seen, size]
+            else:
+                entry[1] += seen
+
+    def shared_bytes(self, group: str = "") -> int:
+        """Bytes freed only by deleting the trees of ``group`` together.
+
+        Add this to the sum of their ``exclusive_bytes`` for the group total.
+        """
+        return sum(
+            size
+            for links, seen, size in self.groups.get(group, {}).values()
+            if seen >= links
+        )
+
+    def retained_bytes(self, group: str = "") -> int:
+        """Bytes of the group's files that stay on disk, linked from elsewhere."""
+        return sum(
+            size
+            for links, seen, size in self.groups.get(group, {}).values()
+            if seen < links
+        )
+
+
+def combined_exclusive_bytes(usages: Iterable[DiskUsage]) -> int:
+    """What deleting every tree of ``usages`` together frees.
+
+    Unlike summing their ``exclusive_bytes``, this counts the files that are
+    hard-linked only between these trees.
+    """
+    links = LinkTally()
+    total = 0
+    for usage in usages:
+        total += usage.exclusive_bytes
+        links.add(usage)
+    return total + links.shared_bytes()
+
+
+class SizePipeline(Generic[T]):
+    """Bounded pool that runs sizing tasks while the caller keeps walking.
+
+    The walker ``submit``s a task per environment or artifact and collects
+    whatever has finished with ``completed`` after each one, so discovery
+    never waits on a large tree being sized. Once ``backlog`` tasks are
+    unfinished, ``submit`` blocks until one completes, which bounds memory
+    and throttles the walk to the speed of sizing. ``drain`` waits for the
+    rest. Results come back in completion order.
+    """
+
+    def __init__(self, workers: int = SIZE_WORKERS, *, backlog: int | None = None):
+        self._pool = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="envoic-size"
+        )
+        self._backlog = backlog or 4 * workers
+        self._in_flight: set[Future[T]] = set()
+
+    def __enter__(self) -> SizePipeline[T]:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def submit(self, task: Callable[[], T]) -> None:
+        if len(self._in_flight) >= self._backlog:
+            wait(self._in_flight, return_when=FIRST_COMPLETED)
+        self._in_flight.add(self._pool.submit(task))
+
+    def completed(self) -> Iterator[T]:
+        """Results of the tasks finished so far, without waiting."""
+        done = [future for future in self._in_flight if future.done()]
+        self._in_flight.difference_update(done)
+        for future in done:
+            yield future.result()
+
+    def drain(self) -> Iterator[T]:
+        """Results of every remaining task, as each finishes."""
+        for future in as_completed(list(self._in_flight)):
+            self._in_flight.discard(future)
+            yield future.result()
+
+    def close(self) -> None:
+        """Stop the workers, dropping tasks that have not started."""
+        self._pool.shutdown(wait=True, cancel_futures=True)
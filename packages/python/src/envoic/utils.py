@@ -4,6 +4,7 @@ from datetime import UTC, datetime
 from pathlib import Path
 
 VENV_DIR_NAMES = {".env", ".venv", "env", "venv", ".virtualenv", "virtualenv"}
+PROC_IO_PATH = Path("/proc/self/io")
 
 
 def format_env_display_path(env_path: Path, scan_root: Path) -> str:
@@ -80,3 +81,27 @@ def shorten_path(path: Path, max_len: int = 36) -> str:
     prefix = keep // 2
     suffix = keep - prefix
     return f"{text[:prefix]}...{text[-suffix:]}"
+
+
+def read_proc_io(path: Path = PROC_IO_PATH) -> dict[str, int] | None:
+    """I/O counters of this process, or ``None`` where ``/proc`` lacks them."""
+    try:
+        text = path.read_text(encoding="ascii")
+    except OSError:
+        return None
+    counters: dict[str, int] = {}
+    for line in text.splitlines():
+        name, _, value = line.partition(":")
+        try:
+            counters[name.strip()] = int(value)
+        except ValueError:
+            continue
+    return counters
+
+
+def io_delta(
+    before: dict[str, int] | None, after: dict[str, int] | None
+) -> dict[str, int]:
+    if before is None or after is None:
+        return {}
+    return {name: value - before.get(name, 0) for name, value in after.items()}
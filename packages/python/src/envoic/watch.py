@@ -0,0 +1,400 @@
+"""Keep an environment and artifact inventory live with Linux inotify."""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import time
+from collections.abc import Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Literal, TypeVar
+
+from .detector import ENV_LISTING_NAMES, detect_environment, is_reported
+from .models import ArtifactInfo, EnvInfo
+from .mounts import MountPolicy, read_mounts
+from .scanner import DirectoryVisit, PendingDir, visit_directory, walk_config
+
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+WATCH_MASK = (
+    IN_CREATE
+    | IN_DELETE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+)
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+WatchAction = Literal["added", "removed"]
+
+_Item = TypeVar("_Item", EnvInfo, ArtifactInfo)
+
+
+@dataclass(slots=True)
+class InotifyEvent:
+    wd: int
+    mask: int
+    cookie: int
+    name: str
+
+
+class Inotify:
+    """Minimal ctypes binding for the Linux inotify API."""
+
+    def __init__(self) -> None:
+        libc_name = ctypes.util.find_library("c")
+        try:
+            libc = ctypes.CDLL(libc_name, use_errno=True)
+            self._init1 = libc.inotify_init1
+            self._add_watch = libc.inotify_add_watch
+            self._rm_watch = libc.inotify_rm_watch
+        except (OSError, AttributeError) as exc:
+            raise OSError("inotify is not available on this platform") from exc
+
+        self._init1.argtypes = [ctypes.c_int]
+        self._init1.restype = ctypes.c_int
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._add_watch.restype = ctypes.c_int
+        self._rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        self._rm_watch.restype = ctypes.c_int
+
+        fd = self._init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self.fd = fd
+
+    def add_watch(self, path: Path, mask: int = WATCH_MASK) -> int:
+        wd = self._add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), str(path))
+        return int(wd)
+
+    def rm_watch(self, wd: int) -> None:
+        # The kernel may already have dropped the watch (IN_IGNORED).
+        self._rm_watch(self.fd, wd)
+
+    def read_events(self, timeout: float | None) -> list[InotifyEvent]:
+        """Wait up to ``timeout`` seconds and return all queued events."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+
+        events: list[InotifyEvent] = []
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            except OSError as exc:
+                if exc.errno == errno.EINTR:
+                    continue
+                raise
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                wd, mask, cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                raw_name = data[offset : offset + length].rstrip(b"\0")
+                offset += length
+                events.append(InotifyEvent(wd, mask, cookie, os.fsdecode(raw_name)))
+        return events
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+@dataclass(slots=True)
+class WatchEvent:
+    action: WatchAction
+    item: EnvInfo | ArtifactInfo
+
+    @property
+    def kind(self) -> Literal["environment", "artifact"]:
+        return "artifact" if isinstance(self.item, ArtifactInfo) else "environment"
+
+
+@dataclass(slots=True)
+class _WatchedDir:
+    depth: int
+    visit: DirectoryVisit
+    wd: int | None = None
+    children: set[Path] = field(default_factory=set)
+
+
+def _changes(
+    before: dict[Path, _Item | None], after: dict[Path, _Item]
+) -> tuple[list[WatchEvent], list[WatchEvent]]:
+    """Removed and added events for the ``before`` paths, in path order."""
+    removed: list[WatchEvent] = []
+    added: list[WatchEvent] = []
+    for path in sorted(before):
+        old, new = before[path], after.get(path)
+        if old is not None and new is None:
+            removed.append(WatchEvent("removed", old))
+        elif old is None and new is not None:
+            added.append(WatchEvent("added", new))
+    return removed, added
+
+
+class InventoryWatcher:
+    """Initial scan plus inotify-driven incremental updates under ``root``.
+
+    Every directory the scanner descends into is watched. When its entries
+    change only that directory is listed again; new subdirectories are walked
+    and vanished ones are forgotten, and only those directories are folded
+    back into the inventory. ``exclude`` globs and ``mount_policy`` prune the
+    tree as they do for a scan. Environment directories themselves are
+    not descended into, so edits inside an existing environment are not
+    reported; its creation and removal are. With ``jobs > 1`` new subtrees,
+    including the whole tree at start, are walked on a thread pool.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        max_depth: int = 5,
+        *,
+        include_artifacts: bool = True,
+        include_dotenv: bool = False,
+        stale_days: int = 90,
+        settle_seconds: float = 0.1,
+        mount_policy: MountPolicy | None = None,
+        exclude: Iterable[str] = (),
+        jobs: int = 1,
+    ) -> None:
+        if jobs < 1:
+            raise ValueError("jobs must be at least 1")
+        self.root = root.resolve()
+        self.max_depth = max_depth
+        self.include_artifacts = include_artifacts
+        self.include_dotenv = include_dotenv
+        self.stale_days = stale_days
+        self.settle_seconds = settle_seconds
+        self.environments: dict[Path, EnvInfo] = {}
+        self.artifacts: dict[Path, ArtifactInfo] = {}
+        self.watch_errors = 0
+        self._inotify = Inotify()
+        self._dirs: dict[Path, _WatchedDir] = {}
+        self._by_wd: dict[int, Path] = {}
+        # Every candidate path currently listed, reported as an environment or not.
+        self._candidates: set[Path] = set()
+        # Directories walked, relisted or forgotten since the last sync, and
+        # the candidate and artifact paths each directory held at that sync.
+        self._changed: set[Path] = set()
+        self._synced: dict[Path, tuple[frozenset[Path], frozenset[Path]]] = {}
+        self._config = walk_config(
+            max_depth, include_artifacts=include_artifacts, exclude=exclude
+        ).for_root(self.root, mount_policy=mount_policy, mounts=read_mounts())
+        self._pool = ThreadPoolExecutor(max_workers=jobs) if jobs > 1 else None
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+        self._inotify.close()
+
+    def start(self) -> list[WatchEvent]:
+        """Run the initial scan, install watches and report the initial inventory."""
+        self._walk(PendingDir(self.root), 1)
+        return self._sync_inventory(redetect=set())
+
+    def poll(self, timeout: float | None = None) -> list[WatchEvent]:
+        """Wait for filesystem changes and return the resulting inventory events."""
+        raw = self._inotify.read_events(timeout)
+        if not raw:
+            return []
+        # Let a burst (``python -m venv``, ``pip install``) settle into one batch.
+        deadline = time.monotonic() + self.settle_seconds
+        while (remaining := deadline - time.monotonic()) > 0:
+            more = self._inotify.read_events(remaining)
+            if not more:
+                break
+            raw.extend(more)
+
+        dirty: set[Path] = set()
+        redetect: set[Path] = set()
+        for event in raw:
+            if event.mask & IN_Q_OVERFLOW:
+                # Events were dropped; nothing short of a full rescan is exact.
+                self._forget(self.root)
+                self._walk(PendingDir(self.root), 1)
+                return self._sync_inventory(redetect=set(self._candidates))
+            path = self._by_wd.get(event.wd)
+            if path is None:
+                continue
+            if event.mask & IN_IGNORED:
+                self._by_wd.pop(event.wd, None)
+                watched = self._dirs.get(path)
+                if watched is not None:
+                    watched.wd = None
+                continue
+            if event.mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                if path != self.root:
+                    dirty.add(path.parent)
+                continue
+            dirty.add(path)
+            if event.name in ENV_LISTING_NAMES and path != self.root:
+                dirty.add(path.parent)
+                redetect.add(path)
+
+        for directory in sorted(dirty, key=lambda item: len(item.parts)):
+            if directory in self._dirs:
+                self._refresh(directory)
+        return self._sync_inventory(redetect=redetect)
+
+    def _watch_and_visit(
+        self, pending: PendingDir, level: int
+    ) -> tuple[int | None, DirectoryVisit]:
+        # Watch before listing so entries created in between are not lost.
+        try:
+            wd: int | None = self._inotify.add_watch(pending.path)
+        except OSError:
+            wd = None
+        else:
+            pending.listing = None
+        visit = visit_directory(pending, self._config, leaf=level >= self.max_depth)
+        return wd, visit
+
+    def _record(
+        self, pending: PendingDir, level: int, wd: int | None, visit: DirectoryVisit
+    ) -> list[PendingDir]:
+        """Keep a visited directory and return the subdirectories to walk."""
+        if wd is None:
+            self.watch_errors += 1
+        else:
+            self._by_wd[wd] = pending.path
+        watched = _WatchedDir(depth=level, visit=visit, wd=wd)
+        self._dirs[pending.path] = watched
+        self._changed.add(pending.path)
+        if level >= self.max_depth:
+            return []
+        watched.children.update(child.path for child in visit.subdirs)
+        return visit.subdirs
+
+    def _walk(self, start: PendingDir, depth: int) -> None:
+        if self._pool is not None:
+            self._walk_parallel(self._pool, start, depth)
+            return
+        stack = [(start, depth)]
+        while stack:
+            pending, level = stack.pop()
+            wd, visit = self._watch_and_visit(pending, level)
+            children = self._record(pending, level, wd, visit)
+            stack.extend((child, level + 1) for child in children)
+
+    def _walk_parallel(
+        self, pool: ThreadPoolExecutor, start: PendingDir, depth: int
+    ) -> None:
+        # Workers only watch and list; the bookkeeping stays on this thread.
+        in_flight: dict[
+            Future[tuple[int | None, DirectoryVisit]], tuple[PendingDir, int]
+        ] = {}
+
+        def submit(pending: PendingDir, level: int) -> None:
+            future = pool.submit(self._watch_and_visit, pending, level)
+            in_flight[future] = (pending, level)
+
+        submit(start, depth)
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending, level = in_flight.pop(future)
+                wd, visit = future.result()
+                for child in self._record(pending, level, wd, visit):
+                    submit(child, level + 1)
+
+    def _forget(self, path: Path) -> None:
+        stack = [path]
+        while stack:
+            path = stack.pop()
+            watched = self._dirs.pop(path, None)
+            if watched is None:
+                continue
+            self._changed.add(path)
+            if watched.wd is not None:
+                self._by_wd.pop(watched.wd, None)
+                self._inotify.rm_watch(watched.wd)
+            stack.extend(watched.children)
+
+    def _refresh(self, directory: Path) -> None:
+        old = self._dirs[directory]
+        visit = visit_directory(
+            PendingDir(directory), self._config, leaf=old.depth >= self.max_depth
+        )
+        old.visit = visit
+        self._changed.add(directory)
+        current = {child.path: child for child in visit.subdirs}
+        for gone in old.children - current.keys():
+            self._forget(gone)
+        old.children = set()
+        if old.depth >= self.max_depth:
+            return
+        for path, child in current.items():
+            old.children.add(path)
+            if path not in self._dirs:
+                self._walk(child, old.depth + 1)
+
+    def _sync_inventory(self, *, redetect: set[Path]) -> list[WatchEvent]:
+        """Fold the directories changed since the last sync into the inventory.
+
+        Candidates that appeared are detected, as are those in ``redetect``
+        whose markers changed; unchanged directories are not looked at.
+        """
+        changed, self._changed = self._changed, set()
+        env_before: dict[Path, EnvInfo | None] = {}
+        artifact_before: dict[Path, ArtifactInfo | None] = {}
+        detect = redetect & self._candidates
+        for directory in changed:
+            old_candidates, old_artifacts = self._synced.pop(
+                directory, (frozenset(), frozenset())
+            )
+            watched = self._dirs.get(directory)
+            visit = DirectoryVisit() if watched is None else watched.visit
+            candidates = frozenset(visit.environments)
+            artifacts = {item.path: item for item in visit.artifacts}
+            for path in old_candidates - candidates:
+                env_before.setdefault(path, self.environments.pop(path, None))
+                self._candidates.discard(path)
+                detect.discard(path)
+            detect.update(candidates - old_candidates)
+            for path in old_artifacts - artifacts.keys():
+                artifact_before.setdefault(path, self.artifacts.pop(path, None))
+            for path in artifacts.keys() - old_artifacts:
+                artifact_before.setdefault(path, self.artifacts.get(path))
+                self.artifacts[path] = artifacts[path]
+            if candidates or artifacts:
+                self._synced[directory] = (candidates, frozenset(artifacts))
+
+        for path in detect:
+            self._candidates.add(path)
+            env_before.setdefault(path, self.environments.get(path))
+            env_info = detect_environment(
+                path, stale_days=self.stale_days, include_dotenv=self.include_dotenv
+            )
+            if is_reported(env_info, include_dotenv=self.include_dotenv):
+                self.environments[path] = env_info
+            else:
+                self.environments.pop(path, None)
+
+        removed_envs, added_envs = _changes(env_before, self.environments)
+        removed_artifacts, added_artifacts = _changes(artifact_before, self.artifacts)
+        return [*removed_envs, *added_envs, *removed_artifacts, *added_artifacts]
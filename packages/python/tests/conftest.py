@@ -6,9 +6,10 @@ from pathlib import Path
 
 def _ensure_src_on_path() -> None:
     repo_root = Path(__file__).resolve().parent.parent
-    src_path = repo_root / "src"
-    if str(src_path) not in sys.path:
-        sys.path.insert(0, str(src_path))
+    # ``src`` for envoic itself, the package root for ``benchmarks``.
+    for path in (repo_root, repo_root / "src"):
+        if str(path) not in sys.path:
+            sys.path.insert(0, str(path))
 
 
 _ensure_src_on_path()
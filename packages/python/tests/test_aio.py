@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import aclosing
+from pathlib import Path
+
+import pytest
+
+from envoic import aio
+from envoic.models import ArtifactInfo, EnvType, ScanStats
+from envoic.scanner import scan
+
+
+def _make_env(path: Path) -> None:
+    path.mkdir(parents=True)
+    (path / "pyvenv.cfg").write_text("version = 3.12.0\n", encoding="utf-8")
+
+
+async def _collect(root: Path, **kwargs: object) -> list[object]:
+    return [item async for item in aio.scan(root, **kwargs)]  # type: ignore[arg-type]
+
+
+def test_aio_scan_matches_sync_scan(tmp_path: Path) -> None:
+    for idx in range(5):
+        _make_env(tmp_path / f"proj{idx}" / ".venv")
+        (tmp_path / f"proj{idx}" / ".mypy_cache").mkdir()
+    stats = ScanStats()
+
+    items = asyncio.run(_collect(tmp_path, include_artifacts=True, jobs=3, stats=stats))
+    expected = scan(tmp_path, include_artifacts=True)
+
+    envs = sorted(item for item in items if isinstance(item, Path))
+    artifacts = sorted(
+        str(item.path) for item in items if isinstance(item, ArtifactInfo)
+    )
+    assert envs == expected.environments
+    assert artifacts == [str(item.path) for item in expected.artifacts]
+    assert stats.directories_listed == expected.stats.directories_listed
+
+
+def test_aio_scan_environments_detects_concurrently(tmp_path: Path) -> None:
+    for idx in range(4):
+        _make_env(tmp_path / f"proj{idx}" / ".venv")
+    (tmp_path / "other" / "venv").mkdir(parents=True)
+
+    async def run() -> list[str]:
+        return [env.path.name async for env in aio.scan_environments(tmp_path, jobs=2)]
+
+    names = asyncio.run(run())
+
+    assert sorted(names) == [".venv"] * 4
+
+
+def test_aio_detect_environment(tmp_path: Path) -> None:
+    env_dir = tmp_path / ".venv"
+    _make_env(env_dir)
+
+    env = asyncio.run(aio.detect_environment(env_dir))
+
+    assert env.env_type == EnvType.VENV
+
+
+def test_aio_scan_stops_when_closed_early(tmp_path: Path) -> None:
+    for idx in range(20):
+        _make_env(tmp_path / f"proj{idx}" / "nested" / ".venv")
+
+    async def first() -> Path | ArtifactInfo:
+        async with aclosing(aio.scan(tmp_path, jobs=2)) as items:
+            async for item in items:
+                return item
+        raise AssertionError("nothing found")
+
+    assert isinstance(asyncio.run(first()), Path)
+
+
+def test_aio_scan_is_cancellable(tmp_path: Path) -> None:
+    for idx in range(20):
+        _make_env(tmp_path / f"proj{idx}" / ".venv")
+
+    async def run() -> None:
+        task = asyncio.create_task(_collect(tmp_path, jobs=1))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+
+
+def test_aio_scan_rejects_zero_jobs(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="jobs"):
+        asyncio.run(_collect(tmp_path, jobs=0))
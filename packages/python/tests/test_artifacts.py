@@ -1,8 +1,19 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
-from envoic.artifacts import summarize_artifacts
+import pytest
+
+from envoic.artifacts import (
+    ARTIFACT_PATTERNS,
+    PROJECT_MARKERS,
+    ArtifactPattern,
+    _compile_patterns,
+    match_artifact,
+    needs_parent_listing,
+    summarize_artifacts,
+)
 from envoic.models import ArtifactCategory, SafetyLevel
 from envoic.scanner import scan
 
@@ -66,6 +77,34 @@ def test_build_dist_python_project_only(tmp_path: Path) -> None:
     assert (non_py_proj / "dist").resolve() not in dist_paths
 
 
+def test_build_dist_are_decided_from_the_parent_listing(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    project = tmp_path / "project"
+    (project / "build").mkdir(parents=True)
+    (project / "setup.cfg").write_text("", encoding="utf-8")
+    (tmp_path / "site" / "dist").mkdir(parents=True)
+    probed: list[str] = []
+    exists = Path.exists
+
+    def recording_exists(self: Path, **kwargs: bool) -> bool:
+        if self.name in PROJECT_MARKERS:
+            probed.append(self.name)
+        return exists(self, **kwargs)
+
+    monkeypatch.setattr(Path, "exists", recording_exists)
+    artifacts = scan(tmp_path, max_depth=4, include_artifacts=True).artifacts
+
+    assert [item.path for item in artifacts] == [(project / "build").resolve()]
+    assert probed == []
+    assert needs_parent_listing("build")
+    assert not needs_parent_listing("__pycache__")
+    with os.scandir(project) as entries:
+        build = next(entry for entry in entries if entry.name == "build")
+    assert match_artifact(build, project, parent_names=set()) is None
+    assert match_artifact(build, project, parent_names={"setup.py"}) is not None
+
+
 def test_artifacts_inside_venv_excluded(tmp_path: Path) -> None:
     venv = tmp_path / "project" / ".venv"
     venv.mkdir(parents=True)
@@ -102,3 +141,53 @@ def test_artifact_summary_rollup(tmp_path: Path) -> None:
     pycache = next(item for item in summary if item.pattern == "__pycache__")
     assert pycache.count == 5
     assert pycache.total_size_bytes > 0
+
+
+def test_match_artifact_checks_type_and_project_per_pattern(tmp_path: Path) -> None:
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "setup.py").write_text("", encoding="utf-8")
+    for name in ("__pycache__", "build", "pkg.egg-info", "src", "stray.pyc"):
+        (project / name).mkdir()
+    for name in ("mod.pyc", "old.pyo", ".coverage", "htmlcov", "README.md"):
+        (project / name).write_text("", encoding="utf-8")
+    (tmp_path / "build").mkdir()
+
+    def matched(parent: Path) -> dict[str, str | None]:
+        with os.scandir(parent) as entries:
+            return {
+                entry.name: getattr(
+                    match_artifact(entry, parent), "pattern_matched", None
+                )
+                for entry in entries
+            }
+
+    assert matched(project) == {
+        "setup.py": None,
+        "__pycache__": "__pycache__",
+        "build": "build",
+        "pkg.egg-info": "*.egg-info",
+        "src": None,
+        "stray.pyc": None,
+        "mod.pyc": "*.pyc",
+        "old.pyo": "*.pyo",
+        ".coverage": ".coverage",
+        "htmlcov": None,
+        "README.md": None,
+    }
+    assert matched(tmp_path) == {"project": None, "build": None}
+
+
+def test_compiled_patterns_keep_pattern_order() -> None:
+    patterns: list[ArtifactPattern] = [
+        {**ARTIFACT_PATTERNS[1], "suffix": ".pyc"},
+        {**ARTIFACT_PATTERNS[0], "name": "cache.pyc"},
+        {**ARTIFACT_PATTERNS[0], "name": "cache.pyc", "type": "file"},
+    ]
+
+    by_name, by_extension = _compile_patterns(patterns)
+
+    assert [rule.position for rule in by_name["cache.pyc"]] == [0, 1, 2]
+    assert [rule.pattern for rule in by_extension["pyc"]] == ["*.pyc"]
+    with pytest.raises(ValueError, match="must contain a dot"):
+        _compile_patterns([{**ARTIFACT_PATTERNS[1], "suffix": "pyc"}])
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from benchmarks import micro
+from benchmarks.__main__ import main
+from benchmarks.compare import compare_documents
+from benchmarks.generator import (
+    MANIFEST_NAME,
+    SCALES,
+    Scale,
+    TreeManifest,
+    generate_tree,
+)
+from benchmarks.results import read_results, results_document, write_results
+from benchmarks.scale import COMMANDS, run_suite
+
+TINY = Scale("tiny", 12, 2, 6, 3, 2, 2, 2, 1, 20)
+
+
+def _snapshot(root: Path) -> list[tuple[str, str | None]]:
+    return sorted(
+        (
+            path.relative_to(root).as_posix(),
+            path.read_text(encoding="utf-8") if path.is_file() else None,
+        )
+        for path in root.rglob("*")
+    )
+
+
+def test_generate_tree_is_deterministic_and_counted(tmp_path: Path) -> None:
+    manifest = generate_tree(tmp_path / "a", TINY, seed=7)
+    generate_tree(tmp_path / "b", TINY, seed=7)
+    generate_tree(tmp_path / "c", TINY, seed=8)
+
+    snapshot = _snapshot(tmp_path / "a")
+    files = [name for name, text in snapshot if text is not None]
+    assert snapshot == _snapshot(tmp_path / "b")
+    assert snapshot != _snapshot(tmp_path / "c")
+    assert manifest.directories == len(snapshot) - len(files)
+    assert manifest.files == len(files) - 1
+    assert manifest.projects == 12
+    assert TreeManifest.read(tmp_path / "a") == manifest
+    assert MANIFEST_NAME in files
+
+
+def test_generate_tree_refuses_a_non_empty_root(tmp_path: Path) -> None:
+    (tmp_path / "keep.txt").write_text("", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="not empty"):
+        generate_tree(tmp_path, TINY)
+
+
+def test_run_suite_reports_throughput_and_memory(tmp_path: Path) -> None:
+    commands = [COMMANDS["scan"], COMMANDS["clean-dry-run"]]
+
+    results = run_suite([TINY], commands, repeat=2, workdir=tmp_path)
+    manifest = TreeManifest.read(tmp_path / "tiny-0")
+
+    assert manifest is not None
+    assert [result.command for result in results] == ["scan", "clean-dry-run"]
+    for result in results:
+        assert len(result.seconds) == 2
+        assert 0 < result.environments <= manifest.environments
+        assert 0 < result.directories <= manifest.directories
+        assert result.dirs_per_sec > 0
+        assert result.peak_rss_bytes is None or result.peak_rss_bytes > 0
+
+
+def test_scale_records_and_passes_the_engine(tmp_path: Path) -> None:
+    output = tmp_path / "fd.json"
+    argv = ["scale", "--scales", "tiny", "--commands", "scan", "clean-dry-run"]
+
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setitem(SCALES, "tiny", TINY)
+        code = main([*argv, "--repeat", "1", "--engine", "fd", "-o", str(output)])
+
+    document = read_results(output)
+    assert code == 0
+    assert document["settings"]["engine"] == "fd"
+    assert [item["command"] for item in document["results"]] == argv[-2:]
+
+
+def test_micro_fixtures_bind_every_benchmark(tmp_path: Path) -> None:
+    benchmarks = micro.build_fixtures(tmp_path)
+    for benchmark in benchmarks:
+        benchmark.func()
+
+    results = micro.run_suite(benchmarks, repeat=2, only="match_artifact")
+    document = results_document(
+        "micro", {"repeat": 2}, [result.to_dict() for result in results]
+    )
+
+    assert len(benchmarks) == len({benchmark.name for benchmark in benchmarks})
+    assert [result.name for result in results] == ["artifacts.match_artifact"]
+    assert results[0].calls % len(micro.MIXED_DIRS + micro.MIXED_FILES) == 0
+    assert document["suite"] == "micro"
+    assert document["results"][0]["median_seconds"] > 0
+
+
+def _document(**entries: tuple[list[float], int | None]) -> dict[str, Any]:
+    return results_document(
+        "scale",
+        {},
+        [
+            {"name": name, "seconds": seconds, "peak_rss_bytes": rss}
+            for name, (seconds, rss) in entries.items()
+        ],
+    )
+
+
+def test_compare_flags_slowdowns_beyond_threshold_and_noise() -> None:
+    baseline = _document(
+        steady=([1.0, 1.01, 0.99], 100),
+        noisy=([1.0, 1.5, 0.6], 100),
+        memory=([1.0, 1.0, 1.0], 100),
+        faster=([2.0, 2.0, 2.0], None),
+        removed=([1.0], None),
+    )
+    current = _document(
+        steady=([2.0, 2.02, 1.98], 100),
+        noisy=([1.4, 1.9, 1.0], 100),
+        memory=([1.0, 1.0, 1.0], 200),
+        faster=([1.0, 1.0, 1.0], None),
+        added=([1.0], None),
+    )
+
+    comparisons = {item.name: item for item in compare_documents(baseline, current)}
+
+    assert comparisons["steady"].status == "regressed"
+    assert comparisons["steady"].slowdown == pytest.approx(2.0)
+    assert comparisons["noisy"].status == "ok"
+    assert comparisons["memory"].status == "regressed"
+    assert comparisons["memory"].memory_regressed
+    assert comparisons["faster"].status == "improved"
+    assert comparisons["added"].status == "new"
+    assert comparisons["removed"].status == "missing"
+
+
+def test_compare_command_exits_non_zero_on_regression(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    baseline = tmp_path / "baseline.json"
+    slower = tmp_path / "slower.json"
+    write_results(_document(scan=([1.0, 1.0, 1.0], None)), baseline)
+    write_results(_document(scan=([2.0, 2.0, 2.0], None)), slower)
+
+    assert main(["compare", str(baseline), "--current", str(baseline)]) == 0
+    assert main(["compare", str(baseline), "--current", str(slower)]) == 1
+    assert "REGRESSED" in capsys.readouterr().out
+    assert main(["compare", str(tmp_path / "missing.json")]) == 2
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import json
+import pstats
 from pathlib import Path
 
+import pytest
 from typer.testing import CliRunner
 
 from envoic.cli import app
@@ -23,3 +26,223 @@ def test_scan_allows_show_artifacts_with_default_artifacts(tmp_path: Path) -> No
     result = runner.invoke(app, ["scan", str(tmp_path), "--show-artifacts"])
 
     assert result.exit_code == 0
+
+
+def test_scan_accepts_jobs_option(tmp_path: Path) -> None:
+    env_dir = tmp_path / "project" / ".venv"
+    env_dir.mkdir(parents=True)
+    (env_dir / "pyvenv.cfg").write_text("version = 3.12.0\n", encoding="utf-8")
+
+    result = runner.invoke(app, ["scan", str(tmp_path), "--jobs", "4", "--json"])
+
+    assert result.exit_code == 0
+    assert str(env_dir.resolve()) in result.output
+
+
+def test_scan_ndjson_streams_records_and_summary(tmp_path: Path) -> None:
+    env_dir = tmp_path / "project" / ".venv"
+    env_dir.mkdir(parents=True)
+    (env_dir / "pyvenv.cfg").write_text("version = 3.12.0\n", encoding="utf-8")
+    (tmp_path / "project" / ".mypy_cache").mkdir()
+
+    result = runner.invoke(app, ["scan", str(tmp_path), "--ndjson"])
+
+    assert result.exit_code == 0
+    records = [json.loads(line) for line in result.output.splitlines()]
+    by_type = {record["type"]: record for record in records}
+    assert by_type["environment"]["path"] == str(env_dir.resolve())
+    assert by_type["artifact"]["pattern_matched"] == ".mypy_cache"
+    assert records[-1]["type"] == "summary"
+    assert records[-1]["environment_count"] == 1
+    assert records[-1]["artifact_count"] == 1
+
+
+def test_scan_rejects_json_with_ndjson(tmp_path: Path) -> None:
+    result = runner.invoke(app, ["scan", str(tmp_path), "--json", "--ndjson"])
+
+    assert result.exit_code == 1
+    assert "cannot be used together" in result.output.lower()
+
+
+def test_scan_accepts_multiple_roots_and_roots_file(tmp_path: Path) -> None:
+    first = tmp_path / "first" / ".venv"
+    second = tmp_path / "second" / ".venv"
+    for env_dir in (first, second):
+        env_dir.mkdir(parents=True)
+        (env_dir / "pyvenv.cfg").write_text("version = 3.12.0\n", encoding="utf-8")
+    roots_file = tmp_path / "roots.txt"
+    roots_file.write_text(f"# extra roots\n\n{tmp_path / 'second'}\n", encoding="utf-8")
+
+    result = runner.invoke(
+        app,
+        ["scan", str(tmp_path / "first"), "--roots-from", str(roots_file), "--json"],
+    )
+
+    assert result.exit_code == 0
+    payload = json.loads(result.output)
+    assert payload["scan_path"] == str(tmp_path.resolve())
+    assert [env["path"] for env in payload["environments"]] == [
+        str(first.resolve()),
+        str(second.resolve()),
+    ]
+    assert len(payload["scan_roots"]) == 2
+
+
+def test_scan_labels_roots_without_a_common_parent(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def no_common_path(paths: list[Path]) -> str:
+        raise ValueError("Paths don't have the same drive")
+
+    # What ``commonpath`` does for roots on different Windows drives.
+    monkeypatch.setattr("envoic.cli.os.path.commonpath", no_common_path)
+    (tmp_path / "first").mkdir()
+    (tmp_path / "second").mkdir()
+
+    result = runner.invoke(
+        app,
+        ["scan", str(tmp_path / "first"), str(tmp_path / "second"), "--json"],
+    )
+
+    assert result.exit_code == 0
+    assert json.loads(result.output)["scan_path"] == str((tmp_path / "first").resolve())
+
+
+def test_scan_rejects_missing_root_in_roots_file(tmp_path: Path) -> None:
+    roots_file = tmp_path / "roots.txt"
+    roots_file.write_text(f"{tmp_path / 'missing'}\n", encoding="utf-8")
+
+    result = runner.invoke(app, ["scan", "--roots-from", str(roots_file)])
+
+    assert result.exit_code == 1
+    assert "not a directory" in result.output
+
+
+def test_scan_time_budget_marks_result_partial(tmp_path: Path) -> None:
+    (tmp_path / "project").mkdir()
+
+    result = runner.invoke(app, ["scan", str(tmp_path), "--time-budget", "0", "--json"])
+
+    assert result.exit_code == 0
+    payload = json.loads(result.output)
+    assert payload["partial"] is True
+    assert payload["stats"]["directories_unvisited"] == 1
+
+
+def test_scan_max_entries_reports_truncated_directories(tmp_path: Path) -> None:
+    for idx in range(5):
+        (tmp_path / f"dir{idx}").mkdir()
+
+    result = runner.invoke(app, ["scan", str(tmp_path), "--max-entries", "2", "--json"])
+
+    assert result.exit_code == 0
+    payload = json.loads(result.output)
+    assert payload["stats"]["truncated_directories"] == [str(tmp_path.resolve())]
+
+
+def test_scan_merges_config_and_cli_excludes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    for name in ("target", "dataset1", "keep"):
+        (tmp_path / name).mkdir()
+    (tmp_path / "envoic.toml").write_text('exclude = ["target"]\n', encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+
+    result = runner.invoke(app, ["scan", ".", "--exclude", "dataset*", "--json"])
+
+    assert result.exit_code == 0
+    payload = json.loads(result.output)
+    assert payload["stats"]["pruned_by_rule"] == {"target": 1, "dataset*": 1}
+
+
+def test_scan_processes_matches_sequential_scan(tmp_path: Path) -> None:
+    for idx in range(3):
+        env_dir = tmp_path / f"project{idx}" / ".venv"
+        env_dir.mkdir(parents=True)
+        (env_dir / "pyvenv.cfg").write_text("version = 3.12.0\n", encoding="utf-8")
+
+    sequential = runner.invoke(app, ["scan", str(tmp_path), "--json"])
+    sharded = runner.invoke(app, ["scan", str(tmp_path), "--processes", "2", "--json"])
+
+    assert sharded.exit_code == 0
+    paths = [env["path"] for env in json.loads(sharded.output)["environments"]]
+    assert paths == [
+        env["path"] for env in json.loads(sequential.output)["environments"]
+    ]
+
+
+def test_scan_rejects_processes_with_jobs(tmp_path: Path) -> None:
+    result = runner.invoke(
+        app, ["scan", str(tmp_path), "--processes", "2", "--jobs", "2"]
+    )
+
+    assert result.exit_code == 1
+    assert "cannot be used together" in result.output.lower()
+
+
+def test_scan_accepts_fd_engine(tmp_path: Path) -> None:
+    env_dir = tmp_path / "project" / ".venv"
+    env_dir.mkdir(parents=True)
+    (env_dir / "pyvenv.cfg").write_text("version = 3.12.0\n", encoding="utf-8")
+
+    result = runner.invoke(app, ["scan", str(tmp_path), "--engine", "fd", "--json"])
+    conflict = runner.invoke(app, ["scan", str(tmp_path), "--engine", "fd", "-j", "2"])
+
+    assert result.exit_code == 0
+    assert str(env_dir.resolve()) in result.output
+    assert conflict.exit_code == 1
+
+
+def test_scan_json_includes_stats_and_flag_prints_them(tmp_path: Path) -> None:
+    env_dir = tmp_path / "project" / ".venv"
+    env_dir.mkdir(parents=True)
+    (env_dir / "pyvenv.cfg").write_text("version = 3.12.0\n", encoding="utf-8")
+
+    json_result = runner.invoke(app, ["scan", str(tmp_path), "--json"])
+    list_result = runner.invoke(app, ["list", str(tmp_path), "--stats"])
+
+    stats = json.loads(json_result.output)["stats"]
+    assert stats["directories_listed"] >= 2
+    assert "walk" in stats["phase_seconds"]
+    assert list_result.exit_code == 0
+    assert "SCAN STATISTICS" in list_result.output
+
+
+def test_profile_writes_pstats_and_prints_hot_functions(tmp_path: Path) -> None:
+    env_dir = tmp_path / "tree" / "project" / ".venv"
+    env_dir.mkdir(parents=True)
+    (env_dir / "pyvenv.cfg").write_text("version = 3.12.0\n", encoding="utf-8")
+    profile = tmp_path / "scan.pstats"
+
+    result = runner.invoke(
+        app,
+        [
+            "--profile",
+            str(profile),
+            "--profile-top",
+            "5",
+            "list",
+            str(tmp_path / "tree"),
+        ],
+    )
+
+    assert result.exit_code == 0
+    assert "cumulative" in result.output
+    assert f"Profile written to {profile}" in result.output
+    functions = pstats.Stats(str(profile)).get_stats_profile().func_profiles
+    assert {"visit_directory", "detect_environment"} <= functions.keys()
+
+
+def test_profile_covers_deep_sizing_threads(tmp_path: Path) -> None:
+    env_dir = tmp_path / "tree" / "project" / ".venv"
+    env_dir.mkdir(parents=True)
+    (env_dir / "pyvenv.cfg").write_text("version = 3.12.0\n", encoding="utf-8")
+    profile = tmp_path / "deep.pstats"
+
+    result = runner.invoke(
+        app, ["--profile", str(profile), "list", str(tmp_path / "tree"), "--deep"]
+    )
+
+    assert result.exit_code == 0
+    functions = pstats.Stats(str(profile)).get_stats_profile().func_profiles
+    assert {"detect_environment", "size_environment", "disk_usage"} <= functions.keys()
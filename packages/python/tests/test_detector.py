@@ -1,7 +1,14 @@
+import os
 from pathlib import Path
 
-from envoic.detector import detect_environment
-from envoic.models import EnvType
+import pytest
+
+from envoic.detector import (
+    detect_environment,
+    is_environment_listing,
+    quick_is_environment_dir,
+)
+from envoic.models import EnvType, ScanStats
 
 
 def _touch(path: Path) -> None:
@@ -59,3 +66,51 @@ def test_detect_unknown_for_non_env(tmp_path: Path) -> None:
     info = detect_environment(folder)
 
     assert info.env_type == EnvType.UNKNOWN
+
+
+def _listing(path: Path) -> dict[str, os.DirEntry[str]]:
+    with os.scandir(path) as it:
+        return {entry.name: entry for entry in it}
+
+
+@pytest.mark.parametrize(
+    ("markers", "expected"),
+    [
+        (["pyvenv.cfg"], True),
+        (["conda-meta/"], True),
+        (["bin/activate"], True),
+        (["Scripts/activate"], True),
+        (["bin/python", "lib/python3.11/site-packages/"], True),
+        (["Scripts/python.exe", "Lib/site-packages/"], True),
+        (["bin/python"], False),
+        (["lib/python3.11/site-packages/"], False),
+        (["pyvenv.cfg/"], False),
+        (["README.md", "src/"], False),
+    ],
+)
+def test_is_environment_listing(
+    tmp_path: Path, markers: list[str], expected: bool
+) -> None:
+    env_dir = tmp_path / "candidate"
+    env_dir.mkdir()
+    for marker in markers:
+        if marker.endswith("/"):
+            (env_dir / marker).mkdir(parents=True)
+        else:
+            _touch(env_dir / marker)
+
+    assert is_environment_listing(env_dir, _listing(env_dir)) is expected
+    assert quick_is_environment_dir(env_dir) is expected
+
+
+def test_detect_environment_tallies_stats(tmp_path: Path) -> None:
+    env_dir = tmp_path / ".venv"
+    (env_dir / "lib").mkdir(parents=True)
+    (env_dir / "pyvenv.cfg").write_text("version = 3.12.0\n", encoding="utf-8")
+    stats = ScanStats()
+
+    detect_environment(env_dir, deep=True, stats=stats)
+
+    assert stats.bytes_sized == len("version = 3.12.0\n")
+    assert stats.subprocesses_spawned == 0
+    assert set(stats.phase_seconds) == {"detect", "size"}
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from envoic.config import load_config
+from envoic.excludes import ExcludeMatcher
+from envoic.scanner import scan
+
+
+def test_matcher_names_globs_and_paths() -> None:
+    matcher = ExcludeMatcher(
+        ["target", "dataset*", "/srv/*/backups", "/opt/data", "build/cache"]
+    )
+
+    assert matcher.match(Path("/home/u/proj/target")) == "target"
+    assert matcher.match(Path("/data/dataset-2024")) == "dataset*"
+    assert matcher.match(Path("/srv/app/backups")) == "/srv/*/backups"
+    assert matcher.match(Path("/srv/app/nested/backups")) is None
+    assert matcher.match(Path("/opt/data")) == "/opt/data"
+    assert matcher.match(Path("/opt/data/inner")) is None
+    assert matcher.match(Path("/home/u/build/cache")) == "build/cache"
+    assert matcher.match(Path("/home/u/targets")) is None
+
+
+def test_matcher_is_falsy_without_patterns() -> None:
+    assert not ExcludeMatcher([])
+    assert ExcludeMatcher(["x"])
+
+
+def test_matcher_rejects_invalid_pattern() -> None:
+    with pytest.raises(ValueError, match="Invalid exclude pattern"):
+        ExcludeMatcher(["[z-a]"])
+
+
+def test_scan_prunes_excluded_subtrees_and_counts_rules(tmp_path: Path) -> None:
+    kept = tmp_path / "proj" / ".venv"
+    for env_dir in (
+        kept,
+        tmp_path / "proj" / "target" / ".venv",
+        tmp_path / "dataset1" / ".venv",
+        tmp_path / "dataset2" / ".venv",
+    ):
+        env_dir.mkdir(parents=True)
+        (env_dir / "pyvenv.cfg").write_text("version = 3.12.0\n", encoding="utf-8")
+
+    discovery = scan(tmp_path, exclude=["target", "dataset*"])
+
+    assert discovery.environments == [kept]
+    assert discovery.stats.pruned_by_rule == {"target": 1, "dataset*": 2}
+
+
+def test_load_config_prefers_nearest_file(tmp_path: Path) -> None:
+    (tmp_path / "pyproject.toml").write_text(
+        '[tool.envoic]\nexclude = [".cache"]\n', encoding="utf-8"
+    )
+    nested = tmp_path / "nested"
+    nested.mkdir()
+    (nested / "envoic.toml").write_text('exclude = ["target"]\n', encoding="utf-8")
+
+    assert load_config(tmp_path).exclude == [".cache"]
+    assert load_config(nested).exclude == ["target"]
+    assert load_config(nested).source == nested / "envoic.toml"
+
+
+def test_load_config_ignores_pyproject_without_table(tmp_path: Path) -> None:
+    (tmp_path / "pyproject.toml").write_text("[project]\nname = 'x'\n", "utf-8")
+
+    assert load_config(tmp_path).exclude == []
+
+
+def test_load_config_skips_malformed_pyproject_but_not_envoic_toml(
+    tmp_path: Path,
+) -> None:
+    (tmp_path / "pyproject.toml").write_text("[project\nname =", "utf-8")
+    nested = tmp_path / "nested"
+    nested.mkdir()
+
+    assert load_config(nested).source is None
+    (nested / "envoic.toml").write_text("exclude = [", "utf-8")
+    with pytest.raises(ValueError, match="Invalid TOML"):
+        load_config(nested)
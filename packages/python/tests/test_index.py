@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from envoic.cli import app
+from envoic.detector import detect_environment
+from envoic.index import ScanIndex, default_index_path
+from envoic.scanner import scan
+
+
+def _touch(path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("", encoding="utf-8")
+
+
+def _build_tree(root: Path) -> None:
+    for idx in range(3):
+        project = root / f"proj{idx}"
+        _touch(project / ".venv" / "pyvenv.cfg")
+        _touch(project / "pkg" / "__pycache__" / "mod.pyc")
+        _touch(project / "pyproject.toml")
+        (project / "build").mkdir()
+
+
+def test_rescan_of_unchanged_tree_lists_nothing(tmp_path: Path) -> None:
+    tree = tmp_path / "tree"
+    _build_tree(tree)
+    db = tmp_path / "index.sqlite3"
+
+    with ScanIndex(db) as index:
+        first = scan(tree, max_depth=4, include_artifacts=True, index=index)
+    with ScanIndex(db) as index:
+        second = scan(tree, max_depth=4, include_artifacts=True, index=index)
+
+    assert second.environments == first.environments
+    assert [(item.path, item.pattern_matched) for item in second.artifacts] == [
+        (item.path, item.pattern_matched) for item in first.artifacts
+    ]
+    assert first.stats.directories_listed > 0
+    assert second.stats.directories_listed == 0
+
+
+def test_rescan_picks_up_changed_directories(tmp_path: Path) -> None:
+    tree = tmp_path / "tree"
+    _build_tree(tree)
+    db = tmp_path / "index.sqlite3"
+    with ScanIndex(db) as index:
+        scan(tree, max_depth=4, index=index)
+
+    new_env = tree / "proj1" / "pkg" / "venv"
+    _touch(new_env / "bin" / "activate")
+    with ScanIndex(db) as index:
+        discovery = scan(tree, max_depth=4, index=index)
+
+    assert new_env.resolve() in discovery.environments
+    # Only proj1/pkg changed; it and the new venv are the only listings.
+    assert discovery.stats.directories_listed == 2
+
+
+def test_rebuild_discards_stored_records(tmp_path: Path) -> None:
+    tree = tmp_path / "tree"
+    _build_tree(tree)
+    db = tmp_path / "index.sqlite3"
+    with ScanIndex(db) as index:
+        scan(tree, max_depth=4, index=index)
+
+    with ScanIndex(db, rebuild=True) as index:
+        discovery = scan(tree, max_depth=4, index=index)
+
+    assert discovery.stats.directories_listed > 0
+
+
+def test_index_reuses_detected_environment(tmp_path: Path) -> None:
+    env_dir = tmp_path / "project" / ".venv"
+    env_dir.mkdir(parents=True)
+    (env_dir / "pyvenv.cfg").write_text("version = 3.12.1\n", encoding="utf-8")
+
+    with ScanIndex(tmp_path / "index.sqlite3") as index:
+        fresh = index.detect_environment(env_dir, stale_days=30)
+        cached = index.detect_environment(env_dir, stale_days=30)
+
+    assert cached == fresh == detect_environment(env_dir, stale_days=30)
+
+
+def test_deep_rescan_sees_installs_and_nested_growth(tmp_path: Path) -> None:
+    env_dir = tmp_path / "project" / ".venv"
+    site_packages = env_dir / "lib" / "python3.12" / "site-packages"
+    (site_packages / "alpha-1.0.dist-info").mkdir(parents=True)
+    (env_dir / "pyvenv.cfg").write_text("version = 3.12.1\n", encoding="utf-8")
+    _touch(tmp_path / "project" / "build" / "lib" / "mod.py")
+    (tmp_path / "project" / "pyproject.toml").write_text("", encoding="utf-8")
+    db = tmp_path / "index.sqlite3"
+    with ScanIndex(db) as index:
+        before = index.detect_environment(env_dir, deep=True)
+        scan(tmp_path, max_depth=4, include_artifacts=True, deep=True, index=index)
+
+    # Neither change touches the mtime of the environment or artifact root.
+    (site_packages / "beta-2.0.dist-info").mkdir()
+    (site_packages / "beta.py").write_bytes(b"x" * 1000)
+    (tmp_path / "project" / "build" / "lib" / "big.so").write_bytes(b"x" * 500)
+    with ScanIndex(db) as index:
+        after = index.detect_environment(env_dir, deep=True)
+        discovery = scan(
+            tmp_path, max_depth=4, include_artifacts=True, deep=True, index=index
+        )
+
+    assert (before.package_count, after.package_count) == (1, 2)
+    assert after.size_bytes == (before.size_bytes or 0) + 1000
+    (build,) = discovery.artifacts
+    assert build.size_bytes == 500
+
+
+def test_default_index_path_honours_cache_env(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.delenv("ENVOIC_CACHE_DIR", raising=False)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert default_index_path() == tmp_path / "envoic" / "index.sqlite3"
+
+    monkeypatch.setenv("ENVOIC_CACHE_DIR", str(tmp_path / "custom"))
+    assert default_index_path() == tmp_path / "custom" / "index.sqlite3"
+
+
+def test_cli_scan_with_index(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("ENVOIC_CACHE_DIR", str(tmp_path / "cache"))
+    tree = tmp_path / "tree"
+    _build_tree(tree)
+    runner = CliRunner()
+
+    first = runner.invoke(app, ["list", str(tree), "--index"])
+    second = runner.invoke(app, ["list", str(tree), "--index"])
+    rebuilt = runner.invoke(app, ["list", str(tree), "--rebuild-index"])
+
+    assert first.exit_code == second.exit_code == rebuilt.exit_code == 0
+    assert first.output == second.output == rebuilt.output
+    assert (tmp_path / "cache" / "index.sqlite3").is_file()
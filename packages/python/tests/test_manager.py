@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 import shutil
 from pathlib import Path
 
@@ -7,7 +8,7 @@ import pytest
 import typer
 
 from envoic.manager import confirm_deletion, delete_environments
-from envoic.models import EnvInfo, EnvType
+from envoic.models import ArtifactInfo, EnvInfo, EnvType
 from envoic.utils import format_env_display_path
 
 
@@ -112,6 +113,77 @@ def test_confirm_deletion_requires_delete_word(
     )
 
 
+def _link(source: Path, target: Path) -> None:
+    try:
+        os.link(source, target)
+    except OSError:
+        pytest.skip("hard links are not available")
+
+
+def test_confirm_deletion_totals_exclusive_bytes(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    cache = tmp_path / "cache" / "wheel.so"
+    cache.parent.mkdir()
+    cache.write_bytes(b"x" * 9 * 1024 * 1024)
+    linked = tmp_path / "a" / ".venv"
+    linked.mkdir(parents=True)
+    (linked / "own.py").write_bytes(b"x" * 1024 * 1024)
+    _link(cache, linked / "wheel.so")
+    plain = tmp_path / "b" / ".venv"
+    plain.mkdir(parents=True)
+    (plain / "own.py").write_bytes(b"x" * 1024 * 1024)
+
+    confirm_deletion([_env(linked), _env(plain)], scan_root=tmp_path, dry_run=True)
+
+    output = capsys.readouterr().out
+    assert "(1M exclusive)" in output
+    assert "Total: 2M will be freed" in output
+    assert "9M of 11M is hard-linked from elsewhere" in output
+
+
+def test_totals_count_files_linked_between_selected_items(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    first = tmp_path / "a" / ".venv"
+    first.mkdir(parents=True)
+    (first / "wheel.so").write_bytes(b"x" * 1024 * 1024)
+    second = tmp_path / "b" / ".venv"
+    second.mkdir(parents=True)
+    _link(first / "wheel.so", second / "wheel.so")
+    selected: list[EnvInfo | ArtifactInfo] = [_env(first), _env(second)]
+
+    confirm_deletion(selected, scan_root=tmp_path, dry_run=True)
+    preview = delete_environments(selected, scan_root=tmp_path, dry_run=True)
+    alone = delete_environments([_env(first)], scan_root=tmp_path, dry_run=True)
+
+    # Each tree alone frees nothing; together they free the shared file once.
+    output = capsys.readouterr().out
+    assert "Total: 1M will be freed" in output
+    assert "hard-linked from elsewhere" not in output
+    assert preview["would_free_bytes"] == 1024 * 1024
+    assert alone["would_free_bytes"] == 0
+
+    summary = delete_environments(selected, scan_root=tmp_path)
+
+    assert summary["bytes_freed"] == 1024 * 1024
+
+
+def test_delete_counts_only_exclusive_bytes(tmp_path: Path) -> None:
+    cache = tmp_path / "cache" / "wheel.so"
+    cache.parent.mkdir()
+    cache.write_bytes(b"x" * 1000)
+    env_dir = tmp_path / "project" / ".venv"
+    env_dir.mkdir(parents=True)
+    (env_dir / "own.py").write_bytes(b"x" * 10)
+    _link(cache, env_dir / "wheel.so")
+
+    summary = delete_environments([_env(env_dir)], scan_root=tmp_path)
+
+    assert summary["bytes_freed"] == 10
+    assert cache.exists()
+
+
 def test_format_env_display_path_relative_and_strip(tmp_path: Path) -> None:
     scan_root = tmp_path / "root"
     env_path = scan_root / "apollo-cash" / "app" / ".venv"
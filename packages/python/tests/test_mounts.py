@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path, PurePosixPath
+
+import pytest
+
+from envoic import scanner
+from envoic.mounts import Mount, MountPolicy, parse_mountinfo
+from envoic.scanner import scan
+
+MOUNTINFO = """\
+23 28 0:22 / /proc rw,relatime - proc proc rw
+28 1 254:0 / / rw,relatime - ext4 /dev/vda rw
+29 28 254:0 /srv/data /mnt/data rw,relatime shared:1 - ext4 /dev/vda rw
+30 28 0:40 / /home/my\\040share rw,relatime - nfs4 server:/share rw
+malformed line
+"""
+
+
+def _mount(mount_id: int, device: int, root: str, point: Path, fs_type: str) -> Mount:
+    return Mount(
+        mount_id=mount_id,
+        device=device,
+        root=PurePosixPath(root),
+        mount_point=point,
+        fs_type=fs_type,
+    )
+
+
+def test_parse_mountinfo_reads_fields_and_unescapes() -> None:
+    mounts = parse_mountinfo(MOUNTINFO)
+
+    assert [mount.mount_point for mount in mounts] == [
+        Path("/proc"),
+        Path("/"),
+        Path("/mnt/data"),
+        Path("/home/my share"),
+    ]
+    assert mounts[2].device == os.makedev(254, 0)
+    assert mounts[2].root == PurePosixPath("/srv/data")
+    assert mounts[3].fs_type == "nfs4"
+
+
+def test_policy_skips_pseudo_and_matching_types(tmp_path: Path) -> None:
+    device = os.stat(tmp_path).st_dev
+    mounts = [
+        _mount(1, device, "/", tmp_path, "ext4"),
+        _mount(2, device + 1, "/", tmp_path / "proc", "proc"),
+        _mount(3, device + 2, "/", tmp_path / "fuse", "fuse.sshfs"),
+        _mount(4, device + 3, "/", tmp_path / "nfs", "nfs4"),
+    ]
+
+    default = MountPolicy().pruned_mounts(tmp_path, mounts)
+    skipping = MountPolicy(skip_types=frozenset({"fuse.*", "nfs*"}))
+    included = MountPolicy(include_types=frozenset({"proc"}))
+
+    assert default == {tmp_path / "proc"}
+    assert skipping.pruned_mounts(tmp_path, mounts) == {
+        tmp_path / "fuse",
+        tmp_path / "nfs",
+    }
+    assert included.pruned_mounts(tmp_path, mounts) == frozenset()
+
+
+def test_policy_one_file_system_prunes_other_devices(tmp_path: Path) -> None:
+    device = os.stat(tmp_path).st_dev
+    mounts = [
+        _mount(1, device, "/", tmp_path, "ext4"),
+        _mount(2, device + 1, "/", tmp_path / "other", "ext4"),
+    ]
+
+    policy = MountPolicy(one_file_system=True)
+
+    assert policy.pruned_mounts(tmp_path, mounts) == {tmp_path / "other"}
+
+
+def test_policy_walks_bind_mounted_data_once(tmp_path: Path) -> None:
+    device = os.stat(tmp_path).st_dev
+    mounts = [
+        _mount(1, device, "/", tmp_path, "ext4"),
+        _mount(2, device, "/data", tmp_path / "bind", "ext4"),
+        _mount(3, device + 1, "/", tmp_path / "disk", "xfs"),
+        _mount(4, device + 1, "/", tmp_path / "disk-again", "xfs"),
+    ]
+    outside = [_mount(1, device, "/", Path("/elsewhere"), "ext4"), *mounts[1:]]
+
+    pruned = MountPolicy().pruned_mounts(tmp_path, mounts)
+
+    assert pruned == {tmp_path / "bind", tmp_path / "disk-again"}
+    assert tmp_path / "bind" not in MountPolicy().pruned_mounts(tmp_path, outside)
+
+
+def test_scan_with_policy_leaves_pruned_mounts(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    kept = tmp_path / "kept" / ".venv"
+    pruned = tmp_path / "remote" / ".venv"
+    for env_dir in (kept, pruned):
+        env_dir.mkdir(parents=True)
+        (env_dir / "pyvenv.cfg").write_text("version = 3.12.0\n", encoding="utf-8")
+    device = os.stat(tmp_path).st_dev
+    mounts = [_mount(1, device + 1, "/", tmp_path / "remote", "nfs4")]
+
+    monkeypatch.setattr(scanner, "read_mounts", lambda: mounts)
+    policy = MountPolicy(skip_types=frozenset({"nfs*"}))
+
+    assert scan(tmp_path, mount_policy=policy).environments == [kept.resolve()]
+    assert len(scan(tmp_path).environments) == 2
@@ -1,8 +1,21 @@
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
 
-from envoic.models import EnvInfo, EnvType, ScanResult, to_serializable_dict
-from envoic.report import bar_chart, format_age, format_list, format_report, format_size
+from envoic.models import (
+    EnvInfo,
+    EnvType,
+    ScanResult,
+    ScanStats,
+    to_serializable_dict,
+)
+from envoic.report import (
+    bar_chart,
+    format_age,
+    format_list,
+    format_report,
+    format_size,
+    format_stats,
+)
 
 
 def test_format_size() -> None:
@@ -161,3 +174,20 @@ def test_format_report_show_artifact_details_true() -> None:
 
     assert "ARTIFACTS" in text
     assert "hidden by default" not in text
+
+
+def test_format_stats_shows_counters_phases_and_io() -> None:
+    stats = ScanStats(
+        directories_listed=12,
+        errors_suppressed=3,
+        phase_seconds={"walk": 1.5},
+        io={"read_bytes": 2048, "syscr": 7, "syscw": 1},
+    )
+
+    text = format_stats(stats)
+
+    assert "Dirs Listed" in text and "12" in text
+    assert "3 suppressed" in text
+    assert "1.50s" in text
+    assert "7 read, 1 write" in text
+    assert "2K" in text
@@ -1,6 +1,22 @@
+import inspect
+import sys
+import threading
+import time
 from pathlib import Path
 
-from envoic.scanner import scan
+import pytest
+
+from envoic import scanner
+from envoic.models import ArtifactInfo, ScanStats
+from envoic.scanner import (
+    WalkEngine,
+    collapse_roots,
+    iter_scan,
+    iter_sized,
+    scan,
+    scan_roots,
+)
+from envoic.sizing import DiskUsage
 
 
 def _touch(path: Path) -> None:
@@ -36,6 +52,26 @@ def test_scan_respects_depth(tmp_path: Path) -> None:
     assert deep_env.resolve() in deep
 
 
+@pytest.mark.parametrize("engine", ["path", "fd"])
+def test_children_past_the_depth_limit_are_probed_not_listed(
+    tmp_path: Path, engine: WalkEngine
+) -> None:
+    if engine == "fd" and not scanner.FD_ENGINE_AVAILABLE:
+        pytest.skip("fd engine is not available")
+    wide = tmp_path / "a" / "wide"
+    for index in range(50):
+        _touch(wide / f"file{index}.txt")
+    env_dir = tmp_path / "a" / "tool-env"
+    _touch(env_dir / "bin" / "python")
+    (env_dir / "lib" / "python3.12" / "site-packages").mkdir(parents=True)
+
+    discovery = scan(tmp_path, max_depth=2, engine=engine)
+
+    assert discovery.environments == [env_dir.resolve()]
+    # The root and ``a``; ``wide`` and ``tool-env`` are only probed.
+    assert discovery.stats.directories_listed == 2
+
+
 def test_scan_skips_git_and_node_modules(tmp_path: Path) -> None:
     git_env = tmp_path / ".git" / ".venv"
     git_env.mkdir(parents=True)
@@ -49,3 +85,327 @@ def test_scan_skips_git_and_node_modules(tmp_path: Path) -> None:
 
     assert git_env.resolve() not in found
     assert node_env.resolve() not in found
+
+
+def test_parallel_scan_matches_sequential(tmp_path: Path) -> None:
+    for idx in range(6):
+        project = tmp_path / f"proj{idx}"
+        _touch(project / ".venv" / "bin" / "activate")
+        _touch(project / "pkg" / "__pycache__" / "mod.pyc")
+        (project / "pyproject.toml").write_text("", encoding="utf-8")
+        (project / "dist").mkdir()
+        (project / "nested" / "deeper" / "env").mkdir(parents=True)
+
+    sequential = scan(tmp_path, max_depth=4, include_artifacts=True)
+    parallel = scan(tmp_path, max_depth=4, include_artifacts=True, jobs=4)
+
+    assert parallel.environments == sequential.environments
+    assert [item.path for item in parallel.artifacts] == [
+        item.path for item in sequential.artifacts
+    ]
+
+
+def test_parallel_scan_respects_depth(tmp_path: Path) -> None:
+    deep_env = tmp_path / "a" / "b" / "c" / ".venv"
+    deep_env.mkdir(parents=True)
+    _touch(deep_env / "bin" / "activate")
+
+    assert deep_env.resolve() not in scan(tmp_path, max_depth=2, jobs=3).environments
+    assert deep_env.resolve() in scan(tmp_path, max_depth=5, jobs=3).environments
+
+
+def test_iter_scan_yields_environments_and_artifacts(tmp_path: Path) -> None:
+    env_dir = tmp_path / "project" / ".venv"
+    _touch(env_dir / "bin" / "activate")
+    (tmp_path / "project" / ".mypy_cache").mkdir()
+
+    items = list(iter_scan(tmp_path, max_depth=3, include_artifacts=True))
+
+    assert env_dir.resolve() in items
+    artifacts = [item for item in items if isinstance(item, ArtifactInfo)]
+    assert [item.pattern_matched for item in artifacts] == [".mypy_cache"]
+
+
+def test_iter_scan_is_lazy(tmp_path: Path) -> None:
+    for idx in range(3):
+        _touch(tmp_path / f"proj{idx}" / ".venv" / "bin" / "activate")
+
+    items = iter_scan(tmp_path, max_depth=3)
+    first = next(items)
+
+    assert isinstance(first, Path)
+    assert len(list(items)) == 2
+
+
+def test_scan_does_not_recurse_per_directory_level(tmp_path: Path) -> None:
+    levels = 200
+    current = tmp_path
+    for _ in range(levels):
+        current = current / "d"
+    env_dir = current / ".venv"
+    _touch(env_dir / "pyvenv.cfg")
+
+    # A recursive walker would need one frame per level; an explicit frontier
+    # only needs a small, constant amount of headroom.
+    frames_in_use = len(inspect.stack(context=0))
+    original_limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(frames_in_use + 50)
+    try:
+        found = scan(tmp_path, max_depth=levels + 1).environments
+    finally:
+        sys.setrecursionlimit(original_limit)
+
+    assert found == [env_dir.resolve()]
+
+
+def test_scan_stats_count_one_listing_per_plain_directory(tmp_path: Path) -> None:
+    for idx in range(10):
+        (tmp_path / f"dir{idx}" / "sub").mkdir(parents=True)
+
+    stats = scan(tmp_path, max_depth=5).stats
+
+    # Root + 10 dirs + 10 subdirs, each listed once and never stat'ed.
+    assert stats.directories_listed == 21
+    assert stats.stat_calls == 0
+
+
+def test_scan_stats_probe_only_nested_markers(tmp_path: Path) -> None:
+    env_dir = tmp_path / "venv"
+    _touch(env_dir / "bin" / "python")
+    (env_dir / "lib" / "python3.12" / "site-packages").mkdir(parents=True)
+
+    discovery = scan(tmp_path, max_depth=3)
+
+    assert discovery.environments == [env_dir.resolve()]
+    # bin/activate, bin/python, lib/site-packages, lib/python3.12/site-packages
+    assert discovery.stats.stat_calls == 4
+
+
+def test_collapse_roots_drops_duplicates(tmp_path: Path) -> None:
+    (tmp_path / "a").mkdir()
+
+    roots = collapse_roots([tmp_path / "a", tmp_path, tmp_path / "a" / ".."])
+
+    assert roots == [(tmp_path / "a").resolve(), tmp_path.resolve()]
+
+
+def test_scan_roots_walks_nested_roots_once(tmp_path: Path) -> None:
+    outer_env = tmp_path / ".venv"
+    inner_env = tmp_path / "work" / "proj" / ".venv"
+    _touch(outer_env / "bin" / "activate")
+    _touch(inner_env / "bin" / "activate")
+
+    discovery = scan_roots([tmp_path, tmp_path / "work", tmp_path])
+    single = scan(tmp_path)
+
+    assert discovery.environments == single.environments
+    # The outer walk still lists ``work`` once to classify it.
+    assert discovery.stats.directories_listed == single.stats.directories_listed + 1
+    assert [item.path for item in discovery.roots] == [
+        tmp_path.resolve(),
+        (tmp_path / "work").resolve(),
+    ]
+    assert all(item.duration_seconds >= 0 for item in discovery.roots)
+
+
+def test_scan_roots_times_each_root_from_its_own_start(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    slow, fast = tmp_path / "a-slow", tmp_path / "b-fast"
+    slow.mkdir()
+    fast.mkdir()
+    visit_directory = scanner.visit_directory
+
+    def slow_visit(
+        pending: scanner.PendingDir, config: scanner.WalkConfig, *, leaf: bool
+    ) -> scanner.DirectoryVisit:
+        if pending.path == slow.resolve():
+            time.sleep(0.3)
+        return visit_directory(pending, config, leaf=leaf)
+
+    monkeypatch.setattr(scanner, "visit_directory", slow_visit)
+
+    durations = {
+        item.path.name: item.duration_seconds for item in scan_roots([slow, fast]).roots
+    }
+
+    assert durations["a-slow"] >= 0.3
+    assert durations["b-fast"] < 0.3
+
+
+def test_scan_roots_nested_root_gets_its_own_depth(tmp_path: Path) -> None:
+    env_dir = tmp_path / "a" / "b" / "c" / ".venv"
+    _touch(env_dir / "bin" / "activate")
+
+    assert env_dir.resolve() not in scan(tmp_path, max_depth=2).environments
+    discovery = scan_roots([tmp_path, tmp_path / "a" / "b"], max_depth=2)
+
+    assert env_dir.resolve() in discovery.environments
+
+
+def test_scan_roots_merges_stats_across_roots(tmp_path: Path) -> None:
+    (tmp_path / "one" / "x").mkdir(parents=True)
+    (tmp_path / "two" / "y").mkdir(parents=True)
+
+    discovery = scan_roots([tmp_path / "one", tmp_path / "two"])
+    expected = ScanStats()
+    for root in ("one", "two"):
+        expected.merge(scan(tmp_path / root).stats)
+
+    assert discovery.stats == expected
+
+
+def test_scan_time_budget_returns_partial_discovery(tmp_path: Path) -> None:
+    for idx in range(3):
+        _touch(tmp_path / f"proj{idx}" / ".venv" / "bin" / "activate")
+
+    spent = scan(tmp_path, time_budget=0)
+    parallel = scan(tmp_path, jobs=4, time_budget=0)
+    unlimited = scan(tmp_path, time_budget=60)
+
+    assert spent.partial
+    assert spent.environments == []
+    assert spent.stats.directories_unvisited == 1
+    assert parallel.partial
+    assert parallel.stats.directories_unvisited == 3
+    assert not unlimited.partial
+    assert len(unlimited.environments) == 3
+
+
+def test_scan_roots_time_budget_counts_unstarted_roots(tmp_path: Path) -> None:
+    (tmp_path / "one").mkdir()
+    (tmp_path / "two").mkdir()
+
+    discovery = scan_roots([tmp_path / "one", tmp_path / "two"], time_budget=0)
+
+    assert discovery.partial
+    assert discovery.stats.directories_unvisited == 2
+
+
+def test_scan_max_entries_truncates_wide_directories(tmp_path: Path) -> None:
+    wide = tmp_path / "wide"
+    for idx in range(20):
+        _touch(wide / f"file{idx:02d}.dat")
+    env_dir = tmp_path / "project" / ".venv"
+    env_dir.mkdir(parents=True)
+    (env_dir / "pyvenv.cfg").write_text("version = 3.12.0\n", encoding="utf-8")
+
+    capped = scan(tmp_path, max_entries=5)
+    uncapped = scan(tmp_path)
+
+    assert capped.stats.truncated_directories == [wide]
+    assert capped.environments == [env_dir.resolve()]
+    assert uncapped.stats.truncated_directories == []
+
+
+def test_max_entries_only_reports_visited_directories(tmp_path: Path) -> None:
+    for idx in range(20):
+        _touch(tmp_path / "a" / "wide" / f"file{idx:02d}.dat")
+        _touch(tmp_path / "a" / "wide" / "deeper" / f"file{idx:02d}.dat")
+        _touch(tmp_path / "b" / ".venv" / f"file{idx:02d}.dat")
+    (tmp_path / "b" / ".venv" / "pyvenv.cfg").write_text("", encoding="utf-8")
+
+    discovery = scan(tmp_path, max_depth=3, max_entries=5)
+
+    # ``.venv`` is listed to classify it and ``deeper`` is past the depth
+    # limit; neither is visited, so neither is reported as truncated.
+    assert discovery.stats.truncated_directories == [tmp_path / "a" / "wide"]
+    assert discovery.environments == [tmp_path / "b" / ".venv"]
+
+
+def test_scan_reports_canonical_paths_without_resolving_each(tmp_path: Path) -> None:
+    real = tmp_path / "real"
+    _touch(real / "project" / ".venv" / "pyvenv.cfg")
+    _touch(real / "project" / "pkg" / "__pycache__" / "mod.cpython-312.pyc")
+    link = tmp_path / "link"
+    link.symlink_to(real, target_is_directory=True)
+
+    discovery = scan(link, max_depth=5, include_artifacts=True)
+
+    assert discovery.environments == [real.resolve() / "project" / ".venv"]
+    assert [item.path for item in discovery.artifacts] == [
+        real.resolve() / "project" / "pkg" / "__pycache__"
+    ]
+    assert discovery.stats.stat_calls == 0
+
+
+def test_fd_engine_matches_path_engine(tmp_path: Path) -> None:
+    for idx in range(3):
+        project = tmp_path / f"team{idx}" / "nested" / f"proj{idx}"
+        _touch(project / ".venv" / "pyvenv.cfg")
+        _touch(project / "pkg" / "__pycache__" / "mod.cpython-312.pyc")
+    (tmp_path / "team0" / "loop").symlink_to(tmp_path, target_is_directory=True)
+
+    by_path = scan(tmp_path, include_artifacts=True, exclude=["team2"])
+    by_fd = scan(tmp_path, include_artifacts=True, exclude=["team2"], engine="fd")
+
+    assert by_fd.environments == by_path.environments
+    assert by_fd.artifacts == by_path.artifacts
+    assert by_fd.stats == by_path.stats
+
+
+def test_fd_engine_keeps_walking_a_renamed_directory(tmp_path: Path) -> None:
+    def walk(root: Path, engine: WalkEngine) -> list[str]:
+        _touch(root / "a" / ".venv" / "pyvenv.cfg")
+        _touch(root / "a" / "b" / "inner" / "pyvenv.cfg")
+        found = []
+        for item in iter_scan(root, engine=engine):
+            assert isinstance(item, Path)
+            found.append(item.name)
+            if item.name == ".venv":
+                (root / "a").rename(root / "renamed")
+        return found
+
+    # ``a`` is renamed after its own visit, before ``b`` is listed.
+    assert walk(tmp_path / "by-fd", "fd") == [".venv", "inner"]
+    assert walk(tmp_path / "by-path", "path") == [".venv"]
+
+
+def test_fd_engine_rejects_jobs(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="sequentially"):
+        scan(tmp_path, jobs=2, engine="fd")
+
+
+def test_scan_stats_count_entries_pruning_and_errors(tmp_path: Path) -> None:
+    _touch(tmp_path / "project" / "module.py")
+    _touch(tmp_path / "project" / ".git" / "HEAD")
+    _touch(tmp_path / "build" / "out.o")
+
+    stats = scan(tmp_path, exclude=["build"]).stats
+    missing = scan(tmp_path / "missing").stats
+
+    # Root lists project and build; project lists module.py and .git.
+    assert stats.entries_examined == 4
+    assert stats.subtrees_pruned == 2
+    assert stats.errors_suppressed == 0
+    assert stats.phase_seconds["walk"] > 0
+    assert missing.errors_suppressed == 1
+
+
+def test_deep_walk_continues_while_artifacts_are_sized(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _touch(tmp_path / ".tox" / "py311" / "lib.py")
+    _touch(tmp_path / ".venv" / "pyvenv.cfg")
+    released = threading.Event()
+    measure = scanner.disk_usage
+
+    def held_disk_usage(path: Path, stats: ScanStats | None = None) -> DiskUsage:
+        assert released.wait(timeout=10)
+        return measure(path, stats)
+
+    monkeypatch.setattr(scanner, "disk_usage", held_disk_usage)
+    stats = ScanStats()
+    items = iter_sized(
+        iter_scan(tmp_path, max_depth=3, include_artifacts=True), stats=stats
+    )
+
+    # The root listing yields .tox first; the walk moves on to .venv while
+    # .tox is still being sized.
+    assert next(items) == (tmp_path / ".venv").resolve()
+    released.set()
+    (artifact,) = list(items)
+    assert isinstance(artifact, ArtifactInfo)
+    assert artifact.size_bytes == 0
+    assert artifact.exclusive_bytes == 0
+    assert "size" in stats.phase_seconds
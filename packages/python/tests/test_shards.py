@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pytest
+
+from envoic import shards
+from envoic.models import ArtifactInfo, EnvInfo, RootScan, ScanStats
+from envoic.scanner import DirectoryVisit, PendingDir, WalkConfig, scan_roots
+from envoic.shards import iter_scan_processes
+
+
+def _make_env(path: Path) -> None:
+    path.mkdir(parents=True)
+    (path / "pyvenv.cfg").write_text("version = 3.12.0\n", encoding="utf-8")
+
+
+def _build_tree(root: Path) -> None:
+    for team in range(3):
+        for proj in range(4):
+            project = root / f"team{team}" / "deep" / f"proj{proj}"
+            _make_env(project / ".venv")
+            (project / "src" / "__pycache__").mkdir(parents=True)
+
+
+def test_process_scan_matches_thread_scan_with_rebalancing(tmp_path: Path) -> None:
+    _build_tree(tmp_path)
+    stats = ScanStats()
+    root_scans: list[RootScan] = []
+
+    # A tiny split budget forces shards to hand their frontier back.
+    items = list(
+        iter_scan_processes(
+            [tmp_path],
+            processes=2,
+            include_artifacts=True,
+            stats=stats,
+            root_scans=root_scans,
+            split_after=2,
+        )
+    )
+    expected = scan_roots([tmp_path], include_artifacts=True)
+
+    envs = sorted(item.path for item in items if isinstance(item, EnvInfo))
+    artifacts = sorted(
+        str(item.path) for item in items if isinstance(item, ArtifactInfo)
+    )
+    assert envs == expected.environments
+    assert artifacts == [str(item.path) for item in expected.artifacts]
+    assert stats.directories_listed >= expected.stats.directories_listed
+    assert [item.path for item in root_scans] == [tmp_path.resolve()]
+
+
+def test_process_scan_times_each_root_from_its_own_start(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    slow, fast = tmp_path / "a-slow", tmp_path / "b-fast"
+    slow.mkdir()
+    fast.mkdir()
+    visit_directory = shards.visit_directory
+
+    def slow_visit(
+        pending: PendingDir, config: WalkConfig, *, leaf: bool
+    ) -> DirectoryVisit:
+        if pending.path == slow.resolve():
+            time.sleep(0.3)
+        return visit_directory(pending, config, leaf=leaf)
+
+    monkeypatch.setattr(shards, "visit_directory", slow_visit)
+    root_scans: list[RootScan] = []
+
+    list(iter_scan_processes([slow, fast], processes=1, root_scans=root_scans))
+
+    durations = {item.path.name: item.duration_seconds for item in root_scans}
+    assert durations["a-slow"] >= 0.3
+    assert durations["b-fast"] < 0.3
+
+
+def test_process_scan_spends_time_budget(tmp_path: Path) -> None:
+    _build_tree(tmp_path)
+    stats = ScanStats()
+
+    items = list(
+        iter_scan_processes([tmp_path], processes=2, stats=stats, time_budget=0)
+    )
+
+    assert items == []
+    assert stats.directories_unvisited == 1
+
+
+def test_process_scan_rejects_zero_processes(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="processes"):
+        list(iter_scan_processes([tmp_path], processes=0))
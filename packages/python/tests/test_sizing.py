@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import os
+import threading
+from functools import partial
+from pathlib import Path
+
+import pytest
+
+from envoic.models import ScanStats
+from envoic.sizing import LinkTally, SizePipeline, combined_exclusive_bytes, disk_usage
+
+
+def _write_bytes(path: Path, size: int) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+
+
+def test_disk_usage_counts_files_and_directories(tmp_path: Path) -> None:
+    root = tmp_path / "tree"
+    _write_bytes(root / "a.txt", 10)
+    _write_bytes(root / "sub" / "b.txt", 20)
+    _write_bytes(root / "sub" / "deeper" / "c.txt", 30)
+
+    usage = disk_usage(root)
+
+    assert usage.apparent_bytes == 60
+    assert usage.files == 3
+    assert usage.directories == 3
+    assert usage.errors == 0
+
+
+def test_disk_usage_of_a_file(tmp_path: Path) -> None:
+    _write_bytes(tmp_path / "one.bin", 4096)
+
+    usage = disk_usage(tmp_path / "one.bin")
+
+    assert usage.apparent_bytes == 4096
+    assert usage.files == 1
+    assert usage.directories == 0
+
+
+@pytest.mark.skipif(not hasattr(os.stat_result, "st_blocks"), reason="no st_blocks")
+def test_disk_usage_reports_allocated_blocks(tmp_path: Path) -> None:
+    _write_bytes(tmp_path / "tree" / "data.bin", 64 * 1024)
+    with (tmp_path / "tree" / "sparse.bin").open("wb") as handle:
+        handle.truncate(8 * 1024 * 1024)
+
+    usage = disk_usage(tmp_path / "tree")
+
+    assert usage.apparent_bytes == 64 * 1024 + 8 * 1024 * 1024
+    # The written file is fully allocated; the sparse one barely at all.
+    assert 64 * 1024 <= usage.allocated_bytes < usage.apparent_bytes
+
+
+def test_disk_usage_does_not_follow_symlinks(tmp_path: Path) -> None:
+    _write_bytes(tmp_path / "outside" / "big.bin", 10_000)
+    root = tmp_path / "tree"
+    root.mkdir()
+    try:
+        (root / "dir-link").symlink_to(tmp_path / "outside", target_is_directory=True)
+        (root / "file-link").symlink_to(tmp_path / "outside" / "big.bin")
+    except OSError:
+        pytest.skip("symlinks are not available")
+
+    usage = disk_usage(root)
+
+    assert usage.files == 2
+    assert usage.directories == 1
+    assert usage.apparent_bytes < 10_000
+
+
+def test_disk_usage_of_missing_path_is_an_error(tmp_path: Path) -> None:
+    stats = ScanStats()
+
+    usage = disk_usage(tmp_path / "missing", stats)
+
+    assert usage.apparent_bytes == 0
+    assert usage.errors == 1
+    assert stats.errors_suppressed == 1
+
+
+def test_disk_usage_tallies_stats(tmp_path: Path) -> None:
+    _write_bytes(tmp_path / "tree" / "a.txt", 5)
+    _write_bytes(tmp_path / "tree" / "sub" / "b.txt", 7)
+    stats = ScanStats()
+
+    disk_usage(tmp_path / "tree", stats)
+
+    # The root plus one stat per entry: a.txt, sub and b.txt.
+    assert stats.stat_calls == 4
+    assert stats.bytes_sized == 12
+    assert stats.errors_suppressed == 0
+
+
+def _link(source: Path, target: Path) -> None:
+    try:
+        os.link(source, target)
+    except OSError:
+        pytest.skip("hard links are not available")
+
+
+def test_hard_links_to_outside_are_not_exclusive(tmp_path: Path) -> None:
+    _write_bytes(tmp_path / "cache" / "wheel.so", 1000)
+    root = tmp_path / "venv"
+    _write_bytes(root / "own.py", 10)
+    _link(tmp_path / "cache" / "wheel.so", root / "wheel.so")
+
+    usage = disk_usage(root)
+
+    assert usage.apparent_bytes == 1010
+    assert usage.exclusive_bytes == 10
+
+
+def test_hard_links_within_the_tree_count_once(tmp_path: Path) -> None:
+    root = tmp_path / "venv"
+    _write_bytes(root / "a" / "data.bin", 1000)
+    _link(root / "a" / "data.bin", root / "b.bin")
+
+    usage = disk_usage(root)
+
+    assert usage.apparent_bytes == 2000
+    assert usage.exclusive_bytes == 1000
+
+
+def test_link_tally_counts_files_shared_between_trees(tmp_path: Path) -> None:
+    _write_bytes(tmp_path / "one" / "wheel.so", 1000)
+    _write_bytes(tmp_path / "two" / "own.py", 10)
+    _link(tmp_path / "one" / "wheel.so", tmp_path / "two" / "wheel.so")
+    _write_bytes(tmp_path / "cache" / "other.so", 500)
+    _link(tmp_path / "cache" / "other.so", tmp_path / "two" / "other.so")
+    one = disk_usage(tmp_path / "one")
+    two = disk_usage(tmp_path / "two")
+    links = LinkTally()
+    links.add(one, "envs")
+    other = LinkTally()
+    other.add(two, "envs")
+    links.merge(other)
+
+    assert (one.exclusive_bytes, two.exclusive_bytes) == (0, 10)
+    # wheel.so is freed by deleting both; other.so is still linked from cache.
+    assert links.shared_bytes("envs") == 1000
+    assert links.shared_bytes() == 0
+    assert combined_exclusive_bytes([one, two]) == 1010
+
+
+def test_size_pipeline_returns_every_result() -> None:
+    with SizePipeline[int](2) as pipeline:
+        results: list[int] = []
+        for value in range(20):
+            pipeline.submit(partial(pow, value, 2))
+            results.extend(pipeline.completed())
+        results.extend(pipeline.drain())
+
+    assert sorted(results) == [value * value for value in range(20)]
+
+
+def test_size_pipeline_blocks_when_backlog_is_full() -> None:
+    released = threading.Event()
+    submitted: list[int] = []
+
+    def held(value: int) -> int:
+        assert released.wait(timeout=10)
+        return value
+
+    def producer(pipeline: SizePipeline[int]) -> None:
+        for value in range(3):
+            pipeline.submit(partial(held, value))
+            submitted.append(value)
+
+    with SizePipeline[int](1, backlog=2) as pipeline:
+        thread = threading.Thread(target=producer, args=(pipeline,))
+        thread.start()
+        thread.join(timeout=0.2)
+        # Two tasks fill the backlog; the third waits for one to finish.
+        assert submitted == [0, 1]
+        released.set()
+        thread.join(timeout=10)
+        assert submitted == [0, 1, 2]
+        assert sorted(pipeline.drain()) == [0, 1, 2]
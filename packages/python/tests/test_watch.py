@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import shutil
+import sys
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from envoic.models import ArtifactInfo
+from envoic.watch import InventoryWatcher, WatchEvent
+
+pytestmark = pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="inotify is Linux-only"
+)
+
+
+@pytest.fixture
+def watcher(tmp_path: Path) -> Iterator[InventoryWatcher]:
+    (tmp_path / "project").mkdir()
+    instance = InventoryWatcher(tmp_path, max_depth=4, settle_seconds=0.05)
+    yield instance
+    instance.close()
+
+
+def _poll_until(
+    watcher: InventoryWatcher, count: int, timeout: float = 5.0
+) -> list[WatchEvent]:
+    events: list[WatchEvent] = []
+    deadline = time.monotonic() + timeout
+    while len(events) < count and time.monotonic() < deadline:
+        events.extend(watcher.poll(timeout=0.2))
+    return events
+
+
+def test_initial_scan_reports_existing_inventory(tmp_path: Path) -> None:
+    env_dir = tmp_path / "project" / ".venv"
+    env_dir.mkdir(parents=True)
+    (env_dir / "pyvenv.cfg").write_text("version = 3.12.0\n", encoding="utf-8")
+
+    watcher = InventoryWatcher(tmp_path, max_depth=4)
+    try:
+        events = watcher.start()
+    finally:
+        watcher.close()
+
+    assert [(event.action, event.item.path) for event in events] == [
+        ("added", env_dir.resolve())
+    ]
+
+
+def test_initial_scan_on_a_thread_pool_matches_sequential(tmp_path: Path) -> None:
+    for idx in range(4):
+        env_dir = tmp_path / f"project{idx}" / "nested" / ".venv"
+        env_dir.mkdir(parents=True)
+        (env_dir / "pyvenv.cfg").write_text("version = 3.12.0\n", encoding="utf-8")
+        (tmp_path / f"project{idx}" / "__pycache__").mkdir()
+
+    inventories = []
+    for jobs in (1, 4):
+        watcher = InventoryWatcher(tmp_path, max_depth=4, jobs=jobs)
+        try:
+            events = watcher.start()
+            assert watcher.watch_errors == 0
+        finally:
+            watcher.close()
+        inventories.append(sorted((event.kind, event.item.path) for event in events))
+
+    assert inventories[0] == inventories[1]
+    assert len(inventories[0]) == 8
+
+
+def test_new_environment_is_reported(tmp_path: Path, watcher: InventoryWatcher) -> None:
+    assert watcher.start() == []
+
+    env_dir = tmp_path / "project" / ".venv"
+    env_dir.mkdir()
+    (env_dir / "pyvenv.cfg").write_text("version = 3.12.0\n", encoding="utf-8")
+    events = _poll_until(watcher, 1)
+
+    assert [(event.action, event.kind) for event in events] == [
+        ("added", "environment")
+    ]
+    assert env_dir.resolve() in watcher.environments
+
+
+def test_removed_environment_is_reported(
+    tmp_path: Path, watcher: InventoryWatcher
+) -> None:
+    env_dir = tmp_path / "project" / "venv"
+    (env_dir / "conda-meta").mkdir(parents=True)
+    watcher.start()
+    assert env_dir.resolve() in watcher.environments
+
+    shutil.rmtree(env_dir)
+    events = _poll_until(watcher, 1)
+
+    assert [(event.action, event.item.path) for event in events] == [
+        ("removed", env_dir.resolve())
+    ]
+    assert watcher.environments == {}
+
+
+def test_artifacts_in_new_subtree_are_reported(
+    tmp_path: Path, watcher: InventoryWatcher
+) -> None:
+    watcher.start()
+
+    pycache = tmp_path / "project" / "pkg" / "__pycache__"
+    pycache.mkdir(parents=True)
+    events = _poll_until(watcher, 1)
+
+    assert len(events) == 1
+    assert isinstance(events[0].item, ArtifactInfo)
+    assert events[0].item.path == pycache.resolve()
+
+
+def test_excluded_directories_are_neither_reported_nor_watched(
+    tmp_path: Path,
+) -> None:
+    vendor = tmp_path / "vendor"
+    (vendor / "old" / ".venv").mkdir(parents=True)
+    (vendor / "old" / ".venv" / "pyvenv.cfg").write_text("", encoding="utf-8")
+    watcher = InventoryWatcher(tmp_path, max_depth=4, exclude=["vendor"])
+    try:
+        assert watcher.start() == []
+        (vendor / "__pycache__").mkdir()
+        (tmp_path / "__pycache__").mkdir()
+        events = _poll_until(watcher, 1)
+    finally:
+        watcher.close()
+
+    assert [event.item.path for event in events] == [
+        (tmp_path / "__pycache__").resolve()
+    ]
+
+
+def test_poll_only_examines_changed_directories(
+    tmp_path: Path, watcher: InventoryWatcher
+) -> None:
+    (tmp_path / "other").mkdir()
+    watcher.start()
+
+    class Untouchable:
+        def __getattr__(self, name: str) -> object:
+            raise AssertionError(f"unchanged directory was examined ({name})")
+
+    # ``project`` changes below; ``other`` does not and must stay unread.
+    watcher._dirs[(tmp_path / "other").resolve()].visit = Untouchable()  # type: ignore[assignment]
+    (tmp_path / "project" / "__pycache__").mkdir()
+    events = _poll_until(watcher, 1)
+
+    assert [event.action for event in events] == ["added"]